@@ -0,0 +1,191 @@
+"""Initial schema: database/schema.sql as it stood before migrations
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 15:15:51.691010
+
+A database created from that file can be stamped at this revision and
+upgraded from there. 0002 brings it in line with app.models.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# schema.sql reuses index names across tables, which only MySQL allows
+INDEXES = [
+    ('users', 'idx_email', ['email']),
+    ('users', 'idx_username', ['username']),
+    ('foods', 'idx_name', ['name']),
+    ('food_items', 'idx_user_id', ['user_id']),
+    ('food_items', 'idx_food_id', ['food_id']),
+    ('meals', 'idx_user_id', ['user_id']),
+    ('meals', 'idx_meal_date', ['meal_date']),
+    ('meal_foods', 'idx_meal_id', ['meal_id']),
+    ('meal_foods', 'idx_food_id', ['food_id']),
+    ('user_preferences', 'idx_user_id', ['user_id']),
+    ('dietary_restrictions', 'idx_preference_id', ['preference_id']),
+    ('goals', 'idx_user_id', ['user_id']),
+    ('goals', 'idx_is_active', ['is_active']),
+    ('daily_reports', 'idx_user_id', ['user_id']),
+    ('daily_reports', 'idx_report_date', ['report_date']),
+]
+
+
+def updated_at() -> sa.Column:
+    """schema.sql's self-updating TIMESTAMP; only MySQL has ON UPDATE"""
+    if op.get_context().dialect.name == 'mysql':
+        default = sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    else:
+        default = sa.func.now()
+    return sa.Column('updated_at', sa.TIMESTAMP(), server_default=default, nullable=True)
+
+
+def index_name(table: str, name: str) -> str:
+    """schema.sql's name on MySQL, prefixed with the table elsewhere"""
+    if op.get_context().dialect.name == 'mysql':
+        return name
+    return f'{table}_{name}'
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('gender', sa.String(length=20), nullable=True),
+    sa.Column('height_cm', sa.Integer(), nullable=True),
+    sa.Column('weight_kg', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    updated_at(),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email', name='email'),
+    sa.UniqueConstraint('username', name='username')
+    )
+    op.create_table('foods',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('calories_per_100g', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('protein_per_100g', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('carbs_per_100g', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('fats_per_100g', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('fiber_per_100g', sa.Numeric(precision=10, scale=2), server_default='0.00', nullable=True),
+    sa.Column('sugar_per_100g', sa.Numeric(precision=10, scale=2), server_default='0.00', nullable=True),
+    sa.Column('sodium_per_100g', sa.Numeric(precision=10, scale=2), server_default='0.00', nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('food_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('food_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_g', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('custom_name', sa.String(length=255), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['food_id'], ['foods.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('meals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('meal_type', sa.Enum('breakfast', 'lunch', 'dinner', 'snack', name='mealtype'), nullable=False),
+    sa.Column('meal_date', sa.DateTime(), nullable=False),
+    sa.Column('notes', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('meal_foods',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('meal_id', sa.Integer(), nullable=False),
+    sa.Column('food_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_g', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['meal_id'], ['meals.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['food_id'], ['foods.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_preferences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('target_calories', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('target_protein', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('target_carbs', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('target_fats', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('preferred_meal_times', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    updated_at(),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', name='user_id')
+    )
+    op.create_table('dietary_restrictions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('preference_id', sa.Integer(), nullable=False),
+    sa.Column('restriction_type', sa.String(length=100), nullable=False),
+    sa.Column('severity', sa.String(length=50), server_default='moderate', nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['preference_id'], ['user_preferences.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('goal_type', sa.Enum(
+        'weight_loss', 'weight_gain', 'maintenance', 'muscle_gain', 'general_health', name='goaltype'
+    ), nullable=False),
+    sa.Column('target_weight_kg', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('current_weight_kg', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('target_date', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    updated_at(),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('daily_reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('report_date', sa.DateTime(), nullable=False),
+    sa.Column('total_calories', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('total_protein', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('total_carbs', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('total_fats', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('total_fiber', sa.Numeric(precision=10, scale=2), server_default='0.00', nullable=True),
+    sa.Column('total_sugar', sa.Numeric(precision=10, scale=2), server_default='0.00', nullable=True),
+    sa.Column('total_sodium', sa.Numeric(precision=10, scale=2), server_default='0.00', nullable=True),
+    sa.Column('analysis', sa.Text(), nullable=True),
+    sa.Column('recommendations', sa.Text(), nullable=True),
+    sa.Column('motivation_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    for table, name, columns in INDEXES:
+        op.create_index(index_name(table, name), table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for table, name, columns in reversed(INDEXES):
+        op.drop_index(index_name(table, name), table_name=table)
+    op.drop_table('daily_reports')
+    op.drop_table('goals')
+    op.drop_table('dietary_restrictions')
+    op.drop_table('user_preferences')
+    op.drop_table('meal_foods')
+    op.drop_table('meals')
+    op.drop_table('food_items')
+    op.drop_table('foods')
+    op.drop_table('users')
@@ -0,0 +1,164 @@
+"""Align the schema.sql baseline with app.models
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 15:31:07.402958
+
+Renames the baseline indexes to the models' ix_* names, turns the unique
+email/username keys into unique indexes, stores timestamps as DATETIME
+and writes enum labels as the member names SQLAlchemy persists.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+# table -> TIMESTAMP columns, with whether they keep a server default
+TIMESTAMPS = {
+    'users': [('created_at', True), ('updated_at', False)],
+    'foods': [('created_at', True)],
+    'food_items': [('created_at', True)],
+    'meals': [('created_at', True)],
+    'user_preferences': [('created_at', True), ('updated_at', False)],
+    'dietary_restrictions': [('created_at', True)],
+    'goals': [('created_at', True), ('updated_at', False)],
+    'daily_reports': [('created_at', True)],
+}
+
+# Baseline indexes the models do not declare. daily_reports.idx_user_id
+# goes in 0004, once the per-day unique key covers user_id.
+BASELINE_INDEXES = [
+    ('users', 'idx_email', ['email']),
+    ('users', 'idx_username', ['username']),
+    ('foods', 'idx_name', ['name']),
+    ('food_items', 'idx_user_id', ['user_id']),
+    ('food_items', 'idx_food_id', ['food_id']),
+    ('meals', 'idx_user_id', ['user_id']),
+    ('meals', 'idx_meal_date', ['meal_date']),
+    ('meal_foods', 'idx_meal_id', ['meal_id']),
+    ('meal_foods', 'idx_food_id', ['food_id']),
+    ('user_preferences', 'idx_user_id', ['user_id']),
+    ('dietary_restrictions', 'idx_preference_id', ['preference_id']),
+    ('goals', 'idx_user_id', ['user_id']),
+    ('goals', 'idx_is_active', ['is_active']),
+    ('daily_reports', 'idx_report_date', ['report_date']),
+]
+
+# InnoDB needs an index on every foreign key column and creates one itself
+# when the models build the schema, so MySQL keeps these
+FOREIGN_KEY_INDEXES = {
+    ('food_items', 'idx_user_id'),
+    ('food_items', 'idx_food_id'),
+    ('meals', 'idx_user_id'),
+    ('meal_foods', 'idx_meal_id'),
+    ('meal_foods', 'idx_food_id'),
+    ('dietary_restrictions', 'idx_preference_id'),
+    ('goals', 'idx_user_id'),
+}
+
+MODEL_INDEXES = [
+    ('users', 'email', True),
+    ('users', 'id', False),
+    ('users', 'username', True),
+    ('foods', 'id', False),
+    ('foods', 'name', False),
+    ('food_items', 'id', False),
+    ('meals', 'id', False),
+    ('meals', 'meal_date', False),
+    ('meal_foods', 'id', False),
+    ('user_preferences', 'id', False),
+    ('dietary_restrictions', 'id', False),
+    ('goals', 'id', False),
+    ('daily_reports', 'id', False),
+    ('daily_reports', 'report_date', False),
+]
+
+# (table, column, enum type) -> labels in schema.sql
+ENUMS = {
+    ('meals', 'meal_type', 'mealtype'): ['breakfast', 'lunch', 'dinner', 'snack'],
+    ('goals', 'goal_type', 'goaltype'): ['weight_loss', 'weight_gain', 'maintenance', 'muscle_gain', 'general_health'],
+}
+
+
+def index_name(table: str, name: str) -> str:
+    """schema.sql's name on MySQL, prefixed with the table elsewhere (see 0001)"""
+    if op.get_context().dialect.name == 'mysql':
+        return name
+    return f'{table}_{name}'
+
+
+def baseline_indexes():
+    mysql = op.get_context().dialect.name == 'mysql'
+    for table, name, columns in BASELINE_INDEXES:
+        if not (mysql and (table, name) in FOREIGN_KEY_INDEXES):
+            yield table, index_name(table, name), columns
+
+
+def convert_timestamps(to_datetime: bool) -> None:
+    # batch mode recreates the table on SQLite, which cannot ALTER a column type
+    for table, columns in TIMESTAMPS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column, keeps_default in columns:
+                baseline_default = sa.func.now()
+                model_default = sa.func.now() if keeps_default else None
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.TIMESTAMP() if to_datetime else sa.DateTime(timezone=True),
+                    type_=sa.DateTime(timezone=True) if to_datetime else sa.TIMESTAMP(),
+                    existing_server_default=baseline_default if to_datetime else model_default,
+                    server_default=model_default if to_datetime else baseline_default,
+                    existing_nullable=True
+                )
+
+
+def relabel_enums(to_names: bool) -> None:
+    dialect = op.get_context().dialect.name
+    for (table, column, type_name), labels in ENUMS.items():
+        names = [label.upper() for label in labels]
+        old, new = (labels, names) if to_names else (names, labels)
+        if dialect == 'postgresql':
+            for old_label, new_label in zip(old, new):
+                op.execute(f"ALTER TYPE {type_name} RENAME VALUE '{old_label}' TO '{new_label}'")
+        elif dialect == 'mysql':
+            # MySQL matches ENUM labels case-insensitively, so rows keep their value
+            op.alter_column(
+                table, column,
+                existing_type=sa.Enum(*old, name=type_name),
+                type_=sa.Enum(*new, name=type_name),
+                existing_nullable=False
+            )
+        else:
+            # Elsewhere the enum is a VARCHAR holding the label
+            case = sa.func.upper if to_names else sa.func.lower
+            rows = sa.table(table, sa.column(column, sa.String))
+            op.execute(rows.update().values({column: case(rows.c[column])}))
+
+
+def upgrade() -> None:
+    for table, name, columns in baseline_indexes():
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_constraint('email', type_='unique')
+        batch_op.drop_constraint('username', type_='unique')
+    convert_timestamps(to_datetime=True)
+    relabel_enums(to_names=True)
+    for table, column, unique in MODEL_INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=unique)
+
+
+def downgrade() -> None:
+    for table, column, unique in reversed(MODEL_INDEXES):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+    relabel_enums(to_names=False)
+    convert_timestamps(to_datetime=False)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.create_unique_constraint('email', ['email'])
+        batch_op.create_unique_constraint('username', ['username'])
+    for table, name, columns in reversed(list(baseline_indexes())):
+        op.create_index(name, table, columns, unique=False)
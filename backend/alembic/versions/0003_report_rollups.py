@@ -0,0 +1,76 @@
+"""Add weekly and monthly report rollups and their checkpoints
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 15:48:20.173364
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('report_rollup_checkpoints',
+    sa.Column('granularity', sa.String(length=20), nullable=False),
+    sa.Column('last_period_start', sa.Date(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('granularity')
+    )
+    op.create_table('monthly_reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('days_logged', sa.Integer(), nullable=False),
+    sa.Column('meal_count', sa.Integer(), nullable=False),
+    sa.Column('total_calories', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_protein', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_carbs', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_fats', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_fiber', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('total_sugar', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('total_sodium', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'period_start', name='uq_monthly_reports_user_period')
+    )
+    op.create_index(op.f('ix_monthly_reports_id'), 'monthly_reports', ['id'], unique=False)
+    op.create_index(op.f('ix_monthly_reports_period_start'), 'monthly_reports', ['period_start'], unique=False)
+    op.create_table('weekly_reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('days_logged', sa.Integer(), nullable=False),
+    sa.Column('meal_count', sa.Integer(), nullable=False),
+    sa.Column('total_calories', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_protein', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_carbs', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_fats', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_fiber', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('total_sugar', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('total_sodium', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'period_start', name='uq_weekly_reports_user_period')
+    )
+    op.create_index(op.f('ix_weekly_reports_id'), 'weekly_reports', ['id'], unique=False)
+    op.create_index(op.f('ix_weekly_reports_period_start'), 'weekly_reports', ['period_start'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_weekly_reports_period_start'), table_name='weekly_reports')
+    op.drop_index(op.f('ix_weekly_reports_id'), table_name='weekly_reports')
+    op.drop_table('weekly_reports')
+    op.drop_index(op.f('ix_monthly_reports_period_start'), table_name='monthly_reports')
+    op.drop_index(op.f('ix_monthly_reports_id'), table_name='monthly_reports')
+    op.drop_table('monthly_reports')
+    op.drop_table('report_rollup_checkpoints')
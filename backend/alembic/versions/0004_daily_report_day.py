@@ -0,0 +1,82 @@
+"""Key daily reports by calendar day: one report per user per day
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 16:05:42.880219
+
+Backfills report_day from report_date and deletes the reports each
+regeneration used to add, keeping the newest per user and day, before
+the unique key goes on.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+daily_reports = sa.table(
+    'daily_reports',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('report_date', sa.DateTime),
+    sa.column('report_day', sa.Date),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def index_name(table: str, name: str) -> str:
+    """schema.sql's name on MySQL, prefixed with the table elsewhere (see 0001)"""
+    if op.get_context().dialect.name == 'mysql':
+        return name
+    return f'{table}_{name}'
+
+
+def delete_superseded_reports() -> None:
+    """Keep only the newest report per user and day: latest write, then highest id"""
+    older = daily_reports.alias('older')
+    newer = daily_reports.alias('newer')
+    
+    def written(report):
+        return sa.func.coalesce(report.c.updated_at, report.c.created_at, report.c.report_date)
+    
+    superseded = (
+        sa.select(older.c.id)
+        .join(newer, sa.and_(
+            newer.c.user_id == older.c.user_id,
+            newer.c.report_day == older.c.report_day,
+            newer.c.id != older.c.id
+        ))
+        .where(sa.or_(
+            written(newer) > written(older),
+            sa.and_(written(newer) == written(older), newer.c.id > older.c.id)
+        ))
+        .subquery()
+    )
+    # The derived table lets MySQL read from the table it is deleting from
+    op.execute(daily_reports.delete().where(daily_reports.c.id.in_(sa.select(superseded.c.id))))
+
+
+def upgrade() -> None:
+    op.add_column('daily_reports', sa.Column('report_day', sa.Date(), nullable=True))
+    op.add_column('daily_reports', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(daily_reports.update().values(report_day=sa.func.date(daily_reports.c.report_date)))
+    delete_superseded_reports()
+    with op.batch_alter_table('daily_reports') as batch_op:
+        batch_op.alter_column('report_day', existing_type=sa.Date(), nullable=False)
+        batch_op.create_unique_constraint('uq_daily_reports_user_day', ['user_id', 'report_day'])
+    # The key's leading column serves user_id lookups and the foreign key
+    op.drop_index(index_name('daily_reports', 'idx_user_id'), table_name='daily_reports')
+
+
+def downgrade() -> None:
+    op.create_index(index_name('daily_reports', 'idx_user_id'), 'daily_reports', ['user_id'], unique=False)
+    with op.batch_alter_table('daily_reports') as batch_op:
+        batch_op.drop_constraint('uq_daily_reports_user_day', type_='unique')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('report_day')
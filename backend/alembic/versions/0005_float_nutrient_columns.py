@@ -0,0 +1,72 @@
+"""Store nutrient amounts as double precision floats instead of Numeric
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 18:02:14.318274
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+REPORT_TOTALS = [
+    ('total_calories', False),
+    ('total_protein', False),
+    ('total_carbs', False),
+    ('total_fats', False),
+    ('total_fiber', True),
+    ('total_sugar', True),
+    ('total_sodium', True),
+]
+
+# table -> (previous Numeric precision, [(column, nullable)])
+NUTRIENT_COLUMNS = {
+    'foods': (10, [
+        ('calories_per_100g', False),
+        ('protein_per_100g', False),
+        ('carbs_per_100g', False),
+        ('fats_per_100g', False),
+        ('fiber_per_100g', True),
+        ('sugar_per_100g', True),
+        ('sodium_per_100g', True),
+    ]),
+    'food_items': (10, [('quantity_g', False)]),
+    'meal_foods': (10, [('quantity_g', False)]),
+    'user_preferences': (10, [
+        ('target_calories', True),
+        ('target_protein', True),
+        ('target_carbs', True),
+        ('target_fats', True),
+    ]),
+    'daily_reports': (10, REPORT_TOTALS),
+    'weekly_reports': (12, REPORT_TOTALS),
+    'monthly_reports': (12, REPORT_TOTALS),
+}
+
+
+def _convert(to_float: bool) -> None:
+    # batch mode recreates the table on SQLite, which cannot ALTER a column type
+    for table, (precision, columns) in NUTRIENT_COLUMNS.items():
+        numeric = sa.Numeric(precision=precision, scale=2)
+        with op.batch_alter_table(table) as batch_op:
+            for column, nullable in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=numeric if to_float else sa.Double(),
+                    type_=sa.Double() if to_float else numeric,
+                    existing_nullable=nullable
+                )
+
+
+def upgrade() -> None:
+    _convert(to_float=True)
+
+
+def downgrade() -> None:
+    _convert(to_float=False)
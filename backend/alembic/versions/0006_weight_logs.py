@@ -0,0 +1,35 @@
+"""Add the weight_logs time series for goal progress
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 21:40:37.512906
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('weight_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('weight_kg', sa.Double(), nullable=False),
+    sa.Column('logged_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_weight_logs_id'), 'weight_logs', ['id'], unique=False)
+    op.create_index('ix_weight_logs_user_logged_at', 'weight_logs', ['user_id', 'logged_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_weight_logs_user_logged_at', table_name='weight_logs')
+    op.drop_index(op.f('ix_weight_logs_id'), table_name='weight_logs')
+    op.drop_table('weight_logs')
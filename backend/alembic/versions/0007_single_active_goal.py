@@ -0,0 +1,45 @@
+"""Keep one active goal per user and index the active-goal lookup
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 22:31:05.864120
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+goals = sa.table(
+    'goals',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('is_active', sa.Boolean),
+)
+
+
+def upgrade() -> None:
+    # Deactivate all but each user's newest active goal. The derived table
+    # lets MySQL read from the table it is updating.
+    newest = (
+        sa.select(sa.func.max(goals.c.id).label('id'))
+        .where(goals.c.is_active == sa.true())
+        .group_by(goals.c.user_id)
+        .subquery()
+    )
+    op.execute(
+        goals.update()
+        .where(goals.c.is_active == sa.true(), goals.c.id.not_in(sa.select(newest.c.id)))
+        .values(is_active=False)
+    )
+    op.create_index('ix_goals_user_active', 'goals', ['user_id', 'is_active'], unique=False)
+
+
+def downgrade() -> None:
+    # Deactivated duplicates are not restored
+    op.drop_index('ix_goals_user_active', table_name='goals')
@@ -0,0 +1,65 @@
+"""
+Analytics endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, timedelta
+from app.core.database import get_db
+from app.core.responses import FastJSONResponse
+from app.api.v1.dependencies import get_current_user
+from app.schemas.analytics import NutritionAnalyticsResponse
+from app.services.analytics_service import AnalyticsService, GRANULARITIES, MAX_RANGE_DAYS
+from app.services.preference_service import PreferenceService
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/nutrition", response_model=NutritionAnalyticsResponse)
+async def get_nutrition_analytics(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    granularity: str = Query("daily", pattern=f"^({'|'.join(GRANULARITIES)})$"),
+    window: int = Query(7, ge=1, le=90),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get calories and macros bucketed by day, week or month, with trailing
+    rolling averages and adherence to the user's targets
+    """
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=29)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+    if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days"
+        )
+    
+    preferences = PreferenceService.get_user_preferences(db, current_user.id)
+    targets = {}
+    if preferences:
+        targets = {
+            "calories": float(preferences.target_calories) if preferences.target_calories else None,
+            "protein": float(preferences.target_protein) if preferences.target_protein else None,
+            "carbs": float(preferences.target_carbs) if preferences.target_carbs else None,
+            "fats": float(preferences.target_fats) if preferences.target_fats else None
+        }
+    
+    return FastJSONResponse(
+        AnalyticsService.get_nutrition_timeseries(
+            db,
+            current_user.id,
+            start_date,
+            end_date,
+            granularity=granularity,
+            window=window,
+            targets=targets
+        )
+    )
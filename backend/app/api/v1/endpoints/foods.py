@@ -23,8 +23,10 @@ async def create_food(
     return FoodService.create_food(db, food_data)
 
 
+# Plain def: runs in the threadpool, so waiting on a cache refresh
+# in another worker does not block the event loop
 @router.get("/", response_model=List[FoodResponse])
-async def get_foods(
+def get_foods(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     db: Session = Depends(get_db),
@@ -35,7 +37,7 @@ async def get_foods(
 
 
 @router.get("/search", response_model=List[FoodResponse])
-async def search_foods(
+def search_foods(
     q: str = Query(..., min_length=1),
     limit: int = Query(20, ge=1, le=50),
     db: Session = Depends(get_db),
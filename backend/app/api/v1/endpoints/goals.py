@@ -1,60 +1,45 @@
 """
 Goal endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
 from app.api.v1.dependencies import get_current_user
-from app.schemas.goal import GoalCreate, GoalResponse
-from app.models.goal import Goal
+from app.schemas.goal import GoalCreate, GoalResponse, WeightLogCreate, WeightLogResponse, GoalProgressResponse
 from app.models.user import User
+from app.services.goal_service import GoalService
+from app.services.goal_progress_service import GoalProgressService
 
 router = APIRouter()
 
 
 @router.post("/", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
-async def create_goal(
+def create_goal(
     goal_data: GoalCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new goal"""
-    from app.models.goal import GoalType
-    
-    db_goal = Goal(
-        user_id=current_user.id,
-        goal_type=GoalType(goal_data.goal_type),
-        target_weight_kg=goal_data.target_weight_kg,
-        current_weight_kg=goal_data.current_weight_kg,
-        target_date=goal_data.target_date
-    )
-    db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
-    return db_goal
+    """Create a new goal; it replaces the user's active goal"""
+    return GoalService.create_goal(db, current_user.id, goal_data)
 
 
 @router.get("/", response_model=List[GoalResponse])
-async def get_goals(
+def get_goals(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user's goals"""
-    goals = db.query(Goal).filter(Goal.user_id == current_user.id).all()
-    return goals
+    return GoalService.get_user_goals(db, current_user.id)
 
 
 @router.get("/active", response_model=GoalResponse)
-async def get_active_goal(
+def get_active_goal(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user's active goal"""
-    goal = db.query(Goal).filter(
-        Goal.user_id == current_user.id,
-        Goal.is_active == True
-    ).first()
+    goal = GoalService.get_active_goal(db, current_user.id)
     
     if not goal:
         raise HTTPException(
@@ -63,3 +48,36 @@ async def get_active_goal(
         )
     return goal
 
+
+@router.post("/weights", response_model=WeightLogResponse, status_code=status.HTTP_201_CREATED)
+def log_weight(
+    weight_data: WeightLogCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Log a weigh-in"""
+    if weight_data.weight_kg <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="weight_kg must be positive"
+        )
+    return GoalProgressService.log_weight(db, current_user.id, weight_data)
+
+
+@router.get("/weights", response_model=List[WeightLogResponse])
+def get_weight_logs(
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get user's weigh-ins, newest first"""
+    return GoalProgressService.get_weight_logs(db, current_user.id, limit)
+
+
+@router.get("/progress", response_model=GoalProgressResponse)
+def get_goal_progress(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get weight trend, calorie balance and projected completion date of the active goal"""
+    return GoalProgressService.get_progress(db, current_user.id)
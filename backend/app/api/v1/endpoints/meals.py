@@ -2,13 +2,19 @@
 Meal endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.api.v1.dependencies import get_current_user
 from app.schemas.food import MealCreate, MealResponse
+from app.services.food_service import FoodService
+from app.services.goal_progress_service import GoalProgressService
 from app.services.meal_service import MealService
+from app.services.meal_serializer import MealSerializer
+from app.services.export_service import ExportService, EXPORT_FORMATS
 from app.models.user import User
 
 router = APIRouter()
@@ -21,80 +27,62 @@ async def create_meal(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new meal"""
+    food_ids = [item.food_id for item in meal_data.foods]
+    unknown = sorted(set(food_ids) - FoodService.get_foods_by_ids(db, food_ids).keys())
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown food ids: {unknown}"
+        )
     meal = MealService.create_meal(db, current_user.id, meal_data)
-    nutrition = MealService.calculate_meal_nutrition(meal)
-    
-    # Convert to response model
-    response = MealResponse(
-        id=meal.id,
-        meal_type=meal.meal_type.value,
-        meal_date=meal.meal_date,
-        notes=meal.notes,
-        meal_foods=[
-            {
-                "id": mf.id,
-                "food_id": mf.food_id,
-                "quantity_g": mf.quantity_g,
-                "food": {
-                    "id": mf.food.id,
-                    "name": mf.food.name,
-                    "description": mf.food.description,
-                    "calories_per_100g": mf.food.calories_per_100g,
-                    "protein_per_100g": mf.food.protein_per_100g,
-                    "carbs_per_100g": mf.food.carbs_per_100g,
-                    "fats_per_100g": mf.food.fats_per_100g,
-                    "fiber_per_100g": mf.food.fiber_per_100g,
-                    "sugar_per_100g": mf.food.sugar_per_100g,
-                    "sodium_per_100g": mf.food.sodium_per_100g
-                }
-            }
-            for mf in meal.meal_foods
-        ],
-        **nutrition
+    GoalProgressService.record_meal(meal)
+    return FastJSONResponse(
+        MealSerializer.serialize_meal(db, meal.id),
+        status_code=status.HTTP_201_CREATED
     )
-    return response
 
 
+# Plain def: runs in the threadpool, so waiting on a cache refresh
+# in another worker does not block the event loop
 @router.get("/", response_model=List[MealResponse])
-async def get_meals(
+def get_meals(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user's meals"""
-    meals = MealService.get_user_meals(db, current_user.id, start_date, end_date)
-    
-    return [
-        MealResponse(
-            id=meal.id,
-            meal_type=meal.meal_type.value,
-            meal_date=meal.meal_date,
-            notes=meal.notes,
-            meal_foods=[
-                {
-                    "id": mf.id,
-                    "food_id": mf.food_id,
-                    "quantity_g": mf.quantity_g,
-                    "food": {
-                        "id": mf.food.id,
-                        "name": mf.food.name,
-                        "description": mf.food.description,
-                        "calories_per_100g": mf.food.calories_per_100g,
-                        "protein_per_100g": mf.food.protein_per_100g,
-                        "carbs_per_100g": mf.food.carbs_per_100g,
-                        "fats_per_100g": mf.food.fats_per_100g,
-                        "fiber_per_100g": mf.food.fiber_per_100g,
-                        "sugar_per_100g": mf.food.sugar_per_100g,
-                        "sodium_per_100g": mf.food.sodium_per_100g
-                    }
-                }
-                for mf in meal.meal_foods
-            ],
-            **MealService.calculate_meal_nutrition(meal)
+    return FastJSONResponse(
+        MealService.get_user_meal_list(db, current_user.id, start_date, end_date)
+    )
+
+
+@router.get("/export")
+async def export_meals(
+    export_format: str = Query("csv", alias="format", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    chunk_size: int = Query(1000, ge=100, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the user's full meal history as CSV, NDJSON, Arrow IPC or Parquet"""
+    if not ExportService.is_supported(export_format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Export format '{export_format}' is not available on this server"
         )
-        for meal in meals
-    ]
+    
+    chunks = MealService.iter_meal_export_rows(
+        db, current_user.id, start_date, end_date, chunk_size=chunk_size
+    )
+    return StreamingResponse(
+        ExportService.stream(export_format, chunks),
+        media_type=ExportService.media_type(export_format),
+        headers={
+            "Content-Disposition": f'attachment; filename="{ExportService.filename(export_format)}"'
+        }
+    )
 
 
 @router.get("/{meal_id}", response_model=MealResponse)
@@ -111,31 +99,4 @@ async def get_meal(
             detail="Meal not found"
         )
     
-    return MealResponse(
-        id=meal.id,
-        meal_type=meal.meal_type.value,
-        meal_date=meal.meal_date,
-        notes=meal.notes,
-        meal_foods=[
-            {
-                "id": mf.id,
-                "food_id": mf.food_id,
-                "quantity_g": mf.quantity_g,
-                "food": {
-                    "id": mf.food.id,
-                    "name": mf.food.name,
-                    "description": mf.food.description,
-                    "calories_per_100g": mf.food.calories_per_100g,
-                    "protein_per_100g": mf.food.protein_per_100g,
-                    "carbs_per_100g": mf.food.carbs_per_100g,
-                    "fats_per_100g": mf.food.fats_per_100g,
-                    "fiber_per_100g": mf.food.fiber_per_100g,
-                    "sugar_per_100g": mf.food.sugar_per_100g,
-                    "sodium_per_100g": mf.food.sodium_per_100g
-                }
-            }
-            for mf in meal.meal_foods
-        ],
-        **MealService.calculate_meal_nutrition(meal)
-    )
-
+    return FastJSONResponse(MealSerializer.serialize_meal(db, meal.id))
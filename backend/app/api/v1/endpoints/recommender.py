@@ -4,13 +4,19 @@ Recommender endpoints - RAG-based recommendations
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from functools import lru_cache
 from app.core.database import get_db
 from app.api.v1.dependencies import get_current_user
 from app.services.recommender_service import RecommenderService
 from app.models.user import User
 
 router = APIRouter()
-recommender_service = RecommenderService()
+
+
+@lru_cache(maxsize=None)
+def get_recommender_service() -> RecommenderService:
+    """Process-wide recommender, created on the first recommendation request"""
+    return RecommenderService()
 
 
 @router.get("/recommendations")
@@ -18,7 +24,8 @@ async def get_recommendations(
     target_calories: Optional[float] = Query(None),
     dietary_restrictions: Optional[str] = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    recommender_service: RecommenderService = Depends(get_recommender_service)
 ):
     """
     Get personalized food recommendations using RAG
@@ -4,10 +4,10 @@ Report endpoints
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 from app.core.database import get_db
 from app.api.v1.dependencies import get_current_user
-from app.schemas.report import ReportResponse
+from app.schemas.report import ReportResponse, PeriodReportResponse
 from app.services.report_service import ReportService
 from app.models.user import User
 
@@ -35,6 +35,28 @@ async def get_reports(
     return ReportService.get_user_reports(db, current_user.id, start_date, end_date)
 
 
+@router.get("/weekly", response_model=List[PeriodReportResponse])
+async def get_weekly_reports(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get user's weekly reports (materialized nightly)"""
+    return ReportService.get_period_reports(db, current_user.id, "weekly", start_date, end_date)
+
+
+@router.get("/monthly", response_model=List[PeriodReportResponse])
+async def get_monthly_reports(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get user's monthly reports (materialized nightly)"""
+    return ReportService.get_period_reports(db, current_user.id, "monthly", start_date, end_date)
+
+
 @router.get("/today", response_model=ReportResponse)
 async def get_today_report(
     db: Session = Depends(get_db),
@@ -2,7 +2,7 @@
 API v1 router - aggregates all endpoint routers
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, foods, meals, preferences, goals, reports, recommender
+from app.api.v1.endpoints import auth, users, foods, meals, preferences, goals, reports, recommender, analytics
 
 api_router = APIRouter()
 
@@ -14,4 +14,4 @@ api_router.include_router(preferences.router, prefix="/preferences", tags=["pref
 api_router.include_router(goals.router, prefix="/goals", tags=["goals"])
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(recommender.router, prefix="/recommender", tags=["recommender"])
-
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
@@ -0,0 +1,104 @@
+"""
+Request-scoped batch loading through the cache
+Follows SOLID principles - Single Responsibility
+"""
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Mapping, Optional, TypeVar
+from app.core.redis_client import CacheService
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_PENDING = object()
+
+
+class Deferred(Generic[K, V]):
+    """A value queued on a BatchLoader; get() dispatches the batch if needed"""
+    
+    def __init__(self, loader: "BatchLoader[K, V]", key: K):
+        self._loader = loader
+        self._key = key
+    
+    def get(self) -> Optional[V]:
+        """The loaded value, or None if it does not exist"""
+        return self._loader._resolve(self._key)
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    DataLoader-style batching: keys queued with load() during a request are
+    resolved together with one cache MGET, one batch_fn call for the misses
+    and one pipelined write-back, instead of a round trip per key.
+    
+    batch_fn receives the missing keys and returns {key: value} for those
+    that exist. Results are memoized for the loader's lifetime, so create
+    one loader per request (or per service call) and never share it.
+    """
+    
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Mapping[K, V]],
+        cache_key: Optional[Callable[[K], Optional[str]]] = None,
+        expire: int = 3600,
+        model: Any = None
+    ):
+        self._batch_fn = batch_fn
+        self._cache_key = cache_key
+        self._expire = expire
+        self._model = model
+        self._results: Dict[K, Any] = {}
+        self._queue: List[K] = []
+    
+    def load(self, key: K) -> Deferred[K, V]:
+        """Queue a key; its value is fetched with the next dispatch"""
+        if key not in self._results:
+            self._results[key] = _PENDING
+            self._queue.append(key)
+        return Deferred(self, key)
+    
+    def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Load several keys in one batch, in order (None where missing)"""
+        deferred = [self.load(key) for key in keys]
+        self.dispatch()
+        return [d.get() for d in deferred]
+    
+    def prime(self, key: K, value: V) -> None:
+        """Seed the memo with a value already in hand"""
+        if key in self._queue:
+            self._queue.remove(key)
+        self._results[key] = value
+    
+    def dispatch(self) -> None:
+        """Resolve every queued key"""
+        keys, self._queue = self._queue, []
+        if not keys:
+            return
+        
+        missing = keys
+        cache_keys: Dict[K, Optional[str]] = {}
+        if self._cache_key is not None:
+            cache_keys = {key: self._cache_key(key) for key in keys}
+            cached = CacheService.get_many([cache_keys[key] for key in keys], self._model)
+            missing = []
+            for key, value in zip(keys, cached):
+                if value is None:
+                    missing.append(key)
+                else:
+                    self._results[key] = value
+        
+        if missing:
+            loaded = self._batch_fn(missing)
+            for key in missing:
+                self._results[key] = loaded.get(key)
+            if self._cache_key is not None and loaded:
+                CacheService.set_many(
+                    {cache_keys[key]: value for key, value in loaded.items() if key in cache_keys},
+                    expire=self._expire
+                )
+    
+    def _resolve(self, key: K) -> Optional[V]:
+        """Value for a loaded key, dispatching the pending batch first"""
+        if self._results.get(key, _PENDING) is _PENDING:
+            if key not in self._results:
+                self.load(key)
+            self.dispatch()
+        return self._results[key]
@@ -0,0 +1,255 @@
+"""
+Cache value encoding: serialization codecs and compression
+Follows SOLID principles - Single Responsibility
+
+Every stored value starts with a one-byte header:
+
+    high nibble - compression (0 none, 1 zlib, 2 lz4)
+    low nibble  - codec (0 json, 1 orjson, 2 msgpack)
+
+so an entry can always be decoded, whichever CACHE_CODEC / CACHE_COMPRESSION
+the writing worker used (e.g. halfway through a rolling deploy).
+
+Decimal is written as float, pydantic models and dataclasses as their
+fields. Datetimes are written as ISO strings by the JSON codecs and as a
+msgpack extension type by msgpack; pass a model to decode() to get typed
+values back (datetimes, floats, nested schemas) in all cases.
+"""
+import dataclasses
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, TypeAdapter
+from app.core.config import settings
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+try:
+    import lz4.block
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Fast levels: cache entries are small and written on the request path
+ZLIB_LEVEL = 1
+
+# msgpack extension type codes
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+
+
+def _json_default(value: Any) -> Any:
+    """Encode types the JSON codecs do not handle natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Encode types msgpack does not handle natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Decode the extension types written by _msgpack_default"""
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class JsonCodec:
+    """Standard library json; always available"""
+    id = 0
+    name = "json"
+    is_json = True
+    
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        """Serialize to bytes"""
+        return json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+    
+    @staticmethod
+    def loads(payload: bytes) -> Any:
+        """Deserialize to plain Python values"""
+        return json.loads(payload)
+
+
+class OrjsonCodec:
+    """orjson: JSON output, several times faster than json"""
+    id = 1
+    name = "orjson"
+    is_json = True
+    
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        """Serialize to bytes"""
+        return orjson.dumps(value, default=_json_default)
+    
+    @staticmethod
+    def loads(payload: bytes) -> Any:
+        """Deserialize to plain Python values"""
+        return orjson.loads(payload)
+
+
+class MsgpackCodec:
+    """msgpack: compact binary output that keeps datetimes typed"""
+    id = 2
+    name = "msgpack"
+    is_json = False
+    
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        """Serialize to bytes"""
+        return msgpack.packb(value, default=_msgpack_default)
+    
+    @staticmethod
+    def loads(payload: bytes) -> Any:
+        """Deserialize to plain Python values"""
+        return msgpack.unpackb(payload, ext_hook=_msgpack_ext_hook, strict_map_key=False)
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+_CODECS_BY_ID = {codec.id: codec for codec in CODECS.values()}
+_CODEC_AVAILABLE = {"json": True, "orjson": ORJSON_AVAILABLE, "msgpack": MSGPACK_AVAILABLE}
+
+# What the codecs, decompressors and pydantic raise on bad input
+# (json, orjson, msgpack and ValidationError are all ValueErrors)
+_DECODE_ERRORS = (ValueError, TypeError, IndexError, zlib.error) + (
+    (lz4.block.LZ4BlockError,) if LZ4_AVAILABLE else ()
+)
+
+
+class DecodeError(ValueError):
+    """Stored bytes that do not decode to a value"""
+
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZ4 = 2
+COMPRESSIONS: Dict[str, int] = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "lz4": COMPRESSION_LZ4}
+
+
+@lru_cache(maxsize=None)
+def get_codec(name: str):
+    """Codec by name, falling back to json when its library is not installed"""
+    if name not in CODECS:
+        raise ValueError(f"Unknown cache codec: {name}")
+    if not _CODEC_AVAILABLE[name]:
+        logger.warning("cache codec %s is not installed, using json", name)
+        return JsonCodec
+    return CODECS[name]
+
+
+@lru_cache(maxsize=None)
+def get_compression(name: str) -> int:
+    """Compression id by name, falling back to zlib when lz4 is not installed"""
+    if name not in COMPRESSIONS:
+        raise ValueError(f"Unknown cache compression: {name}")
+    if name == "lz4" and not LZ4_AVAILABLE:
+        logger.warning("lz4 is not installed, compressing cache values with zlib")
+        return COMPRESSION_ZLIB
+    return COMPRESSIONS[name]
+
+
+@lru_cache(maxsize=256)
+def _type_adapter(model: Any) -> TypeAdapter:
+    """Cached TypeAdapter for a schema or type such as List[MealResponse]"""
+    return TypeAdapter(model)
+
+
+def _compress(payload: bytes, compression: int) -> bytes:
+    """Compress with zlib or lz4"""
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(payload, ZLIB_LEVEL)
+    return lz4.block.compress(payload)
+
+
+def _decompress(payload: bytes, compression: int) -> bytes:
+    """Undo _compress, given the compression id from the header"""
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(payload)
+    if compression == COMPRESSION_LZ4:
+        if not LZ4_AVAILABLE:
+            raise DecodeError("lz4 is not installed")
+        return lz4.block.decompress(payload)
+    if compression != COMPRESSION_NONE:
+        raise DecodeError(f"Unknown cache compression id: {compression}")
+    return payload
+
+
+def encode(
+    value: Any,
+    codec: Optional[str] = None,
+    compression: Optional[str] = None,
+    min_bytes: Optional[int] = None
+) -> bytes:
+    """Serialize value for Redis; arguments default to the CACHE_* settings"""
+    serializer = get_codec(codec or settings.CACHE_CODEC)
+    method = get_compression(compression or settings.CACHE_COMPRESSION)
+    threshold = settings.CACHE_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    
+    payload = serializer.dumps(value)
+    if method != COMPRESSION_NONE and len(payload) >= threshold:
+        compressed = _compress(payload, method)
+        # Incompressible payloads are stored as they are
+        if len(compressed) < len(payload):
+            return bytes(((method << 4) | serializer.id,)) + compressed
+    return bytes((serializer.id,)) + payload
+
+
+def decode(data: bytes, model: Any = None) -> Any:
+    """
+    Deserialize a value written by encode().
+    With a model (a schema or a type like List[MealResponse]) the result is
+    validated into it, parsing datetimes and numbers back to their types.
+    Raises DecodeError for bytes that cannot be read back.
+    """
+    try:
+        header = data[0]
+        serializer = _CODECS_BY_ID.get(header & 0x0F)
+        if serializer is None:
+            raise DecodeError(f"Unknown cache codec id: {header & 0x0F}")
+        payload = _decompress(data[1:], header >> 4)
+        if model is None:
+            return serializer.loads(payload)
+        adapter = _type_adapter(model)
+        if serializer.is_json:
+            # pydantic parses JSON bytes directly, without building dicts first
+            return adapter.validate_json(payload)
+        return adapter.validate_python(serializer.loads(payload))
+    except DecodeError:
+        raise
+    except _DECODE_ERRORS as exc:
+        # Truncated or corrupt bytes, or a value that no longer fits the model
+        raise DecodeError(f"{type(exc).__name__}: {exc}") from exc
@@ -0,0 +1,185 @@
+"""
+Cache key registry and group invalidation
+Follows SOLID principles - Single Responsibility
+
+Every cache key is built here. Keys that must be invalidated together
+belong to a group and embed the group's generation:
+
+    {namespace}:v{KEY_VERSION}:{group}:g{generation}:{suffix}
+
+The generation is a Redis counter at {namespace}:gen:{group}. Invalidating
+a group is a single INCR: readers build keys with the new generation, and
+entries under older generations are never read again and expire through
+their TTL. No SCAN/DEL is needed.
+
+Each worker keeps the generations it has read for
+CACHE_GENERATION_TTL_SECONDS, so a burst of grouped reads costs one GET for
+the counter instead of one per read. The worker that invalidates a group
+sees the new generation at once; other workers see it within that TTL.
+"""
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.redis_client import CacheService
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shape of cached values changes, to orphan every old entry on deploy
+KEY_VERSION = 5
+
+# group -> (generation, when it was read); bounded, as groups are per user
+_generations: Dict[str, Tuple[int, float]] = {}
+_GENERATIONS_MAX = 10_000
+_clock = time.monotonic
+
+
+def generation_key(group: str) -> str:
+    """Redis key holding a group's generation counter"""
+    return f"{settings.CACHE_NAMESPACE}:gen:{group}"
+
+
+def _remember_generation(group: str, generation: int) -> None:
+    """Cache a generation read from Redis, never replacing a newer one still fresh"""
+    now = _clock()
+    cached = _generations.get(group)
+    if cached is not None and cached[0] > generation and now - cached[1] < settings.CACHE_GENERATION_TTL_SECONDS:
+        return
+    if len(_generations) >= _GENERATIONS_MAX:
+        ttl = settings.CACHE_GENERATION_TTL_SECONDS
+        for stale in [key for key, (_, read_at) in _generations.items() if now - read_at >= ttl]:
+            _generations.pop(stale, None)
+        if len(_generations) >= _GENERATIONS_MAX:
+            _generations.clear()
+    _generations[group] = (generation, now)
+
+
+def current_generation(group: str) -> Optional[int]:
+    """A group's generation, from this worker's copy while it is fresh; None if Redis is unavailable"""
+    cached = _generations.get(group)
+    if cached is not None and _clock() - cached[1] < settings.CACHE_GENERATION_TTL_SECONDS:
+        return cached[0]
+    generation = CacheService.get_counter(generation_key(group))
+    if generation is not None and settings.CACHE_GENERATION_TTL_SECONDS > 0:
+        _remember_generation(group, generation)
+    return generation
+
+
+def forget_generations() -> None:
+    """Drop this worker's copies, so the next keys re-read every counter"""
+    _generations.clear()
+
+
+def build_key(group: Optional[str], suffix: str) -> Optional[str]:
+    """
+    Build a namespaced key, versioned by the group's current generation.
+    Returns None when the generation cannot be read: caching under a guessed
+    generation could serve entries that were invalidated while Redis was away.
+    """
+    prefix = f"{settings.CACHE_NAMESPACE}:v{KEY_VERSION}"
+    if group is None:
+        return f"{prefix}:{suffix}"
+    generation = current_generation(group)
+    if generation is None:
+        return None
+    return f"{prefix}:{group}:g{generation}:{suffix}"
+
+
+def invalidate(group: str) -> bool:
+    """Invalidate every key in a group with one INCR"""
+    generation = CacheService.incr(generation_key(group))
+    if generation is None:
+        _generations.pop(group, None)
+        logger.warning("could not invalidate cache group %s", group)
+        return False
+    if settings.CACHE_GENERATION_TTL_SECONDS > 0:
+        _remember_generation(group, generation)
+    return True
+
+
+class CacheKeys:
+    """
+    Registry of the keys used by the services.
+    Compute a key once, before reading the database, and reuse it for the
+    write-back: if the group is invalidated in between, the write-back lands
+    under the old generation and is never served.
+    """
+    
+    # Groups
+    
+    @staticmethod
+    def foods_group() -> str:
+        """Every food list and search result"""
+        return "foods"
+    
+    @staticmethod
+    def user_meals_group(user_id: int) -> str:
+        """Every cached meal list of one user"""
+        return f"meals:user:{user_id}"
+    
+    @staticmethod
+    def user_preferences_group(user_id: int) -> str:
+        """One user's preferences"""
+        return f"preferences:user:{user_id}"
+    
+    @staticmethod
+    def user_goals_group(user_id: int) -> str:
+        """One user's goals"""
+        return f"goals:user:{user_id}"
+    
+    @staticmethod
+    def user_progress_group(user_id: int) -> str:
+        """One user's goal progress state"""
+        return f"progress:user:{user_id}"
+    
+    # Keys
+    
+    @staticmethod
+    def user_by_email(email: str) -> Optional[str]:
+        """User id by email (users are never renamed, so not grouped)"""
+        return build_key(None, f"user:email:{email}")
+    
+    @staticmethod
+    def user_by_username(username: str) -> Optional[str]:
+        """User id by username"""
+        return build_key(None, f"user:username:{username}")
+    
+    @staticmethod
+    def user_by_id(user_id: int) -> Optional[str]:
+        """User existence by id"""
+        return build_key(None, f"user:id:{user_id}")
+    
+    @staticmethod
+    def food_by_id(food_id: int) -> Optional[str]:
+        """Single food (foods are immutable once created)"""
+        return build_key(None, f"food:id:{food_id}")
+    
+    @staticmethod
+    def food_list(skip: int, limit: int) -> Optional[str]:
+        """Page of the food catalog"""
+        return build_key(CacheKeys.foods_group(), f"list:{skip}:{limit}")
+    
+    @staticmethod
+    def food_search(query: str, limit: int) -> Optional[str]:
+        """Food search result ids"""
+        return build_key(CacheKeys.foods_group(), f"search:{query}:{limit}")
+    
+    @staticmethod
+    def user_meal_list(user_id: int, start_date, end_date) -> Optional[str]:
+        """Serialized GET /meals/ payload for a date range"""
+        return build_key(CacheKeys.user_meals_group(user_id), f"list:{start_date}:{end_date}")
+    
+    @staticmethod
+    def user_preferences(user_id: int) -> Optional[str]:
+        """User's PreferenceSnapshot"""
+        return build_key(CacheKeys.user_preferences_group(user_id), "id")
+    
+    @staticmethod
+    def active_goal(user_id: int) -> Optional[str]:
+        """User's active goal, or the fact that there is none"""
+        return build_key(CacheKeys.user_goals_group(user_id), "active")
+    
+    @staticmethod
+    def user_progress(user_id: int) -> Optional[str]:
+        """User's goal progress window (weigh-ins and meal calories)"""
+        return build_key(CacheKeys.user_progress_group(user_id), "window")
@@ -12,7 +12,52 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: Union[str, List[str]] = []  # Read-only replicas, comma-separated
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 300
+    DB_ECHO: bool = False  # Log every SQL statement; independent of DEBUG
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    
+    # Cache key space: every key is prefixed with "{CACHE_NAMESPACE}:v{version}:"
+    CACHE_NAMESPACE: str = "nutribite"
+    CACHE_GENERATION_TTL_SECONDS: float = 1.0  # How long a worker reuses a group generation; 0 reads it every time
+    
+    # Cache value encoding (see app/core/cache_codec.py)
+    CACHE_CODEC: str = "orjson"  # json, orjson or msgpack
+    CACHE_COMPRESSION: str = "lz4"  # none, zlib or lz4
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+    
+    # Cache stampede protection (CacheService.get_or_set)
+    CACHE_TTL_JITTER: float = 0.1  # TTLs vary by +/- 10%
+    CACHE_XFETCH_BETA: float = 1.0  # >1 refreshes earlier, 0 disables early refresh
+    CACHE_LOCK_TIMEOUT_MS: int = 5000
+    CACHE_LOCK_WAIT_SECONDS: float = 2.0
+    CACHE_LOCK_POLL_SECONDS: float = 0.05
+    
+    # Cache circuit breaker: stop calling Redis after repeated failures
+    CACHE_BREAKER_FAILURES: int = 5
+    CACHE_BREAKER_COOLDOWN_SECONDS: float = 30.0
+    
+    # Food catalog snapshot shared by the workers on a host (app/services/food_catalog.py)
+    FOOD_CATALOG_DIR: str = ""  # Defaults to a directory under the system temp dir
+    FOOD_CATALOG_CHECK_SECONDS: float = 1.0
+    FOOD_CATALOG_REBUILD_DELAY_SECONDS: float = 2.0  # Debounce for background rebuilds after new foods
+    
+    # Goal progress (app/services/goal_progress_service.py)
+    GOAL_PROGRESS_WINDOW_DAYS: int = 28  # Trailing window for the weight trend and calorie balance
+    GOAL_PROGRESS_CACHE_SECONDS: int = 86400
+    
+    # Startup warm-up
+    STARTUP_WARM_CONNECTIONS: int = 2
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = 5.0
+    
+    # Health probes
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_CACHE_SECONDS: float = 5.0
     
     # Security
     SECRET_KEY: str
@@ -27,10 +72,16 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     CORS_ORIGINS: Union[str, List[str]] = ["http://localhost:3000", "http://localhost:5173"]
     
-    @field_validator('CORS_ORIGINS', mode='before')
+    # Profiling
+    PROFILE_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled automatically
+    PROFILE_HEADER_ENABLED: bool = False  # Allow clients to opt in with the X-Profile header
+    PROFILE_TOP_STATEMENTS: int = 5
+    SLOW_QUERY_MS: float = 200.0
+    
+    @field_validator('CORS_ORIGINS', 'DATABASE_REPLICA_URLS', mode='before')
     @classmethod
     def parse_cors_origins(cls, v):
-        """Parse CORS_ORIGINS from comma-separated string or list"""
+        """Parse CORS_ORIGINS / DATABASE_REPLICA_URLS from comma-separated string or list"""
         if isinstance(v, str):
             # Split by comma and strip whitespace
             return [origin.strip() for origin in v.split(',') if origin.strip()]
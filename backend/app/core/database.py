@@ -2,19 +2,98 @@
 Database connection and session management
 Follows SOLID principles - Single Responsibility
 """
-from sqlalchemy import create_engine
+import itertools
+from contextlib import contextmanager
+from typing import List
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.profiling import enable_query_profiler
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.DEBUG
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def build_engine(url: str) -> Engine:
+    """Create an engine with the pool settings from Settings"""
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "echo": settings.DB_ECHO
+    }
+    parsed = make_url(url)
+    # In-memory SQLite uses a single-connection pool that takes no sizing options
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT
+        )
+    return create_engine(url, **options)
+
+
+engine = build_engine(settings.DATABASE_URL)
+instrument_engine(engine, "primary")
+
+replica_engines: List[Engine] = [build_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+for index, replica in enumerate(replica_engines):
+    instrument_engine(replica, f"replica_{index}")
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+enable_query_profiler()
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica inside read_replica(), and
+    everything else to the primary. Once the session has written in the
+    current transaction it stays on the primary so it can read its own writes.
+    
+    Replicas lag, so replica reads must not fill the shared cache or gate a
+    write: after an invalidation they would cache stale rows under the new
+    generation. Cache loaders and existence checks read the primary; replicas
+    serve uncached reads and re-load rows by ids that came from the primary.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        """Pick the engine for the next statement"""
+        if (
+            self.info.get("read_replica")
+            and _replica_cycle is not None
+            and not self.info.get("wrote")
+            and not self._flushing
+            and not (self.new or self.dirty or self.deleted)
+        ):
+            return next(_replica_cycle)
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_wrote(session, flush_context):
+    """Pin the session to the primary for the rest of the transaction"""
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _clear_wrote(session):
+    """A new transaction may read from replicas again"""
+    session.info.pop("wrote", None)
+
+
+@contextmanager
+def read_replica(db: Session):
+    """Route the session's queries to a read replica, if any are configured"""
+    previous = db.info.get("read_replica", False)
+    db.info["read_replica"] = True
+    try:
+        yield db
+    finally:
+        db.info["read_replica"] = previous
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -29,4 +108,3 @@ def get_db():
         yield db
     finally:
         db.close()
-
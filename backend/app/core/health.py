@@ -0,0 +1,119 @@
+"""
+Dependency health probes for liveness and readiness checks
+Follows SOLID principles - Single Responsibility
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import engine
+from app.core.redis_client import redis_client, cache_breaker
+
+
+def probe_database() -> None:
+    """Run a trivial query on a pooled connection"""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def probe_redis() -> None:
+    """PING Redis directly, bypassing the cache circuit breaker"""
+    redis_client.ping()
+
+
+class HealthChecker:
+    """
+    Runs blocking dependency probes in worker threads with a hard timeout
+    and caches the combined result for ttl_seconds, so frequent readiness
+    polls do not each open a DB connection and a Redis round trip.
+    
+    A thread cannot be cancelled, so a probe that timed out keeps running.
+    Each dependency has at most one probe in flight: later checks wait on
+    the running one instead of starting another thread.
+    """
+    
+    def __init__(
+        self,
+        probes: Dict[str, Callable[[], None]],
+        timeout_seconds: float,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.probes = probes
+        self.timeout_seconds = timeout_seconds
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock: Optional[asyncio.Lock] = None
+        self._cached: Optional[Dict[str, dict]] = None
+        self._checked_at = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="health-probe")
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+    
+    def _start_probe(self, name: str) -> Future:
+        """The running probe for name, or a newly started one if the last has finished"""
+        with self._in_flight_lock:
+            future = self._in_flight.get(name)
+            if future is None or future.done():
+                future = self._in_flight[name] = self._executor.submit(self.probes[name])
+            return future
+    
+    async def _run_probe(self, name: str) -> dict:
+        """Run one probe and report its status and latency"""
+        start = time.perf_counter()
+        try:
+            # shield: a timeout must not cancel the shared future
+            future = asyncio.wrap_future(self._start_probe(name))
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout_seconds)
+            result = {"status": "up"}
+        except asyncio.TimeoutError:
+            result = {"status": "down", "error": f"timed out after {self.timeout_seconds}s"}
+        except Exception as exc:
+            result = {"status": "down", "error": type(exc).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+    
+    async def check(self) -> Dict[str, dict]:
+        """Probe every dependency concurrently, reusing a fresh cached result"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._cached is not None and self._clock() - self._checked_at < self.ttl_seconds:
+                return self._cached
+            names = list(self.probes)
+            results = await asyncio.gather(*(self._run_probe(name) for name in names))
+            self._cached = dict(zip(names, results))
+            self._checked_at = self._clock()
+            return self._cached
+    
+    def invalidate(self) -> None:
+        """Drop the cached result so the next check probes again"""
+        self._cached = None
+
+
+health_checker = HealthChecker(
+    probes={"database": probe_database, "redis": probe_redis},
+    timeout_seconds=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    ttl_seconds=settings.HEALTH_CACHE_SECONDS
+)
+
+
+async def readiness() -> tuple:
+    """
+    Build the readiness payload and HTTP status.
+    The database is required; Redis is optional because CacheService
+    falls back to the database, so a Redis outage only degrades the service.
+    """
+    checks = await health_checker.check()
+    checks = {name: dict(result) for name, result in checks.items()}
+    if "redis" in checks:
+        checks["redis"]["circuit_breaker"] = cache_breaker.state
+    
+    if checks.get("database", {}).get("status") != "up":
+        return {"status": "unavailable", "checks": checks}, 503
+    if any(result["status"] != "up" for result in checks.values()):
+        return {"status": "degraded", "checks": checks}, 200
+    return {"status": "ready", "checks": checks}, 200
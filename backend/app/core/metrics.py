@@ -0,0 +1,381 @@
+"""
+Prometheus-style metrics: counters, gauges and histograms exported as text
+Follows SOLID principles - Single Responsibility
+
+Hot-path updates are lock-free: every thread writes to its own shard and
+shards are only summed when /metrics is scraped. A lock is taken once per
+thread per metric, when the shard is first created.
+"""
+import bisect
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, exc
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    """Render a Prometheus label set"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding per-thread shards"""
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+    
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+    
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+    
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [dict(list(shard.items())) for shard in shards]
+    
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        lines.extend(self._render_samples())
+        return lines
+    
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    type_name = "counter"
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        shard = self._shard()
+        key = self._label_values(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+    
+    def collect(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+    
+    def value(self, **labels) -> float:
+        return self.collect().get(self._label_values(labels), 0.0)
+    
+    def _render_samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.collect().items())
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram"""
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+    
+    def observe(self, value: float, **labels) -> None:
+        shard = self._shard()
+        key = self._label_values(labels)
+        state = shard.get(key)
+        if state is None:
+            # [per-bucket counts..., sum, count]
+            state = [0] * len(self.buckets) + [0.0, 0]
+            shard[key] = state
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+    
+    def collect(self) -> Dict[LabelValues, list]:
+        totals: Dict[LabelValues, list] = {}
+        for shard in self._snapshot():
+            for key, state in shard.items():
+                state = list(state)
+                current = totals.get(key)
+                if current is None:
+                    totals[key] = state
+                else:
+                    totals[key] = [a + b for a, b in zip(current, state)]
+        return totals
+    
+    def _render_samples(self) -> List[str]:
+        lines = []
+        for key, state in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state[:len(self.buckets)]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time"""
+    type_name = "gauge"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._callbacks: List[Callable[[], Dict[LabelValues, float]]] = []
+        if callback:
+            self._callbacks.append(callback)
+    
+    def add_callback(self, callback: Callable[[], Dict[LabelValues, float]]) -> None:
+        self._callbacks.append(callback)
+    
+    def _render_samples(self) -> List[str]:
+        samples: Dict[LabelValues, float] = {}
+        for callback in list(self._callbacks):
+            try:
+                samples.update(callback())
+            except Exception:
+                continue
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(samples.items())
+        ]
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in Prometheus text format"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                return self._metrics[metric.name]
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS
+)
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL per HTTP request",
+    ("method", "route")
+)
+
+# Database
+db_queries_total = registry.counter(
+    "db_queries_total",
+    "SQL statements executed",
+    ("pool",)
+)
+db_query_duration_total = registry.counter(
+    "db_query_duration_seconds_total",
+    "Cumulative SQL execution time",
+    ("pool",)
+)
+db_pool_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ("pool",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+db_pool_checkout_timeouts_total = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ("pool",)
+)
+db_pool_connections = registry.gauge(
+    "db_pool_connections",
+    "Pool connections by state",
+    ("pool", "state")
+)
+
+# Cache
+cache_operations_total = registry.counter(
+    "cache_operations_total",
+    "Redis cache operations by result",
+    ("operation", "result")
+)
+
+# Per-request SQL accounting: [query count, seconds]; None outside a request
+_request_db_stats: ContextVar[Optional[list]] = ContextVar("request_db_stats", default=None)
+_instrumented_engines = weakref.WeakSet()
+
+
+def instrument_engine(engine, pool_name: str = "primary") -> None:
+    """Attach query counters, checkout-wait timing and pool gauges to an engine"""
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - getattr(context, "_metrics_started", time.perf_counter())
+        db_queries_total.inc(pool=pool_name)
+        db_query_duration_total.inc(elapsed, pool=pool_name)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += elapsed
+    
+    # The pool has no "before checkout" event, so time the call that blocks on it.
+    # Wrapping at the engine level survives engine.dispose() recreating the pool.
+    raw_connection = engine.raw_connection
+    
+    def timed_raw_connection(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return raw_connection(*args, **kwargs)
+        except exc.TimeoutError:
+            db_pool_checkout_timeouts_total.inc(pool=pool_name)
+            raise
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started, pool=pool_name)
+    
+    engine.raw_connection = timed_raw_connection
+    
+    def pool_state() -> Dict[LabelValues, float]:
+        pool = engine.pool
+        samples = {}
+        for state, reader in (
+            ("checked_out", "checkedout"),
+            ("checked_in", "checkedin"),
+            ("overflow", "overflow"),
+            ("size", "size")
+        ):
+            if hasattr(pool, reader):
+                samples[(pool_name, state)] = float(getattr(pool, reader)())
+        return samples
+    
+    db_pool_connections.add_callback(pool_state)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and SQL usage per route template.
+    Routes are labelled by their path template (/api/v1/meals/{meal_id}) so
+    label cardinality stays bounded.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status_holder = [500]
+        token = _request_db_stats.set([0, 0.0])
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            stats = _request_db_stats.get()
+            _request_db_stats.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_duration.observe(elapsed, method=method, route=route_path, status=str(status_holder[0]))
+            http_request_db_queries.observe(stats[0], method=method, route=route_path)
+            http_request_db_duration.observe(stats[1], method=method, route=route_path)
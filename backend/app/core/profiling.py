@@ -0,0 +1,173 @@
+"""
+Per-request SQL profiler and slow-query log
+Follows SOLID principles - Single Responsibility
+
+Profiling is opt-in per request, either through the X-Profile header (when
+PROFILE_HEADER_ENABLED is set) or by sampling PROFILE_SAMPLE_RATE of
+traffic. A profiled request gets a Server-Timing header with its query
+count, total SQL time and slowest statements. Statements slower than
+SLOW_QUERY_MS are logged for every request, keyed by a fingerprint that
+strips literals so the same query shape always groups together.
+"""
+import hashlib
+import heapq
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+PROFILE_HEADER = "x-profile"
+
+slow_query_logger = logging.getLogger("app.slow_query")
+profile_logger = logging.getLogger("app.profiling")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_BIND_PARAM = re.compile(r"%\([^)]+\)s|%s|:\w+|\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+
+
+def normalize_statement(statement: str) -> str:
+    """Replace literals and bind parameters with ?, collapse IN lists and whitespace"""
+    normalized = _COMMENT.sub(" ", statement)
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(statement: str) -> str:
+    """Short stable identifier for a statement shape"""
+    return hashlib.sha1(normalize_statement(statement).encode("utf-8")).hexdigest()[:12]
+
+
+class RequestProfile:
+    """SQL activity collected for one request"""
+    
+    __slots__ = ("route", "query_count", "sql_seconds", "top_n", "_slowest", "_sequence")
+    
+    def __init__(self, route: str, top_n: int):
+        self.route = route
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.top_n = top_n
+        self._slowest: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+    
+    def record(self, statement: str, elapsed: float) -> None:
+        self.query_count += 1
+        self.sql_seconds += elapsed
+        self._sequence += 1
+        entry = (elapsed, self._sequence, statement)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif elapsed > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+    
+    def slowest(self) -> List[Tuple[float, str]]:
+        """Slowest statements, slowest first"""
+        return [(elapsed, statement) for elapsed, _, statement in sorted(self._slowest, reverse=True)]
+    
+    def server_timing(self, total_seconds: float) -> str:
+        """Render as a Server-Timing header value (durations in ms)"""
+        entries = [
+            f"app;dur={total_seconds * 1000:.2f}",
+            f'db;dur={self.sql_seconds * 1000:.2f};desc="{self.query_count} queries"'
+        ]
+        for index, (elapsed, statement) in enumerate(self.slowest(), start=1):
+            shape = normalize_statement(statement)[:80].replace("\\", "").replace('"', "'")
+            entries.append(f'sql-{index};dur={elapsed * 1000:.2f};desc="{fingerprint(statement)} {shape}"')
+        return ", ".join(entries)
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+_current_route: ContextVar[str] = ContextVar("request_route", default="-")
+_profiler_enabled = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - getattr(context, "_profile_started", time.perf_counter())
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "slow query %.1fms fingerprint=%s route=%s statement=%s",
+            elapsed * 1000,
+            fingerprint(statement),
+            _current_route.get(),
+            normalize_statement(statement)
+        )
+
+
+def enable_query_profiler() -> None:
+    """Listen on every Engine (primary and replicas); safe to call repeatedly"""
+    global _profiler_enabled
+    if _profiler_enabled:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _profiler_enabled = True
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles opted-in or sampled requests"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    def _should_profile(self, scope) -> bool:
+        if settings.PROFILE_HEADER_ENABLED:
+            for name, value in scope.get("headers", []):
+                if name == PROFILE_HEADER.encode() and value.strip() not in (b"", b"0", b"false"):
+                    return True
+        return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        route_token = _current_route.set(scope.get("path", "-"))
+        if not self._should_profile(scope):
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _current_route.reset(route_token)
+            return
+        
+        started = time.perf_counter()
+        profile = RequestProfile(scope.get("path", "-"), settings.PROFILE_TOP_STATEMENTS)
+        profile_token = _current_profile.set(profile)
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                header = profile.server_timing(time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode("latin-1", "replace"))]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(profile_token)
+            _current_route.reset(route_token)
+            profile_logger.info(
+                "profile %s %s: %d queries, %.1fms SQL, %.1fms total",
+                scope.get("method", ""),
+                profile.route,
+                profile.query_count,
+                profile.sql_seconds * 1000,
+                (time.perf_counter() - started) * 1000
+            )
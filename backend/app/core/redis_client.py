@@ -3,11 +3,166 @@ Redis client for caching and session management
 Follows SOLID principles - Single Responsibility
 """
 import redis
-import json
-from typing import Optional, Any
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from typing import Optional, Any, Callable, Dict, List, Mapping, Sequence
+from app.core import cache_codec
 from app.core.config import settings
+from app.core.metrics import cache_operations_total
 
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+logger = logging.getLogger(__name__)
+
+redis_client = redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=False,  # values are binary, see cache_codec
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT
+)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    
+    closed    - calls go through; failure_threshold consecutive failures open it
+    open      - calls are rejected without touching the network until the
+                cool-down elapses
+    half_open - one trial call is let through; success closes the breaker,
+                failure re-opens it for another cool-down
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int,
+        cooldown_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+    
+    @property
+    def state(self) -> str:
+        """Current breaker state"""
+        with self._lock:
+            return self._state()
+    
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+    
+    def allow(self) -> bool:
+        """Whether a call may be attempted now"""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold"""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+    
+    def reset(self) -> None:
+        """Forget all failures"""
+        self.record_success()
+
+
+cache_breaker = CircuitBreaker(
+    failure_threshold=settings.CACHE_BREAKER_FAILURES,
+    cooldown_seconds=settings.CACHE_BREAKER_COOLDOWN_SECONDS
+)
+
+
+# Delete KEYS[1] only while it still holds our token (ARGV[1])
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class CacheUnavailable(Exception):
+    """Redis call failed or was short-circuited by the breaker"""
+
+
+class _Flight:
+    """One in-progress load that other callers can wait on"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key within a process: the first
+    caller runs the function, later callers wait for and share its result.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+    
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for key is currently running"""
+        with self._lock:
+            return key in self._flights
+    
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """Run func once per key across concurrent callers"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+single_flight = SingleFlight()
 
 
 class CacheService:
@@ -17,43 +172,320 @@ class CacheService:
     """
     
     @staticmethod
-    def get(key: str) -> Optional[Any]:
-        """Get value from cache"""
+    def _execute(operation: str, command: Callable, *args, **kwargs) -> Any:
+        """Run a Redis command through the circuit breaker"""
+        if not cache_breaker.allow():
+            cache_operations_total.inc(operation=operation, result="short_circuit")
+            raise CacheUnavailable(operation)
         try:
-            value = redis_client.get(key)
-            if value:
-                return json.loads(value)
+            result = command(*args, **kwargs)
+        except Exception as exc:
+            cache_breaker.record_failure()
+            cache_operations_total.inc(operation=operation, result="error")
+            raise CacheUnavailable(operation) from exc
+        cache_breaker.record_success()
+        return result
+    
+    @staticmethod
+    def get(key: Optional[str], model: Any = None) -> Optional[Any]:
+        """
+        Get value from cache; a None key (see CacheKeys) is always a miss.
+        Pass a model (e.g. List[MealResponse]) to decode into typed values.
+        """
+        if key is None:
             return None
-        except Exception:
+        try:
+            value = CacheService._execute("get", redis_client.get, key)
+        except CacheUnavailable:
             return None
+        if value:
+            try:
+                result = cache_codec.decode(value, model)
+            except cache_codec.DecodeError as exc:
+                CacheService._drop_undecodable(key, exc)
+            else:
+                cache_operations_total.inc(operation="get", result="hit")
+                return result
+        cache_operations_total.inc(operation="get", result="miss")
+        return None
     
     @staticmethod
-    def set(key: str, value: Any, expire: int = 3600) -> bool:
-        """Set value in cache with expiration"""
+    def _drop_undecodable(key: str, error: Exception) -> None:
+        """Delete an entry that cannot be decoded, so it is reloaded as a miss"""
+        logger.warning("deleting undecodable cache entry %s: %s", key, error)
+        cache_operations_total.inc(operation="get", result="undecodable")
+        CacheService.delete(key)
+    
+    @staticmethod
+    def set(key: Optional[str], value: Any, expire: int = 3600) -> bool:
+        """Set value in cache with expiration; a None key is not cached"""
+        if key is None:
+            return False
         try:
-            redis_client.setex(
+            CacheService._execute(
+                "set",
+                redis_client.setex,
                 key,
                 expire,
-                json.dumps(value, default=str)
+                cache_codec.encode(value)
             )
             return True
-        except Exception:
+        except CacheUnavailable:
+            return False
+    
+    @staticmethod
+    def add(key: Optional[str], value: Any, expire: int = 3600) -> bool:
+        """Set value only if the key is absent (SET NX), so a rebuild never overwrites an update"""
+        if key is None:
+            return False
+        try:
+            return bool(CacheService._execute(
+                "set",
+                redis_client.set,
+                key,
+                cache_codec.encode(value),
+                ex=expire,
+                nx=True
+            ))
+        except CacheUnavailable:
+            return False
+    
+    @staticmethod
+    def update(key: Optional[str], apply: Callable[[Any], Any], expire: int = 3600) -> bool:
+        """
+        Read-modify-write a cached value under the cross-worker lock.
+        apply receives the current value and returns the new one. Returns
+        False when nothing was updated (no entry or an undecodable one, lock
+        busy, Redis down): the caller should then invalidate the key's group.
+        """
+        if key is None:
+            return False
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        if not CacheService._acquire_lock(lock_key, token):
+            return False
+        try:
+            value = CacheService._execute("get", redis_client.get, key)
+            if not value:
+                return False
+            current = cache_codec.decode(value)
+        except CacheUnavailable:
+            return False
+        except cache_codec.DecodeError as exc:
+            CacheService._drop_undecodable(key, exc)
+            return False
+        else:
+            return CacheService.set(key, apply(current), expire)
+        finally:
+            CacheService._release_lock(lock_key, token)
+    
+    @staticmethod
+    def get_many(keys: Sequence[Optional[str]], model: Any = None) -> List[Optional[Any]]:
+        """Get several values in one MGET; results line up with keys, None for misses"""
+        present = [key for key in keys if key is not None]
+        if not present:
+            return [None] * len(keys)
+        try:
+            values = CacheService._execute("get_many", redis_client.mget, present)
+        except CacheUnavailable:
+            return [None] * len(keys)
+        found = dict(zip(present, values))
+        results = []
+        for key in keys:
+            value = found[key] if key is not None else None
+            try:
+                results.append(cache_codec.decode(value, model) if value else None)
+            except cache_codec.DecodeError as exc:
+                CacheService._drop_undecodable(key, exc)
+                results.append(None)
+        hits = sum(1 for result in results if result is not None)
+        cache_operations_total.inc(hits, operation="get", result="hit")
+        cache_operations_total.inc(len(keys) - hits, operation="get", result="miss")
+        return results
+    
+    @staticmethod
+    def set_many(items: Mapping[Optional[str], Any], expire: int = 3600) -> bool:
+        """Set several values in one pipelined round trip; None keys are skipped"""
+        pipe = redis_client.pipeline(transaction=False)
+        for key, value in items.items():
+            if key is not None:
+                pipe.setex(key, expire, cache_codec.encode(value))
+        if not len(pipe):
+            return False
+        try:
+            CacheService._execute("set_many", pipe.execute)
+            return True
+        except CacheUnavailable:
+            return False
+    
+    @staticmethod
+    def delete_many(keys: Sequence[Optional[str]]) -> bool:
+        """Delete several keys with one DEL"""
+        present = [key for key in keys if key is not None]
+        if not present:
+            return True
+        try:
+            CacheService._execute("delete", redis_client.delete, *present)
+            return True
+        except CacheUnavailable:
             return False
     
     @staticmethod
     def delete(key: str) -> bool:
         """Delete key from cache"""
         try:
-            redis_client.delete(key)
+            CacheService._execute("delete", redis_client.delete, key)
             return True
-        except Exception:
+        except CacheUnavailable:
             return False
     
     @staticmethod
     def exists(key: str) -> bool:
         """Check if key exists in cache"""
         try:
-            return bool(redis_client.exists(key))
-        except Exception:
+            return bool(CacheService._execute("exists", redis_client.exists, key))
+        except CacheUnavailable:
             return False
-
+    
+    @staticmethod
+    def get_counter(key: str) -> Optional[int]:
+        """Read an integer counter; missing counts as 0, None if Redis is unavailable"""
+        try:
+            value = CacheService._execute("get_counter", redis_client.get, key)
+        except CacheUnavailable:
+            return None
+        return int(value) if value else 0
+    
+    @staticmethod
+    def incr(key: str) -> Optional[int]:
+        """Atomically increment a counter, None if Redis is unavailable"""
+        try:
+            return int(CacheService._execute("incr", redis_client.incr, key))
+        except CacheUnavailable:
+            return None
+    
+    @staticmethod
+    def jittered_ttl(expire: int) -> int:
+        """Spread expirations of keys written together by +/- CACHE_TTL_JITTER"""
+        jitter = settings.CACHE_TTL_JITTER
+        return max(1, int(round(expire * random.uniform(1 - jitter, 1 + jitter))))
+    
+    @staticmethod
+    def _should_refresh(envelope: dict, now: float, beta: float) -> bool:
+        """
+        XFetch (Vattani et al.): refresh early with a probability that grows
+        as expiry nears, scaled by how long the value took to compute.
+        """
+        return now - envelope["d"] * beta * math.log(1.0 - random.random()) >= envelope["x"]
+    
+    @staticmethod
+    def _read_envelope(key: str) -> Optional[dict]:
+        """Read a get_or_set entry: {"v": value, "d": compute seconds, "x": expiry}"""
+        try:
+            value = CacheService._execute("get", redis_client.get, key)
+        except CacheUnavailable:
+            return None
+        if not value:
+            return None
+        try:
+            return cache_codec.decode(value)
+        except cache_codec.DecodeError as exc:
+            CacheService._drop_undecodable(key, exc)
+            return None
+    
+    @staticmethod
+    def _acquire_lock(lock_key: str, token: str) -> Optional[bool]:
+        """Try the cross-worker refresh lock; None if Redis is unavailable"""
+        try:
+            return bool(CacheService._execute(
+                "lock",
+                redis_client.set,
+                lock_key,
+                token,
+                nx=True,
+                px=settings.CACHE_LOCK_TIMEOUT_MS
+            ))
+        except CacheUnavailable:
+            return None
+    
+    @staticmethod
+    def _release_lock(lock_key: str, token: str) -> None:
+        """
+        Release the lock if we still own it (it may have timed out and been
+        taken by another worker). The compare and delete run as one script, so
+        nothing can acquire the lock between them.
+        """
+        try:
+            CacheService._execute("lock", redis_client.eval, RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except CacheUnavailable:
+            pass
+    
+    @staticmethod
+    def _load_and_store(key: str, loader: Callable[[], Any], expire: int) -> Any:
+        """Call loader and cache its result with timing metadata"""
+        started = time.time()
+        value = loader()
+        finished = time.time()
+        ttl = CacheService.jittered_ttl(expire)
+        envelope = {"v": value, "d": finished - started, "x": finished + ttl}
+        try:
+            CacheService._execute("set", redis_client.setex, key, ttl, cache_codec.encode(envelope))
+        except CacheUnavailable:
+            pass
+        return value
+    
+    @staticmethod
+    def get_or_set(
+        key: Optional[str],
+        loader: Callable[[], Any],
+        expire: int = 3600,
+        beta: Optional[float] = None
+    ) -> Any:
+        """
+        Read-through cache with stampede protection.
+        
+        - Hits are served until XFetch decides to refresh early, so a popular
+          key is usually recomputed by one request before it expires.
+        - Concurrent misses in one process share a single loader call.
+        - Across workers a Redis lock (SET NX PX) elects one loader; the others
+          serve the stale value if there is one, or poll for the fresh value
+          for up to CACHE_LOCK_WAIT_SECONDS before loading it themselves.
+        - TTLs are jittered so keys written together do not expire together.
+        """
+        if key is None:
+            return loader()
+        beta = settings.CACHE_XFETCH_BETA if beta is None else beta
+        
+        envelope = CacheService._read_envelope(key)
+        if envelope is not None and not CacheService._should_refresh(envelope, time.time(), beta):
+            cache_operations_total.inc(operation="get", result="hit")
+            return envelope["v"]
+        cache_operations_total.inc(operation="get", result="stale" if envelope else "miss")
+        if envelope is not None and single_flight.in_flight(key):
+            # Early refresh already running in this process
+            return envelope["v"]
+        
+        def refresh() -> Any:
+            lock_key = f"{key}:lock"
+            token = uuid.uuid4().hex
+            acquired = CacheService._acquire_lock(lock_key, token)
+            if acquired is None:
+                return loader()
+            if acquired:
+                try:
+                    return CacheService._load_and_store(key, loader, expire)
+                finally:
+                    CacheService._release_lock(lock_key, token)
+            
+            # Another worker is loading
+            if envelope is not None:
+                return envelope["v"]
+            deadline = time.monotonic() + settings.CACHE_LOCK_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(settings.CACHE_LOCK_POLL_SECONDS)
+                fresh = CacheService._read_envelope(key)
+                if fresh is not None:
+                    return fresh["v"]
+            return CacheService._load_and_store(key, loader, expire)
+        
+        return single_flight.do(key, refresh)
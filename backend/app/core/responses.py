@@ -0,0 +1,42 @@
+"""
+Fast JSON response rendering
+Follows SOLID principles - Single Responsibility
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(value: Any) -> Any:
+    """Encode types that neither orjson nor json handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when available.
+    Returning it from an endpoint bypasses FastAPI's response_model
+    re-validation, so the payload must already match the declared schema.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        """Render content to JSON bytes"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, default=_default)
+        return json.dumps(
+            content,
+            default=_default,
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
@@ -0,0 +1,68 @@
+"""
+Application lifespan: connection pool and cache warm-up
+Follows SOLID principles - Single Responsibility
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.database import engine, replica_engines
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger("app.startup")
+
+
+def warm_database_pool(connections: int, bind: Engine = engine) -> None:
+    """Open `connections` pooled connections at once so the first requests skip the connect handshake"""
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = bind.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+def warm_cache() -> None:
+    """Establish the Redis connection before traffic arrives"""
+    redis_client.ping()
+
+
+async def _warm(name: str, func, *args) -> None:
+    """Run one warm-up step in a thread; failures are logged, never fatal"""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            asyncio.to_thread(func, *args),
+            timeout=settings.STARTUP_WARMUP_TIMEOUT_SECONDS
+        )
+        logger.info("warmed %s in %.1fms", name, (time.perf_counter() - start) * 1000)
+    except Exception as exc:
+        logger.warning("could not warm %s: %s", name, exc or type(exc).__name__)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Warm the primary and replica pools and Redis concurrently on startup and
+    dispose the pools on shutdown. Schema changes are applied by `alembic upgrade head`,
+    not at import or startup, so a slow or unreachable database delays
+    readiness (see /health/ready) instead of crashing the worker.
+    """
+    await asyncio.gather(
+        _warm("database pool", warm_database_pool, settings.STARTUP_WARM_CONNECTIONS),
+        *(
+            _warm(f"replica {index} pool", warm_database_pool, settings.STARTUP_WARM_CONNECTIONS, replica)
+            for index, replica in enumerate(replica_engines)
+        ),
+        _warm("cache", warm_cache)
+    )
+    yield
+    engine.dispose()
+    for replica in replica_engines:
+        replica.dispose()
@@ -2,23 +2,24 @@
 NutriBite FastAPI Application
 Main entry point for the API server
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.profiling import ProfilingMiddleware
+from app.core.health import readiness
+from app.core.startup import lifespan
 from app.api.v1.router import api_router
-from app.core.database import engine, Base
-# Import models to ensure they're registered with SQLAlchemy
-from app.models import User, Food, FoodItem, Meal, MealFood, UserPreference, DietaryRestriction, Goal, DailyReport
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
+# The schema is managed by Alembic migrations (`alembic upgrade head`)
 app = FastAPI(
     title="NutriBite API",
     description="A nutrition tracking and recommendation API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -30,6 +31,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and SQL metrics, exported at /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in per-request SQL profiling (Server-Timing header) and slow-query log
+app.add_middleware(ProfilingMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -45,3 +52,24 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: database and Redis reachability with latencies"""
+    payload, status_code = await readiness()
+    return JSONResponse(content=payload, status_code=status_code)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -6,8 +6,8 @@ from app.models.user import User
 from app.models.food import Food, FoodItem
 from app.models.meal import Meal, MealFood
 from app.models.preference import UserPreference, DietaryRestriction
-from app.models.goal import Goal
-from app.models.report import DailyReport
+from app.models.goal import Goal, WeightLog
+from app.models.report import DailyReport, WeeklyReport, MonthlyReport, ReportRollupCheckpoint
 
 __all__ = [
     "User",
@@ -18,6 +18,10 @@ __all__ = [
     "UserPreference",
     "DietaryRestriction",
     "Goal",
-    "DailyReport"
+    "WeightLog",
+    "DailyReport",
+    "WeeklyReport",
+    "MonthlyReport",
+    "ReportRollupCheckpoint"
 ]
 
@@ -1,7 +1,7 @@
 """
 Goal model - BCNF normalized
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Boolean, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Boolean, Numeric, Double, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -20,9 +20,13 @@ class GoalType(str, enum.Enum):
 class Goal(Base):
     """Goal table - normalized to BCNF"""
     __tablename__ = "goals"
+    __table_args__ = (
+        # Active-goal lookup; GoalService keeps at most one active goal per user
+        Index("ix_goals_user_active", "user_id", "is_active"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     goal_type = Column(SQLEnum(GoalType), nullable=False)
     target_weight_kg = Column(Numeric(10, 2))
     current_weight_kg = Column(Numeric(10, 2))
@@ -34,3 +38,19 @@ class Goal(Base):
     # Relationships
     user = relationship("User", back_populates="goals")
 
+
+class WeightLog(Base):
+    """Weigh-in time series - one row per measurement"""
+    __tablename__ = "weight_logs"
+    __table_args__ = (
+        Index("ix_weight_logs_user_logged_at", "user_id", "logged_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    weight_kg = Column(Double, nullable=False)
+    logged_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    user = relationship("User", back_populates="weight_logs")
@@ -2,7 +2,7 @@
 Meal models - BCNF normalized
 Separated into Meal (meal instances) and MealFood (junction table)
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Double
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -22,7 +22,7 @@ class Meal(Base):
     __tablename__ = "meals"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     meal_type = Column(SQLEnum(MealType), nullable=False)
     meal_date = Column(DateTime(timezone=True), nullable=False, index=True)
     notes = Column(String(500))
@@ -38,9 +38,9 @@ class MealFood(Base):
     __tablename__ = "meal_foods"
     
     id = Column(Integer, primary_key=True, index=True)
-    meal_id = Column(Integer, ForeignKey("meals.id"), nullable=False)
-    food_id = Column(Integer, ForeignKey("foods.id"), nullable=False)
-    quantity_g = Column(Numeric(10, 2), nullable=False)
+    meal_id = Column(Integer, ForeignKey("meals.id", ondelete="CASCADE"), nullable=False)
+    food_id = Column(Integer, ForeignKey("foods.id", ondelete="CASCADE"), nullable=False)
+    quantity_g = Column(Double, nullable=False)
     
     # Relationships
     meal = relationship("Meal", back_populates="meal_foods")
@@ -1,7 +1,8 @@
 """
-Daily report model - BCNF normalized
+Report models - BCNF normalized
+Daily reports plus materialized weekly/monthly rollups
 """
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Numeric
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Double, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,22 +11,81 @@ from app.core.database import Base
 class DailyReport(Base):
     """Daily nutrition report table - normalized to BCNF"""
     __tablename__ = "daily_reports"
+    __table_args__ = (
+        UniqueConstraint("user_id", "report_day", name="uq_daily_reports_user_day"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     report_date = Column(DateTime(timezone=True), nullable=False, index=True)
-    total_calories = Column(Numeric(10, 2), nullable=False)
-    total_protein = Column(Numeric(10, 2), nullable=False)
-    total_carbs = Column(Numeric(10, 2), nullable=False)
-    total_fats = Column(Numeric(10, 2), nullable=False)
-    total_fiber = Column(Numeric(10, 2), default=0.0)
-    total_sugar = Column(Numeric(10, 2), default=0.0)
-    total_sodium = Column(Numeric(10, 2), default=0.0)
+    report_day = Column(Date, nullable=False)  # Calendar day of report_date; one report per user per day
+    total_calories = Column(Double, nullable=False)
+    total_protein = Column(Double, nullable=False)
+    total_carbs = Column(Double, nullable=False)
+    total_fats = Column(Double, nullable=False)
+    total_fiber = Column(Double, default=0.0)
+    total_sugar = Column(Double, default=0.0)
+    total_sodium = Column(Double, default=0.0)
     analysis = Column(Text)  # AI-generated analysis
     recommendations = Column(Text)  # AI-generated recommendations
     motivation_message = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="reports")
 
+
+class WeeklyReport(Base):
+    """Weekly nutrition rollup - materialized from meals by the batch job"""
+    __tablename__ = "weekly_reports"
+    __table_args__ = (
+        UniqueConstraint("user_id", "period_start", name="uq_weekly_reports_user_period"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    period_start = Column(Date, nullable=False, index=True)  # Monday
+    period_end = Column(Date, nullable=False)
+    days_logged = Column(Integer, nullable=False, default=0)
+    meal_count = Column(Integer, nullable=False, default=0)
+    total_calories = Column(Double, nullable=False)
+    total_protein = Column(Double, nullable=False)
+    total_carbs = Column(Double, nullable=False)
+    total_fats = Column(Double, nullable=False)
+    total_fiber = Column(Double, default=0.0)
+    total_sugar = Column(Double, default=0.0)
+    total_sodium = Column(Double, default=0.0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MonthlyReport(Base):
+    """Monthly nutrition rollup - materialized from meals by the batch job"""
+    __tablename__ = "monthly_reports"
+    __table_args__ = (
+        UniqueConstraint("user_id", "period_start", name="uq_monthly_reports_user_period"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    period_start = Column(Date, nullable=False, index=True)  # First day of month
+    period_end = Column(Date, nullable=False)
+    days_logged = Column(Integer, nullable=False, default=0)
+    meal_count = Column(Integer, nullable=False, default=0)
+    total_calories = Column(Double, nullable=False)
+    total_protein = Column(Double, nullable=False)
+    total_carbs = Column(Double, nullable=False)
+    total_fats = Column(Double, nullable=False)
+    total_fiber = Column(Double, default=0.0)
+    total_sugar = Column(Double, default=0.0)
+    total_sodium = Column(Double, default=0.0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ReportRollupCheckpoint(Base):
+    """Last fully materialized period per rollup granularity, for resumable runs"""
+    __tablename__ = "report_rollup_checkpoints"
+    
+    granularity = Column(String(20), primary_key=True)  # "weekly" or "monthly"
+    last_period_start = Column(Date, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -27,6 +27,7 @@ class User(Base):
     # Relationships
     preferences = relationship("UserPreference", back_populates="user", cascade="all, delete-orphan")
     goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
+    weight_logs = relationship("WeightLog", back_populates="user", cascade="all, delete-orphan")
     meals = relationship("Meal", back_populates="user", cascade="all, delete-orphan")
     reports = relationship("DailyReport", back_populates="user", cascade="all, delete-orphan")
 
@@ -4,8 +4,9 @@ Pydantic schemas for request/response validation
 from app.schemas.user import UserCreate, UserResponse, UserLogin
 from app.schemas.food import FoodCreate, FoodResponse, MealCreate, MealResponse
 from app.schemas.preference import PreferenceCreate, PreferenceResponse
-from app.schemas.goal import GoalCreate, GoalResponse
-from app.schemas.report import ReportResponse
+from app.schemas.goal import GoalCreate, GoalResponse, WeightLogCreate, WeightLogResponse, GoalProgressResponse
+from app.schemas.report import ReportResponse, PeriodReportResponse
+from app.schemas.analytics import NutritionAnalyticsResponse
 
 __all__ = [
     "UserCreate",
@@ -19,6 +20,11 @@ __all__ = [
     "PreferenceResponse",
     "GoalCreate",
     "GoalResponse",
-    "ReportResponse"
+    "WeightLogCreate",
+    "WeightLogResponse",
+    "GoalProgressResponse",
+    "ReportResponse",
+    "PeriodReportResponse",
+    "NutritionAnalyticsResponse"
 ]
 
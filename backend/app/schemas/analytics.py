@@ -0,0 +1,48 @@
+"""
+Analytics schemas for API validation
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import date
+
+
+class NutrientAmounts(BaseModel):
+    """Schema for nutrient amounts"""
+    calories: float
+    protein: float
+    carbs: float
+    fats: float
+    fiber: float
+    sugar: float
+    sodium: float
+
+
+class MacroValues(BaseModel):
+    """Schema for optional per-macro values (targets, adherence)"""
+    calories: Optional[float]
+    protein: Optional[float]
+    carbs: Optional[float]
+    fats: Optional[float]
+
+
+class NutritionBucket(BaseModel):
+    """Schema for one time bucket of nutrition analytics"""
+    period_start: date
+    period_end: date
+    days: int
+    days_logged: int
+    meal_count: int
+    totals: NutrientAmounts
+    daily_average: NutrientAmounts
+    rolling_average: NutrientAmounts
+    adherence: MacroValues
+
+
+class NutritionAnalyticsResponse(BaseModel):
+    """Schema for nutrition analytics response"""
+    granularity: str
+    start_date: date
+    end_date: date
+    window: int
+    targets: MacroValues
+    buckets: List[NutritionBucket]
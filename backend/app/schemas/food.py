@@ -28,9 +28,9 @@ class FoodResponse(BaseModel):
     protein_per_100g: float
     carbs_per_100g: float
     fats_per_100g: float
-    fiber_per_100g: float
-    sugar_per_100g: float
-    sodium_per_100g: float
+    fiber_per_100g: Optional[float]  # NULL in the catalog stays null
+    sugar_per_100g: Optional[float]
+    sodium_per_100g: Optional[float]
     
     class Config:
         from_attributes = True
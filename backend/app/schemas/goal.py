@@ -3,7 +3,7 @@ Goal schemas for API validation
 """
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 
 class GoalCreate(BaseModel):
@@ -28,3 +28,35 @@ class GoalResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class WeightLogCreate(BaseModel):
+    """Schema for logging a weigh-in"""
+    weight_kg: float
+    logged_at: Optional[datetime] = None  # Defaults to now
+
+
+class WeightLogResponse(BaseModel):
+    """Schema for weigh-in response"""
+    id: int
+    weight_kg: float
+    logged_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class GoalProgressResponse(BaseModel):
+    """Schema for goal progress over the trailing window"""
+    goal_id: Optional[int]
+    target_weight_kg: Optional[float]
+    window_days: int
+    weigh_in_count: int
+    latest_weight_kg: Optional[float]
+    trend_weight_kg: Optional[float]  # Regression line at now
+    weekly_change_kg: Optional[float]
+    days_with_meals: int
+    average_daily_calories: Optional[float]
+    estimated_maintenance_calories: Optional[float]
+    daily_calorie_balance: Optional[float]
+    remaining_kg: Optional[float]
+    projected_date: Optional[date]  # None when the trend does not lead to the target
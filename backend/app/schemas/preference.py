@@ -19,7 +19,7 @@ class PreferenceCreate(BaseModel):
     target_carbs: Optional[float] = None
     target_fats: Optional[float] = None
     preferred_meal_times: Optional[str] = None
-    dietary_restrictions: Optional[List[DietaryRestrictionCreate]] = None
+    dietary_restrictions: Optional[List[DietaryRestrictionCreate]] = None  # Replaces the stored set; repeats are merged
 
 
 class DietaryRestrictionResponse(BaseModel):
@@ -3,7 +3,7 @@ Report schemas for API validation
 """
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 
 class ReportResponse(BaseModel):
@@ -25,3 +25,22 @@ class ReportResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class PeriodReportResponse(BaseModel):
+    """Schema for weekly/monthly rollup report response"""
+    id: int
+    period_start: date
+    period_end: date
+    days_logged: int
+    meal_count: int
+    total_calories: float
+    total_protein: float
+    total_carbs: float
+    total_fats: float
+    total_fiber: float
+    total_sugar: float
+    total_sodium: float
+    
+    class Config:
+        from_attributes = True
@@ -4,16 +4,26 @@ Service layer - follows SOLID principles
 from app.services.user_service import UserService
 from app.services.food_service import FoodService
 from app.services.meal_service import MealService
+from app.services.meal_serializer import MealSerializer
 from app.services.preference_service import PreferenceService
 from app.services.recommender_service import RecommenderService
 from app.services.report_service import ReportService
+from app.services.export_service import ExportService
+from app.services.analytics_service import AnalyticsService
+from app.services.goal_service import GoalService
+from app.services.goal_progress_service import GoalProgressService
 
 __all__ = [
     "UserService",
     "FoodService",
     "MealService",
+    "MealSerializer",
     "PreferenceService",
     "RecommenderService",
-    "ReportService"
+    "ReportService",
+    "ExportService",
+    "AnalyticsService",
+    "GoalService",
+    "GoalProgressService"
 ]
 
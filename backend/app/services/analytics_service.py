@@ -0,0 +1,179 @@
+"""
+Analytics service - follows SOLID principles
+Single Responsibility: Server-side time-series aggregation of nutrition data
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.models.meal import Meal, MealFood
+from app.models.food import Food
+
+NUTRIENTS = ["calories", "protein", "carbs", "fats", "fiber", "sugar", "sodium"]
+TARGETED_NUTRIENTS = ["calories", "protein", "carbs", "fats"]
+GRANULARITIES = ["daily", "weekly", "monthly"]
+MAX_RANGE_DAYS = 731
+
+
+def _as_date(value) -> date:
+    """DATE() comes back as a date on MySQL and as an ISO string on SQLite"""
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    """First calendar day of the bucket containing day"""
+    if granularity == "weekly":
+        return day - timedelta(days=day.weekday())
+    if granularity == "monthly":
+        return day.replace(day=1)
+    return day
+
+
+class AnalyticsService:
+    """Service for nutrition analytics"""
+    
+    @staticmethod
+    def get_daily_totals(
+        db: Session,
+        user_id: int,
+        start_date: date,
+        end_date: date
+    ) -> Dict[date, tuple]:
+        """
+        Sum nutrients per calendar day in a single GROUP BY DATE(meal_date) query.
+        Returns {day: (meal_count, calories, protein, carbs, fats, fiber, sugar, sodium)}.
+        """
+        grams = MealFood.quantity_g / 100
+        day = func.date(Meal.meal_date).label("day")
+        stmt = (
+            select(
+                day,
+                func.count(func.distinct(Meal.id)),
+                func.sum(grams * Food.calories_per_100g),
+                func.sum(grams * Food.protein_per_100g),
+                func.sum(grams * Food.carbs_per_100g),
+                func.sum(grams * Food.fats_per_100g),
+                func.sum(grams * func.coalesce(Food.fiber_per_100g, 0)),
+                func.sum(grams * func.coalesce(Food.sugar_per_100g, 0)),
+                func.sum(grams * func.coalesce(Food.sodium_per_100g, 0))
+            )
+            .select_from(Meal)
+            .join(MealFood, MealFood.meal_id == Meal.id)
+            .join(Food, Food.id == MealFood.food_id)
+            .where(
+                Meal.user_id == user_id,
+                Meal.meal_date >= datetime.combine(start_date, datetime.min.time()),
+                Meal.meal_date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            )
+            .group_by(day)
+        )
+        return {
+            _as_date(row[0]): (int(row[1]), *(float(v or 0) for v in row[2:]))
+            for row in db.execute(stmt)
+        }
+    
+    @staticmethod
+    def get_nutrition_timeseries(
+        db: Session,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        granularity: str = "daily",
+        window: int = 7,
+        targets: Optional[Dict[str, Optional[float]]] = None
+    ) -> dict:
+        """
+        Bucket daily totals into daily/weekly/monthly periods.
+        
+        Averages are per logged day, so days without any meals do not drag
+        them down. rolling_average is the average daily intake over the
+        trailing `window` buckets, and adherence compares daily_average with
+        the user's daily targets as a percentage.
+        """
+        targets = targets or {}
+        daily = AnalyticsService.get_daily_totals(db, user_id, start_date, end_date)
+        
+        day_count = (end_date - start_date).days + 1
+        days = [start_date + timedelta(days=i) for i in range(day_count)]
+        
+        # Dense (day, nutrient) matrix; unlogged days stay zero
+        totals = np.zeros((day_count, len(NUTRIENTS)), dtype=np.float64)
+        logged = np.zeros(day_count, dtype=np.int64)
+        meals = np.zeros(day_count, dtype=np.int64)
+        for day, (meal_count, *values) in daily.items():
+            index = (day - start_date).days
+            if 0 <= index < day_count:
+                totals[index] = values
+                logged[index] = 1
+                meals[index] = meal_count
+        
+        # Bucket boundaries as offsets into the daily arrays
+        starts = [0]
+        for i in range(1, day_count):
+            if _bucket_start(days[i], granularity) != _bucket_start(days[i - 1], granularity):
+                starts.append(i)
+        offsets = np.asarray(starts, dtype=np.int64)
+        ends = np.append(offsets[1:], day_count)
+        
+        bucket_totals = np.add.reduceat(totals, offsets, axis=0)
+        bucket_logged = np.add.reduceat(logged, offsets)
+        bucket_meals = np.add.reduceat(meals, offsets)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            averages = np.where(
+                bucket_logged[:, None] > 0,
+                bucket_totals / bucket_logged[:, None],
+                0.0
+            )
+            
+            # Trailing window sums via cumulative sums: O(n) regardless of window
+            cumulative_totals = np.vstack([np.zeros(len(NUTRIENTS)), np.cumsum(bucket_totals, axis=0)])
+            cumulative_logged = np.concatenate([[0], np.cumsum(bucket_logged)])
+            upper = np.arange(1, len(offsets) + 1)
+            lower = np.maximum(upper - window, 0)
+            window_totals = cumulative_totals[upper] - cumulative_totals[lower]
+            window_logged = cumulative_logged[upper] - cumulative_logged[lower]
+            rolling = np.where(
+                window_logged[:, None] > 0,
+                window_totals / window_logged[:, None],
+                0.0
+            )
+        
+        target_vector = np.array(
+            [targets.get(n) or np.nan for n in TARGETED_NUTRIENTS],
+            dtype=np.float64
+        )
+        adherence = averages[:, :len(TARGETED_NUTRIENTS)] / target_vector * 100.0
+        
+        buckets: List[dict] = []
+        for b in range(len(offsets)):
+            has_data = bucket_logged[b] > 0
+            buckets.append({
+                "period_start": days[offsets[b]],
+                "period_end": days[ends[b] - 1],
+                "days": int(ends[b] - offsets[b]),
+                "days_logged": int(bucket_logged[b]),
+                "meal_count": int(bucket_meals[b]),
+                "totals": dict(zip(NUTRIENTS, np.round(bucket_totals[b], 2).tolist())),
+                "daily_average": dict(zip(NUTRIENTS, np.round(averages[b], 2).tolist())),
+                "rolling_average": dict(zip(NUTRIENTS, np.round(rolling[b], 2).tolist())),
+                "adherence": {
+                    nutrient: (
+                        round(float(adherence[b, i]), 1)
+                        if has_data and not np.isnan(adherence[b, i]) else None
+                    )
+                    for i, nutrient in enumerate(TARGETED_NUTRIENTS)
+                }
+            })
+        
+        return {
+            "granularity": granularity,
+            "start_date": start_date,
+            "end_date": end_date,
+            "window": window,
+            "targets": {n: targets.get(n) for n in TARGETED_NUTRIENTS},
+            "buckets": buckets
+        }
@@ -0,0 +1,194 @@
+"""
+Export service - follows SOLID principles
+Single Responsibility: Encodes meal history rows into streaming export formats
+"""
+import csv
+import importlib.util
+import io
+import json
+from typing import Iterable, Iterator, List, Sequence
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# pyarrow is only imported when a columnar export is actually requested
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+# One row per food in a meal; nutrient columns are absolute amounts for the portion
+EXPORT_COLUMNS = [
+    "meal_id",
+    "meal_type",
+    "meal_date",
+    "notes",
+    "meal_food_id",
+    "food_id",
+    "food_name",
+    "quantity_g",
+    "calories",
+    "protein",
+    "carbs",
+    "fats",
+    "fiber",
+    "sugar",
+    "sodium"
+]
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+COLUMNAR_FORMATS = {"arrow", "parquet"}
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+    
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def writable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return False
+    
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class ExportService:
+    """Service for streaming meal history exports"""
+    
+    @staticmethod
+    def media_type(fmt: str) -> str:
+        """Content type for an export format"""
+        return EXPORT_FORMATS[fmt][0]
+    
+    @staticmethod
+    def filename(fmt: str) -> str:
+        """Download filename for an export format"""
+        return f"meals.{EXPORT_FORMATS[fmt][1]}"
+    
+    @staticmethod
+    def is_supported(fmt: str) -> bool:
+        """Whether the format can be produced with the installed libraries"""
+        if fmt not in EXPORT_FORMATS:
+            return False
+        return PYARROW_AVAILABLE or fmt not in COLUMNAR_FORMATS
+    
+    @staticmethod
+    def stream(fmt: str, chunks: Iterable[List[Sequence]]) -> Iterator[bytes]:
+        """Encode row chunks into the requested format, one chunk at a time"""
+        encoders = {
+            "csv": ExportService._stream_csv,
+            "ndjson": ExportService._stream_ndjson,
+            "arrow": ExportService._stream_arrow,
+            "parquet": ExportService._stream_parquet
+        }
+        return encoders[fmt](chunks)
+    
+    @staticmethod
+    def _stream_csv(chunks: Iterable[List[Sequence]]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in chunks:
+            writer.writerows(
+                [*row[:2], row[2].isoformat() if row[2] else None, *row[3:]]
+                for row in chunk
+            )
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        tail = buffer.getvalue()
+        if tail:
+            yield tail.encode("utf-8")
+    
+    @staticmethod
+    def _stream_ndjson(chunks: Iterable[List[Sequence]]) -> Iterator[bytes]:
+        for chunk in chunks:
+            lines = []
+            for row in chunk:
+                record = dict(zip(EXPORT_COLUMNS, row))
+                if ORJSON_AVAILABLE:
+                    lines.append(orjson.dumps(record))
+                else:
+                    lines.append(json.dumps(record, default=str).encode("utf-8"))
+            lines.append(b"")
+            yield b"\n".join(lines)
+    
+    @staticmethod
+    def _arrow_schema():
+        import pyarrow as pa
+        return pa.schema([
+            ("meal_id", pa.int64()),
+            ("meal_type", pa.string()),
+            ("meal_date", pa.timestamp("us")),
+            ("notes", pa.string()),
+            ("meal_food_id", pa.int64()),
+            ("food_id", pa.int64()),
+            ("food_name", pa.string()),
+            ("quantity_g", pa.float64()),
+            ("calories", pa.float64()),
+            ("protein", pa.float64()),
+            ("carbs", pa.float64()),
+            ("fats", pa.float64()),
+            ("fiber", pa.float64()),
+            ("sugar", pa.float64()),
+            ("sodium", pa.float64())
+        ])
+    
+    @staticmethod
+    def _record_batch(schema, chunk: List[Sequence]):
+        import pyarrow as pa
+        columns = list(zip(*chunk)) if chunk else [()] * len(EXPORT_COLUMNS)
+        return pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        )
+    
+    @staticmethod
+    def _stream_arrow(chunks: Iterable[List[Sequence]]) -> Iterator[bytes]:
+        import pyarrow as pa
+        schema = ExportService._arrow_schema()
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for chunk in chunks:
+                writer.write_batch(ExportService._record_batch(schema, chunk))
+                yield sink.drain()
+        yield sink.drain()
+    
+    @staticmethod
+    def _stream_parquet(chunks: Iterable[List[Sequence]]) -> Iterator[bytes]:
+        import pyarrow.parquet as pq
+        schema = ExportService._arrow_schema()
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+            for chunk in chunks:
+                writer.write_batch(ExportService._record_batch(schema, chunk))
+                yield sink.drain()
+        yield sink.drain()
@@ -0,0 +1,369 @@
+"""
+Food catalog service - follows SOLID principles
+Single Responsibility: Serves food nutrients from an immutable, memory-mapped snapshot
+
+A snapshot is a directory of .npy files (ids, nutrients and their NULL mask,
+and UTF-8 blobs plus offsets for names and descriptions) written once and
+never modified.
+The "current" file in FOOD_CATALOG_DIR names the live snapshot. Workers
+memory-map it read-only, so every worker on a host shares one copy through
+the page cache.
+
+Publishing writes a new snapshot directory, then atomically replaces
+"current". Workers pick up the new snapshot within
+FOOD_CATALOG_CHECK_SECONDS, or immediately when they are asked for a food
+the old one does not contain. Mapped snapshots stay valid after a swap, so
+readers never see a partial catalog.
+
+Requests never publish. Creating a food, or a lookup the snapshot cannot
+serve, schedules a rebuild on a background thread after
+FOOD_CATALOG_REBUILD_DELAY_SECONDS, so a burst of new foods costs one
+rebuild; until it lands, readers fall back to the foods table.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.food import Food
+
+logger = logging.getLogger(__name__)
+
+# Column order of CatalogSnapshot.nutrients
+NUTRIENT_FIELDS = [
+    "calories_per_100g",
+    "protein_per_100g",
+    "carbs_per_100g",
+    "fats_per_100g",
+    "fiber_per_100g",
+    "sugar_per_100g",
+    "sodium_per_100g"
+]
+TOTAL_FIELDS = ["total_calories", "total_protein", "total_carbs", "total_fats"]
+# One total per NUTRIENT_FIELDS column
+NUTRITION_FIELDS = TOTAL_FIELDS + ["total_fiber", "total_sugar", "total_sodium"]
+
+ARRAYS = [
+    "ids",
+    "nutrients",
+    "missing_nutrients",
+    "name_blob",
+    "name_offsets",
+    "description_blob",
+    "description_offsets",
+    "has_description"
+]
+POINTER_FILE = "current"
+KEEP_SNAPSHOTS = 3
+
+
+def _pack_strings(values: Sequence[Optional[str]]):
+    """UTF-8 blob, offsets and a not-NULL mask for a column of strings"""
+    encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    present = np.array([value is not None for value in values], dtype=bool)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets, present
+
+
+def meal_totals(meal_ids, positions, quantities_g, nutrients: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized totals for flat (meal_id, nutrient row, quantity) rows: gather
+    densities, scale by grams, then np.add.reduceat over each meal's run of
+    rows. Returns (distinct meal ids, rounded totals with one column per
+    NUTRIENT_FIELDS entry).
+    """
+    meal_ids = np.asarray(meal_ids, dtype=np.int64)
+    if not len(meal_ids):
+        return meal_ids, np.zeros((0, len(NUTRIENT_FIELDS)))
+    positions = np.asarray(positions, dtype=np.int64)
+    multipliers = np.asarray(quantities_g, dtype=np.float64) / 100.0
+    if (meal_ids[1:] < meal_ids[:-1]).any():
+        order = np.argsort(meal_ids, kind="stable")
+        meal_ids, positions, multipliers = meal_ids[order], positions[order], multipliers[order]
+    
+    starts = np.flatnonzero(np.concatenate(([True], meal_ids[1:] != meal_ids[:-1])))
+    scaled = nutrients[positions] * multipliers[:, None]
+    return meal_ids[starts], np.round(np.add.reduceat(scaled, starts, axis=0), 2)
+
+
+def sum_by_meal(meal_ids, positions, quantities_g, nutrients: np.ndarray) -> Dict[int, dict]:
+    """meal_totals as {meal_id: {NUTRITION_FIELDS: total}}; meals without rows are absent"""
+    distinct, totals = meal_totals(meal_ids, positions, quantities_g, nutrients)
+    return {
+        meal_id: dict(zip(NUTRITION_FIELDS, row))
+        for meal_id, row in zip(distinct.tolist(), totals.tolist())
+    }
+
+
+class CatalogSnapshot:
+    """One immutable version of the catalog, backed by memory-mapped arrays"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = path.name
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+        self.ids = arrays["ids"]
+        self.nutrients = arrays["nutrients"]  # NULL stored as 0.0, so totals can sum it
+        self._missing_nutrients = arrays["missing_nutrients"]
+        self._names = (arrays["name_blob"], arrays["name_offsets"])
+        self._descriptions = (arrays["description_blob"], arrays["description_offsets"])
+        self._has_description = arrays["has_description"]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def positions(self, food_ids: Iterable[int]) -> np.ndarray:
+        """Row of each food id in the arrays, -1 where the id is unknown"""
+        if not isinstance(food_ids, (np.ndarray, list, tuple)):
+            food_ids = list(food_ids)
+        wanted = np.asarray(food_ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.full(len(wanted), -1, dtype=np.int64)
+        found = np.searchsorted(self.ids, wanted)
+        found[found >= len(self.ids)] = 0
+        return np.where(self.ids[found] == wanted, found, -1)
+    
+    def _string(self, column, position: int) -> str:
+        """Decode one string from a blob/offsets column"""
+        blob, offsets = column
+        return bytes(blob[offsets[position]:offsets[position + 1]]).decode("utf-8")
+    
+    def food(self, position: int) -> dict:
+        """FoodResponse payload for one row"""
+        payload = {
+            "id": int(self.ids[position]),
+            "name": self._string(self._names, position),
+            "description": (
+                self._string(self._descriptions, position)
+                if self._has_description[position] else None
+            )
+        }
+        payload.update(
+            (field, None if missing else value)
+            for field, value, missing in zip(
+                NUTRIENT_FIELDS,
+                self.nutrients[position].tolist(),
+                self._missing_nutrients[position].tolist()
+            )
+        )
+        return payload
+    
+    def meal_nutrition(self, food_ids: Sequence[int], quantities_g: Sequence[float]) -> Optional[dict]:
+        """Rounded meal totals from the arrays; None if a food is not in this snapshot"""
+        positions = self.positions(food_ids)
+        if (positions < 0).any():
+            return None
+        multipliers = np.asarray(quantities_g, dtype=np.float64) / 100.0
+        totals = multipliers @ self.nutrients[positions, :len(TOTAL_FIELDS)]
+        return {field: round(value, 2) for field, value in zip(TOTAL_FIELDS, totals.tolist())}
+    
+    def batch_nutrition(self, meal_ids, food_ids, quantities_g) -> Optional[Dict[int, dict]]:
+        """Totals for many meals' rows at once; None if a food is not in this snapshot"""
+        positions = self.positions(food_ids)
+        if (positions < 0).any():
+            return None
+        return sum_by_meal(meal_ids, positions, quantities_g, self.nutrients)
+
+
+class FoodCatalog:
+    """
+    Publishes and loads catalog snapshots in one directory.
+    The module-level `food_catalog` is shared by the services.
+    Background rebuilds open their own session from session_factory;
+    without one, snapshots are only built by explicit publish() calls.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        check_seconds: float = 1.0,
+        rebuild_delay: float = 2.0,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.directory = Path(directory)
+        self.check_seconds = check_seconds
+        self.rebuild_delay = rebuild_delay
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = float("-inf")
+        self._published_at = float("-inf")
+        self._verified = False
+        self._stale_version: Optional[str] = None
+        self._pending: Optional[threading.Timer] = None
+    
+    def _read_pointer(self) -> Optional[str]:
+        """Version named by the pointer file, None before the first publish"""
+        try:
+            return (self.directory / POINTER_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def _reload(self) -> Optional[CatalogSnapshot]:
+        """Map the snapshot named by the pointer file, if it changed"""
+        version = self._read_pointer()
+        self._checked_at = time.monotonic()
+        if version is None:
+            self._snapshot = None
+        elif self._snapshot is None or self._snapshot.version != version:
+            try:
+                self._snapshot = CatalogSnapshot(self.directory / version)
+            except (OSError, ValueError) as exc:
+                logger.warning("could not load food catalog %s: %s", version, exc)
+        return self._snapshot
+    
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        """The live snapshot, re-checking the pointer every check_seconds"""
+        if time.monotonic() - self._checked_at < self.check_seconds:
+            return self._snapshot
+        with self._lock:
+            return self._reload()
+    
+    def publish(self, db: Session) -> CatalogSnapshot:
+        """Build a snapshot of every food from the database and make it current"""
+        rows = db.query(
+            Food.id,
+            Food.name,
+            Food.description,
+            *(getattr(Food, field) for field in NUTRIENT_FIELDS)
+        ).order_by(Food.id).all()
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        version = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        building = Path(tempfile.mkdtemp(prefix=".building-", dir=self.directory))
+        name_blob, name_offsets, _ = _pack_strings([row[1] for row in rows])
+        description_blob, description_offsets, has_description = _pack_strings([row[2] for row in rows])
+        arrays = {
+            "ids": np.array([row[0] for row in rows], dtype=np.int64),
+            "nutrients": np.array(
+                [[value or 0.0 for value in row[3:]] for row in rows],
+                dtype=np.float64
+            ).reshape(len(rows), len(NUTRIENT_FIELDS)),
+            "missing_nutrients": np.array(
+                [[value is None for value in row[3:]] for row in rows],
+                dtype=bool
+            ).reshape(len(rows), len(NUTRIENT_FIELDS)),
+            "name_blob": name_blob,
+            "name_offsets": name_offsets,
+            "description_blob": description_blob,
+            "description_offsets": description_offsets,
+            "has_description": has_description
+        }
+        for name, array in arrays.items():
+            np.save(building / f"{name}.npy", array)
+        os.rename(building, self.directory / version)
+        
+        pointer = self.directory / f".{POINTER_FILE}-{uuid.uuid4().hex[:8]}"
+        pointer.write_text(version)
+        os.replace(pointer, self.directory / POINTER_FILE)
+        self._prune(keep=version)
+        self._published_at = time.monotonic()
+        self._verified = True
+        
+        with self._lock:
+            return self._reload()
+    
+    def request_publish(self) -> None:
+        """
+        Publish on a background thread after rebuild_delay. Requests made
+        before that thread starts share its rebuild; later ones schedule another.
+        """
+        if self.session_factory is None:
+            return
+        with self._lock:
+            if self._pending is not None:
+                return
+            self._pending = threading.Timer(self.rebuild_delay, self._publish_pending)
+            self._pending.daemon = True
+            self._pending.start()
+    
+    def _publish_pending(self) -> None:
+        """Timer body: rebuild from a fresh session; failures are logged and retried on the next request"""
+        with self._lock:
+            self._pending = None
+        try:
+            db = self.session_factory()
+            try:
+                self.publish(db)
+            finally:
+                db.close()
+        except Exception as exc:
+            logger.warning("could not publish food catalog: %s", exc)
+    
+    def _prune(self, keep: str) -> None:
+        """Delete old snapshots; workers still mapping them keep their pages"""
+        versions = sorted(
+            entry.name for entry in self.directory.iterdir()
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+        for version in versions[:-KEEP_SNAPSHOTS]:
+            if version != keep:
+                shutil.rmtree(self.directory / version, ignore_errors=True)
+    
+    def _contains(self, snapshot: Optional[CatalogSnapshot], food_ids: List[int]) -> bool:
+        """Whether snapshot exists and has every food id"""
+        return snapshot is not None and bool((snapshot.positions(food_ids) >= 0).all())
+    
+    def _verify(self, db: Session) -> None:
+        """
+        Once per process, check a snapshot left over from before a restart
+        against the foods table. If they differ the snapshot is stale: it is
+        not served, and a rebuild is scheduled.
+        """
+        count, max_id = db.query(func.count(Food.id), func.max(Food.id)).one()
+        snapshot = self.snapshot()
+        if snapshot is None or len(snapshot) != count or (count and int(snapshot.ids[-1]) != max_id):
+            self._stale_version = snapshot.version if snapshot is not None else None
+            self.request_publish()
+        self._verified = True
+    
+    def _servable(self, snapshot: Optional[CatalogSnapshot], food_ids: List[int]) -> bool:
+        """Whether snapshot is not known to be stale and has every food id"""
+        return (
+            snapshot is not None
+            and snapshot.version != self._stale_version
+            and self._contains(snapshot, food_ids)
+        )
+    
+    def lookup(self, db: Session, food_ids: Iterable[int]) -> Optional[CatalogSnapshot]:
+        """
+        A snapshot containing every food id, or None if the catalog cannot serve
+        them (callers then read the foods table). Re-reads the pointer, so foods
+        published by another worker or host are picked up, and otherwise
+        schedules a background rebuild at most once per check_seconds.
+        """
+        food_ids = list(food_ids)
+        try:
+            if not self._verified:
+                self._verify(db)
+            snapshot = self.snapshot()
+            if self._servable(snapshot, food_ids):
+                return snapshot
+            with self._lock:
+                snapshot = self._reload()
+            if self._servable(snapshot, food_ids):
+                return snapshot
+        except OSError as exc:
+            logger.warning("food catalog unavailable: %s", exc)
+            return None
+        if time.monotonic() - self._published_at >= self.check_seconds:
+            self.request_publish()
+        return None
+
+
+food_catalog = FoodCatalog(
+    settings.FOOD_CATALOG_DIR or os.path.join(tempfile.gettempdir(), "nutribite-food-catalog"),
+    check_seconds=settings.FOOD_CATALOG_CHECK_SECONDS,
+    rebuild_delay=settings.FOOD_CATALOG_REBUILD_DELAY_SECONDS,
+    session_factory=SessionLocal
+)
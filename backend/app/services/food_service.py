@@ -3,10 +3,14 @@ Food service - follows SOLID principles
 Single Responsibility: Handles food-related business logic
 """
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from app.models.food import Food
-from app.schemas.food import FoodCreate
+from app.schemas.food import FoodCreate, FoodResponse
+from app.core.batch_loader import BatchLoader
 from app.core.redis_client import CacheService
+from app.core.cache_keys import CacheKeys, invalidate
+from app.core.database import read_replica
+from app.services.food_catalog import food_catalog
 
 
 class FoodService:
@@ -19,60 +23,71 @@ class FoodService:
         db.add(db_food)
         db.commit()
         db.refresh(db_food)
-        CacheService.delete("foods:list")
+        invalidate(CacheKeys.foods_group())
+        # Readers fall back to the foods table until the background rebuild lands
+        food_catalog.request_publish()
         return db_food
     
     @staticmethod
-    def get_food_by_id(db: Session, food_id: int) -> Optional[Food]:
-        """Get food by ID"""
-        cache_key = f"food:id:{food_id}"
-        cached_food = CacheService.get(cache_key)
-        if cached_food:
-            return db.query(Food).filter(Food.id == food_id).first()
+    def get_food_by_id(db: Session, food_id: int) -> Optional[FoodResponse]:
+        """Get food by ID, served from the cache when possible"""
+        return FoodService.get_foods_by_ids(db, [food_id]).get(food_id)
+    
+    @staticmethod
+    def get_foods_by_ids(db: Session, food_ids: Iterable[int]) -> Dict[int, FoodResponse]:
+        """
+        Resolve many foods with one cache MGET and one query for the misses.
+        Unknown ids are left out of the result. Misses are read from the
+        primary, so the result can gate writes such as logging a meal.
+        """
+        def load(missing: List[int]) -> Dict[int, FoodResponse]:
+            foods = db.query(Food).filter(Food.id.in_(missing)).all()
+            return {food.id: FoodResponse.model_validate(food) for food in foods}
         
-        food = db.query(Food).filter(Food.id == food_id).first()
-        if food:
-            CacheService.set(cache_key, {"id": food.id}, expire=3600)
-        return food
+        loader = BatchLoader(load, cache_key=CacheKeys.food_by_id, expire=3600, model=FoodResponse)
+        food_ids = list(dict.fromkeys(food_ids))
+        return {
+            food_id: food
+            for food_id, food in zip(food_ids, loader.load_many(food_ids))
+            if food is not None
+        }
+    
+    @staticmethod
+    def _by_ids(db: Session, food_ids: List[int]) -> List[Food]:
+        """Load cached food ids from a replica, and any it has not replicated yet from the primary"""
+        if not food_ids:
+            return []
+        with read_replica(db):
+            foods = {f.id: f for f in db.query(Food).filter(Food.id.in_(food_ids)).all()}
+        lagging = [food_id for food_id in food_ids if food_id not in foods]
+        if lagging:
+            foods.update((f.id, f) for f in db.query(Food).filter(Food.id.in_(lagging)).all())
+        return [foods[food_id] for food_id in food_ids if food_id in foods]
     
     @staticmethod
     def search_foods(db: Session, query: str, limit: int = 20) -> List[Food]:
         """Search foods by name"""
-        cache_key = f"foods:search:{query}:{limit}"
-        cached_foods = CacheService.get(cache_key)
-        if cached_foods:
-            food_ids = [f["id"] for f in cached_foods]
-            return db.query(Food).filter(Food.id.in_(food_ids)).all()
+        loaded: List[Food] = []
         
-        # Case-insensitive search for MySQL
-        search_pattern = f"%{query}%"
-        foods = db.query(Food).filter(
-            Food.name.like(search_pattern)
-        ).limit(limit).all()
+        def load() -> List[int]:
+            # Case-insensitive search for MySQL; cache fills read the primary
+            search_pattern = f"%{query}%"
+            loaded.extend(db.query(Food).filter(
+                Food.name.like(search_pattern)
+            ).limit(limit).all())
+            return [f.id for f in loaded]
         
-        if foods:
-            CacheService.set(
-                cache_key,
-                [{"id": f.id} for f in foods],
-                expire=1800
-            )
-        return foods
+        food_ids = CacheService.get_or_set(CacheKeys.food_search(query, limit), load, expire=1800)
+        return loaded or FoodService._by_ids(db, food_ids)
     
     @staticmethod
     def get_all_foods(db: Session, skip: int = 0, limit: int = 100) -> List[Food]:
         """Get all foods with pagination"""
-        cache_key = f"foods:list:{skip}:{limit}"
-        cached_foods = CacheService.get(cache_key)
-        if cached_foods:
-            food_ids = [f["id"] for f in cached_foods]
-            return db.query(Food).filter(Food.id.in_(food_ids)).all()
+        loaded: List[Food] = []
         
-        foods = db.query(Food).offset(skip).limit(limit).all()
-        if foods:
-            CacheService.set(
-                cache_key,
-                [{"id": f.id} for f in foods],
-                expire=1800
-            )
-        return foods
-
+        def load() -> List[int]:
+            loaded.extend(db.query(Food).order_by(Food.id).offset(skip).limit(limit).all())
+            return [f.id for f in loaded]
+        
+        food_ids = CacheService.get_or_set(CacheKeys.food_list(skip, limit), load, expire=1800)
+        return loaded or FoodService._by_ids(db, food_ids)
@@ -0,0 +1,217 @@
+"""
+Goal progress service - follows SOLID principles
+Single Responsibility: Tracks weigh-ins and projects progress toward the active goal
+
+Progress is computed from a per-user window cached in Redis: the weigh-ins
+and per-meal calories of the last GOAL_PROGRESS_WINDOW_DAYS days. New
+weigh-ins and meals are patched into the cached window (entries are keyed
+by row id, so applying one twice is harmless) instead of re-reading the
+user's history. When a patch cannot be applied the window is invalidated
+and rebuilt from the database on the next read.
+"""
+import math
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime, timedelta
+import numpy as np
+from app.core.config import settings
+from app.core.redis_client import CacheService
+from app.core.cache_keys import CacheKeys, invalidate
+from app.models.goal import WeightLog
+from app.models.meal import Meal, MealFood
+from app.schemas.goal import WeightLogCreate
+from app.services.goal_service import GoalService
+from app.services.meal_service import MealService
+
+KCAL_PER_KG = 7700.0  # Energy in one kg of body weight change
+MAX_PROJECTION_DAYS = 3 * 365
+
+
+def _day_number(moment: datetime) -> float:
+    """Days since 0001-01-01 as a float, a linear time axis for the regression"""
+    return moment.toordinal() + (moment.hour * 3600 + moment.minute * 60 + moment.second) / 86400.0
+
+
+def _window_start(now: datetime) -> int:
+    """Ordinal of the first day in the trailing window"""
+    return now.toordinal() - settings.GOAL_PROGRESS_WINDOW_DAYS + 1
+
+
+def _trim(window: dict, start: int) -> dict:
+    """Drop weigh-ins and meals that have left the window"""
+    return {
+        "weights": {key: entry for key, entry in window["weights"].items() if entry[0] >= start},
+        "meals": {key: entry for key, entry in window["meals"].items() if entry[0] >= start}
+    }
+
+
+class GoalProgressService:
+    """Service for weigh-ins and goal progress"""
+    
+    @staticmethod
+    def log_weight(db: Session, user_id: int, data: WeightLogCreate) -> WeightLog:
+        """Record a weigh-in; the newest one also becomes the active goal's current weight"""
+        logged_at = data.logged_at or datetime.now()
+        latest = db.query(func.max(WeightLog.logged_at)).filter(
+            WeightLog.user_id == user_id
+        ).scalar()
+        
+        weight_log = WeightLog(user_id=user_id, weight_kg=data.weight_kg, logged_at=logged_at)
+        db.add(weight_log)
+        goal = GoalService.get_active_goal(db, user_id)
+        is_newest = latest is None or logged_at.replace(tzinfo=None) >= latest.replace(tzinfo=None)
+        if goal is not None and is_newest:
+            GoalService.set_current_weight(db, goal.id, data.weight_kg)
+        db.commit()
+        db.refresh(weight_log)
+        if goal is not None and is_newest:
+            invalidate(CacheKeys.user_goals_group(user_id))
+        
+        GoalProgressService._record(
+            user_id,
+            "weights",
+            weight_log.id,
+            [_day_number(weight_log.logged_at), weight_log.weight_kg]
+        )
+        return weight_log
+    
+    @staticmethod
+    def get_weight_logs(db: Session, user_id: int, limit: int = 100) -> List[WeightLog]:
+        """Most recent weigh-ins first"""
+        return db.query(WeightLog).filter(
+            WeightLog.user_id == user_id
+        ).order_by(WeightLog.logged_at.desc()).limit(limit).all()
+    
+    @staticmethod
+    def record_meal(meal: Meal) -> None:
+        """Add a newly logged meal's calories to the cached window"""
+        calories = MealService.calculate_meal_nutrition(meal)["total_calories"]
+        GoalProgressService._record(meal.user_id, "meals", meal.id, [meal.meal_date.toordinal(), calories])
+    
+    @staticmethod
+    def _record(user_id: int, field: str, row_id: int, entry: list) -> None:
+        """Patch one entry into the cached window, or invalidate it if that is not possible"""
+        start = _window_start(datetime.now())
+        
+        def apply(window: dict) -> dict:
+            window[field][str(row_id)] = entry
+            return _trim(window, start)
+        
+        updated = CacheService.update(
+            CacheKeys.user_progress(user_id),
+            apply,
+            expire=settings.GOAL_PROGRESS_CACHE_SECONDS
+        )
+        if not updated:
+            # No cached window, or a concurrent patch: orphan any rebuild in flight
+            invalidate(CacheKeys.user_progress_group(user_id))
+    
+    @staticmethod
+    def _build_window(db: Session, user_id: int, start: int) -> dict:
+        """Read the window's weigh-ins and meal calories from the primary"""
+        since = datetime.fromordinal(start)
+        weights = db.query(WeightLog.id, WeightLog.logged_at, WeightLog.weight_kg).filter(
+            WeightLog.user_id == user_id,
+            WeightLog.logged_at >= since
+        ).all()
+        meal_rows = db.execute(
+            select(Meal.id, Meal.meal_date, MealFood.food_id, MealFood.quantity_g)
+            .select_from(Meal)
+            .outerjoin(MealFood, MealFood.meal_id == Meal.id)
+            .where(Meal.user_id == user_id, Meal.meal_date >= since)
+        ).all()
+        nutrition = MealService.calculate_batch_nutrition(
+            db,
+            [(meal_id, food_id, quantity) for meal_id, _, food_id, quantity in meal_rows if food_id is not None]
+        )
+        return {
+            "weights": {
+                str(log_id): [_day_number(logged_at), weight_kg]
+                for log_id, logged_at, weight_kg in weights
+            },
+            "meals": {
+                str(meal_id): [
+                    meal_date.toordinal(),
+                    nutrition[meal_id]["total_calories"] if meal_id in nutrition else 0.0
+                ]
+                for meal_id, meal_date, _, _ in meal_rows
+            }
+        }
+    
+    @staticmethod
+    def _load_window(db: Session, user_id: int, start: int) -> dict:
+        """Cached window, rebuilt from the database on a miss"""
+        cache_key = CacheKeys.user_progress(user_id)
+        window = CacheService.get(cache_key)
+        if window is None:
+            window = GoalProgressService._build_window(db, user_id, start)
+            # NX: never overwrite a window that was patched while we were reading
+            CacheService.add(cache_key, window, expire=settings.GOAL_PROGRESS_CACHE_SECONDS)
+        return _trim(window, start)
+    
+    @staticmethod
+    def get_progress(db: Session, user_id: int) -> dict:
+        """Weight trend, calorie balance and projected completion of the active goal"""
+        now = datetime.now()
+        window = GoalProgressService._load_window(db, user_id, _window_start(now))
+        goal = GoalService.get_active_goal(db, user_id)
+        target = goal.target_weight_kg if goal is not None else None
+        
+        progress = GoalProgressService.summarize(window, target, now)
+        progress["goal_id"] = goal.id if goal is not None else None
+        return progress
+    
+    @staticmethod
+    def summarize(window: dict, target_weight_kg: Optional[float], now: datetime) -> dict:
+        """
+        Least-squares trend over the window's weigh-ins, average intake over
+        days with meals, and the date the trend reaches the target weight.
+        Maintenance calories are inferred from intake and the trend:
+        intake - maintenance = daily weight change * KCAL_PER_KG.
+        """
+        weights = np.array(sorted(window["weights"].values()), dtype=np.float64).reshape(-1, 2)
+        latest = trend = slope = None
+        if len(weights):
+            latest = float(weights[-1, 1])
+            trend = latest
+        if len(weights) >= 2 and weights[-1, 0] - weights[0, 0] >= 1.0:
+            # Centre the time axis so the fit stays well conditioned
+            origin = weights[:, 0].mean()
+            slope, intercept = np.polyfit(weights[:, 0] - origin, weights[:, 1], 1)
+            slope = float(slope)
+            trend = float(intercept + slope * (_day_number(now) - origin))
+        
+        daily_calories = {}
+        for day, calories in window["meals"].values():
+            daily_calories[day] = daily_calories.get(day, 0.0) + calories
+        average = sum(daily_calories.values()) / len(daily_calories) if daily_calories else None
+        maintenance = balance = None
+        if average is not None and slope is not None:
+            balance = slope * KCAL_PER_KG
+            maintenance = average - balance
+        
+        remaining = projected = None
+        if target_weight_kg is not None and trend is not None:
+            remaining = target_weight_kg - trend
+            if abs(remaining) < 0.05:
+                projected = now.date()
+            elif slope and remaining / slope > 0:
+                days = math.ceil(remaining / slope)
+                if days <= MAX_PROJECTION_DAYS:
+                    projected = now.date() + timedelta(days=days)
+        
+        return {
+            "target_weight_kg": target_weight_kg,
+            "window_days": settings.GOAL_PROGRESS_WINDOW_DAYS,
+            "weigh_in_count": len(weights),
+            "latest_weight_kg": latest,
+            "trend_weight_kg": round(trend, 2) if trend is not None else None,
+            "weekly_change_kg": round(slope * 7, 2) if slope is not None else None,
+            "days_with_meals": len(daily_calories),
+            "average_daily_calories": round(average, 1) if average is not None else None,
+            "estimated_maintenance_calories": round(maintenance, 1) if maintenance is not None else None,
+            "daily_calorie_balance": round(balance, 1) if balance is not None else None,
+            "remaining_kg": round(remaining, 2) if remaining is not None else None,
+            "projected_date": projected
+        }
@@ -0,0 +1,77 @@
+"""
+Goal service - follows SOLID principles
+Single Responsibility: Handles goal business logic and the single-active-goal invariant
+"""
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.models.goal import Goal, GoalType
+from app.models.user import User
+from app.schemas.goal import GoalCreate, GoalResponse
+from app.core.redis_client import CacheService
+from app.core.cache_keys import CacheKeys, invalidate
+
+
+class GoalService:
+    """Service for goal operations"""
+    
+    @staticmethod
+    def create_goal(db: Session, user_id: int, goal_data: GoalCreate) -> Goal:
+        """
+        Create a goal and make it the user's only active one.
+        The user row is locked first, so concurrent creates for the same user
+        run one after the other; each deactivates the previous goals with a
+        single UPDATE in the same transaction as its INSERT.
+        """
+        db.query(User.id).filter(User.id == user_id).with_for_update().first()
+        db.execute(
+            update(Goal)
+            .where(Goal.user_id == user_id, Goal.is_active == True)
+            .values(is_active=False)
+        )
+        db_goal = Goal(
+            user_id=user_id,
+            goal_type=GoalType(goal_data.goal_type),
+            target_weight_kg=goal_data.target_weight_kg,
+            current_weight_kg=goal_data.current_weight_kg,
+            target_date=goal_data.target_date,
+            is_active=True
+        )
+        db.add(db_goal)
+        db.commit()
+        db.refresh(db_goal)
+        invalidate(CacheKeys.user_goals_group(user_id))
+        return db_goal
+    
+    @staticmethod
+    def get_user_goals(db: Session, user_id: int) -> List[Goal]:
+        """Get user's goals, newest first"""
+        return db.query(Goal).filter(
+            Goal.user_id == user_id
+        ).order_by(Goal.created_at.desc(), Goal.id.desc()).all()
+    
+    @staticmethod
+    def get_active_goal(db: Session, user_id: int) -> Optional[GoalResponse]:
+        """Get user's active goal; cached, including the answer that there is none"""
+        cache_key = CacheKeys.active_goal(user_id)
+        cached = CacheService.get(cache_key)
+        if cached is not None:
+            return GoalResponse.model_validate(cached["goal"]) if cached["goal"] else None
+        
+        goal = db.query(Goal).filter(
+            Goal.user_id == user_id,
+            Goal.is_active == True
+        ).order_by(Goal.created_at.desc(), Goal.id.desc()).first()
+        
+        active = GoalResponse.model_validate(goal) if goal else None
+        CacheService.set(cache_key, {"goal": active}, expire=1800)
+        return active
+    
+    @staticmethod
+    def set_current_weight(db: Session, goal_id: int, weight_kg: float) -> None:
+        """Record a new current weight on a goal; the caller commits, then invalidates user_goals_group"""
+        db.execute(
+            update(Goal)
+            .where(Goal.id == goal_id)
+            .values(current_weight_kg=weight_kg)
+        )
@@ -0,0 +1,202 @@
+"""
+Meal serializer - follows SOLID principles
+Single Responsibility: Builds meal response payloads from flat row sets
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+from app.models.meal import Meal, MealFood
+from app.models.food import Food
+from app.services.food_catalog import CatalogSnapshot, food_catalog
+
+
+def _to_float(value) -> Optional[float]:
+    """Column value as float, keeping NULL as None"""
+    return float(value) if value is not None else None
+
+
+MEAL_COLUMNS = (
+    Meal.id,
+    Meal.meal_type,
+    Meal.meal_date,
+    Meal.notes,
+    MealFood.id,
+    MealFood.food_id,
+    MealFood.quantity_g
+)
+FOOD_COLUMNS = (
+    Food.name,
+    Food.description,
+    Food.calories_per_100g,
+    Food.protein_per_100g,
+    Food.carbs_per_100g,
+    Food.fats_per_100g,
+    Food.fiber_per_100g,
+    Food.sugar_per_100g,
+    Food.sodium_per_100g
+)
+
+
+def _food_from_row(row) -> dict:
+    """Food payload from the FOOD_COLUMNS that follow the MEAL_COLUMNS in a row"""
+    name, description, *nutrients = row[len(MEAL_COLUMNS):]
+    return {
+        "id": row[5],
+        "name": name,
+        "description": description,
+        **{
+            column.key: _to_float(value)
+            for column, value in zip(FOOD_COLUMNS[2:], nutrients)
+        }
+    }
+
+
+class MealSerializer:
+    """
+    Serializes meals straight from (meal, meal_food, food) rows.
+    Each food row is read once and turned into the response dict
+    directly, instead of ORM object -> dict -> MealResponse -> JSON.
+    Food columns come from the food catalog snapshot when it has every
+    food involved, so only meals and meal_foods are read from the database.
+    """
+    
+    @staticmethod
+    def _select(*criteria, with_foods: bool = True):
+        """Flat meal/meal_food rows (plus food columns) matching criteria, newest meal first"""
+        stmt = (
+            select(*MEAL_COLUMNS, *(FOOD_COLUMNS if with_foods else ()))
+            .select_from(Meal)
+            .outerjoin(MealFood, MealFood.meal_id == Meal.id)
+        )
+        if with_foods:
+            stmt = stmt.outerjoin(Food, Food.id == MealFood.food_id)
+        return stmt.where(*criteria).order_by(Meal.meal_date.desc(), Meal.id.desc(), MealFood.id)
+    
+    @staticmethod
+    def _user_criteria(user_id: int, start_date: Optional[datetime], end_date: Optional[datetime]) -> list:
+        """WHERE clauses for a user's meals within a date range"""
+        criteria = [Meal.user_id == user_id]
+        if start_date:
+            criteria.append(Meal.meal_date >= start_date)
+        if end_date:
+            criteria.append(Meal.meal_date <= end_date)
+        return criteria
+    
+    @staticmethod
+    def fetch_rows(db: Session, meal_ids: Iterable[int]) -> List:
+        """Fetch flat meal/food rows for the given meals in one query"""
+        meal_ids = list(meal_ids)
+        if not meal_ids:
+            return []
+        return db.execute(MealSerializer._select(Meal.id.in_(meal_ids))).all()
+    
+    @staticmethod
+    def fetch_meal_food_rows(db: Session, meal_ids: Iterable[int]) -> List:
+        """Fetch flat meal/meal_food rows, without food columns, in one query"""
+        meal_ids = list(meal_ids)
+        if not meal_ids:
+            return []
+        return db.execute(MealSerializer._select(Meal.id.in_(meal_ids), with_foods=False)).all()
+    
+    @staticmethod
+    def _group_rows(rows: Iterable, food_of: Callable[[tuple], dict]) -> Dict[int, dict]:
+        """
+        Group rows that start with the MEAL_COLUMNS into meal payloads keyed by
+        meal id; food_of(row) gives the food payload of a row with a meal_food
+        """
+        meals: Dict[int, dict] = {}
+        
+        for row in rows:
+            meal_id, meal_type, meal_date, notes, meal_food_id, food_id, quantity_g = row[:len(MEAL_COLUMNS)]
+            meal = meals.get(meal_id)
+            if meal is None:
+                meal = {
+                    "id": meal_id,
+                    "meal_type": getattr(meal_type, "value", meal_type),
+                    "meal_date": meal_date,
+                    "notes": notes,
+                    "meal_foods": [],
+                    "total_calories": 0.0,
+                    "total_protein": 0.0,
+                    "total_carbs": 0.0,
+                    "total_fats": 0.0
+                }
+                meals[meal_id] = meal
+            
+            if meal_food_id is None:
+                continue
+            
+            food = food_of(row)
+            quantity = _to_float(quantity_g)
+            multiplier = quantity / 100.0
+            meal["total_calories"] += food["calories_per_100g"] * multiplier
+            meal["total_protein"] += food["protein_per_100g"] * multiplier
+            meal["total_carbs"] += food["carbs_per_100g"] * multiplier
+            meal["total_fats"] += food["fats_per_100g"] * multiplier
+            meal["meal_foods"].append({
+                "id": meal_food_id,
+                "food_id": food_id,
+                "quantity_g": quantity,
+                "food": food
+            })
+        
+        for meal in meals.values():
+            meal["total_calories"] = round(meal["total_calories"], 2)
+            meal["total_protein"] = round(meal["total_protein"], 2)
+            meal["total_carbs"] = round(meal["total_carbs"], 2)
+            meal["total_fats"] = round(meal["total_fats"], 2)
+        
+        return meals
+    
+    @staticmethod
+    def serialize_catalog_rows(rows: Iterable, snapshot: CatalogSnapshot) -> Dict[int, dict]:
+        """Group meal/meal_food rows into meal payloads, taking foods from the snapshot"""
+        rows = list(rows)
+        food_ids = sorted({row[5] for row in rows if row[4] is not None})
+        foods = {
+            food_id: snapshot.food(position)
+            for food_id, position in zip(food_ids, snapshot.positions(food_ids).tolist())
+        }
+        return MealSerializer._group_rows(rows, lambda row: foods[row[5]])
+    
+    @staticmethod
+    def _serialize(db: Session, *criteria) -> Dict[int, dict]:
+        """
+        Serialize the meals matching criteria from one meal/meal_food query and
+        the catalog snapshot, or from one query joining foods if it cannot serve
+        """
+        rows = db.execute(MealSerializer._select(*criteria, with_foods=False)).all()
+        snapshot = food_catalog.lookup(db, {row[5] for row in rows if row[4] is not None})
+        if snapshot is not None:
+            return MealSerializer.serialize_catalog_rows(rows, snapshot)
+        return MealSerializer.serialize_rows(db.execute(MealSerializer._select(*criteria)).all())
+    
+    @staticmethod
+    def serialize_rows(rows: Iterable) -> Dict[int, dict]:
+        """Group flat rows, food columns included, into meal payloads keyed by meal id"""
+        return MealSerializer._group_rows(rows, _food_from_row)
+    
+    @staticmethod
+    def serialize_meals(db: Session, meal_ids: List[int]) -> List[dict]:
+        """Serialize meals, preserving the order of meal_ids"""
+        if not meal_ids:
+            return []
+        meals = MealSerializer._serialize(db, Meal.id.in_(meal_ids))
+        return [meals[meal_id] for meal_id in meal_ids if meal_id in meals]
+    
+    @staticmethod
+    def serialize_meal(db: Session, meal_id: int) -> Optional[dict]:
+        """Serialize a single meal"""
+        return MealSerializer._serialize(db, Meal.id == meal_id).get(meal_id)
+    
+    @staticmethod
+    def serialize_user_meals(
+        db: Session,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[dict]:
+        """A user's meals within a date range, newest first, filtered in the query itself"""
+        meals = MealSerializer._serialize(db, *MealSerializer._user_criteria(user_id, start_date, end_date))
+        return list(meals.values())
@@ -2,13 +2,18 @@
 Meal service - follows SOLID principles
 Single Responsibility: Handles meal-related business logic
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, object_session
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
+import numpy as np
 from app.models.meal import Meal, MealFood, MealType
 from app.models.food import Food
 from app.schemas.food import MealCreate
 from app.core.redis_client import CacheService
+from app.core.cache_keys import CacheKeys, invalidate
+from app.services.food_catalog import NUTRIENT_FIELDS, food_catalog, sum_by_meal
+from app.services.meal_serializer import MealSerializer
 
 
 class MealService:
@@ -37,7 +42,7 @@ class MealService:
         
         db.commit()
         db.refresh(db_meal)
-        CacheService.delete(f"meals:user:{user_id}")
+        invalidate(CacheKeys.user_meals_group(user_id))
         return db_meal
     
     @staticmethod
@@ -52,13 +57,10 @@ class MealService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> List[Meal]:
-        """Get user's meals within date range"""
-        cache_key = f"meals:user:{user_id}:{start_date}:{end_date}"
-        cached_meals = CacheService.get(cache_key)
-        if cached_meals:
-            meal_ids = [m["id"] for m in cached_meals]
-            return db.query(Meal).filter(Meal.id.in_(meal_ids)).all()
-        
+        """
+        Get user's meals within date range, from the primary since reports persist
+        totals built from them. GET /meals/ caches its payload in get_user_meal_list.
+        """
         query = db.query(Meal).filter(Meal.user_id == user_id)
         
         if start_date:
@@ -66,19 +68,138 @@ class MealService:
         if end_date:
             query = query.filter(Meal.meal_date <= end_date)
         
-        meals = query.order_by(Meal.meal_date.desc()).all()
-        
-        if meals:
-            CacheService.set(
-                cache_key,
-                [{"id": m.id} for m in meals],
-                expire=600
+        return query.order_by(Meal.meal_date.desc()).all()
+    
+    @staticmethod
+    def get_user_meal_list(
+        db: Session,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[dict]:
+        """Serialized meals within a date range, newest first; one flat query on a cache miss"""
+        return CacheService.get_or_set(
+            CacheKeys.user_meal_list(user_id, start_date, end_date),
+            lambda: MealSerializer.serialize_user_meals(db, user_id, start_date, end_date),
+            expire=600
+        )
+    
+    @staticmethod
+    def iter_meal_export_rows(
+        db: Session,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        """
+        Stream a user's meal history as chunks of flat rows (see ExportService.EXPORT_COLUMNS).
+        Rows come from a server-side cursor so memory stays bounded by chunk_size.
+        """
+        stmt = (
+            select(
+                Meal.id,
+                Meal.meal_type,
+                Meal.meal_date,
+                Meal.notes,
+                MealFood.id,
+                MealFood.food_id,
+                Food.name,
+                MealFood.quantity_g,
+                Food.calories_per_100g,
+                Food.protein_per_100g,
+                Food.carbs_per_100g,
+                Food.fats_per_100g,
+                Food.fiber_per_100g,
+                Food.sugar_per_100g,
+                Food.sodium_per_100g
             )
-        return meals
+            .select_from(Meal)
+            .join(MealFood, MealFood.meal_id == Meal.id)
+            .join(Food, Food.id == MealFood.food_id)
+            .where(Meal.user_id == user_id)
+            .order_by(Meal.meal_date, Meal.id, MealFood.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if start_date:
+            stmt = stmt.where(Meal.meal_date >= start_date)
+        if end_date:
+            stmt = stmt.where(Meal.meal_date <= end_date)
+        
+        for partition in db.execute(stmt).partitions():
+            chunk = []
+            for (
+                meal_id, meal_type, meal_date, notes, meal_food_id, food_id, food_name,
+                quantity_g, *densities
+            ) in partition:
+                multiplier = quantity_g / 100.0
+                chunk.append((
+                    meal_id,
+                    getattr(meal_type, "value", meal_type),
+                    meal_date,
+                    notes,
+                    meal_food_id,
+                    food_id,
+                    food_name,
+                    quantity_g,
+                    *(round((d or 0.0) * multiplier, 2) for d in densities)
+                ))
+            yield chunk
+    
+    @staticmethod
+    def fetch_nutrition_rows(db: Session, meal_ids: Iterable[int]) -> List[tuple]:
+        """
+        Fetch (meal_id, food_id, quantity_g) rows for many meals in one query,
+        from the primary since reports persist them
+        """
+        meal_ids = list(meal_ids)
+        if not meal_ids:
+            return []
+        
+        stmt = (
+            select(MealFood.meal_id, MealFood.food_id, MealFood.quantity_g)
+            .where(MealFood.meal_id.in_(meal_ids))
+            .order_by(MealFood.meal_id)
+        )
+        return db.execute(stmt).all()
+    
+    @staticmethod
+    def calculate_batch_nutrition(db: Session, rows: Iterable[tuple]) -> Dict[int, dict]:
+        """
+        Calculate total nutrition, including fiber, sugar and sodium, for every
+        meal in (meal_id, food_id, quantity_g) rows with one vectorized pass.
+        Meals without foods are left out of the result.
+        """
+        rows = list(rows)
+        if not rows:
+            return {}
+        
+        meal_ids, food_ids, quantities = (np.asarray(column) for column in zip(*rows))
+        food_ids = food_ids.astype(np.int64)
+        snapshot = food_catalog.lookup(db, np.unique(food_ids))
+        if snapshot is not None:
+            return snapshot.batch_nutrition(meal_ids, food_ids, quantities)
+        
+        # Catalog unavailable: gather the densities of just these foods
+        food_rows = db.query(
+            Food.id,
+            *(getattr(Food, field) for field in NUTRIENT_FIELDS)
+        ).filter(Food.id.in_(np.unique(food_ids).tolist())).order_by(Food.id).all()
+        known_ids = np.array([row[0] for row in food_rows], dtype=np.int64)
+        nutrients = np.array(
+            [[value or 0.0 for value in row[1:]] for row in food_rows],
+            dtype=np.float64
+        ).reshape(len(food_rows), len(NUTRIENT_FIELDS))
+        return sum_by_meal(meal_ids, np.searchsorted(known_ids, food_ids), quantities, nutrients)
     
     @staticmethod
     def calculate_meal_nutrition(meal: Meal) -> dict:
-        """Calculate total nutrition for a meal"""
+        """Calculate total nutrition for a meal, from the food catalog when it can serve every food"""
+        food_ids = [meal_food.food_id for meal_food in meal.meal_foods]
+        snapshot = food_catalog.lookup(object_session(meal), food_ids)
+        if snapshot is not None:
+            return snapshot.meal_nutrition(food_ids, [meal_food.quantity_g for meal_food in meal.meal_foods])
+        
         total_calories = 0.0
         total_protein = 0.0
         total_carbs = 0.0
@@ -2,42 +2,122 @@
 Preference service - follows SOLID principles
 Single Responsibility: Handles user preference business logic
 """
-from sqlalchemy.orm import Session
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Sequence, Tuple
 from app.models.preference import UserPreference, DietaryRestriction
-from app.schemas.preference import PreferenceCreate
+from app.schemas.preference import DietaryRestrictionCreate, PreferenceCreate
 from app.core.redis_client import CacheService
+from app.core.cache_keys import CacheKeys, invalidate
+
+# Scalar fields a PreferenceCreate may set; None in the payload leaves them unchanged
+PREFERENCE_FIELDS = ["target_calories", "target_protein", "target_carbs", "target_fats", "preferred_meal_times"]
+
+
+@dataclass(frozen=True, slots=True)
+class RestrictionSnapshot:
+    """One dietary restriction"""
+    id: int
+    restriction_type: str
+    severity: str
+
+
+@dataclass(frozen=True, slots=True)
+class PreferenceSnapshot:
+    """
+    Immutable copy of a user's preferences with their dietary restrictions.
+    Resolved once per request and passed down, instead of each caller
+    re-fetching the ORM row and lazy-loading its restrictions.
+    """
+    id: int
+    user_id: int
+    target_calories: Optional[float]
+    target_protein: Optional[float]
+    target_carbs: Optional[float]
+    target_fats: Optional[float]
+    preferred_meal_times: Optional[str]
+    dietary_restrictions: Tuple[RestrictionSnapshot, ...]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    
+    @classmethod
+    def from_model(cls, preference: UserPreference) -> "PreferenceSnapshot":
+        """Copy a loaded UserPreference and its restrictions"""
+        return cls(
+            id=preference.id,
+            user_id=preference.user_id,
+            target_calories=preference.target_calories,
+            target_protein=preference.target_protein,
+            target_carbs=preference.target_carbs,
+            target_fats=preference.target_fats,
+            preferred_meal_times=preference.preferred_meal_times,
+            dietary_restrictions=tuple(
+                RestrictionSnapshot(
+                    id=restriction.id,
+                    restriction_type=restriction.restriction_type,
+                    severity=restriction.severity
+                )
+                for restriction in sorted(preference.dietary_restrictions, key=lambda r: r.id)
+            ),
+            created_at=preference.created_at,
+            updated_at=preference.updated_at
+        )
+    
+    @property
+    def restriction_types(self) -> List[str]:
+        """Restriction names, e.g. ["vegetarian"]"""
+        return [restriction.restriction_type for restriction in self.dietary_restrictions]
 
 
 class PreferenceService:
     """Service for preference operations"""
     
+    @staticmethod
+    def _restriction_diff(
+        current: Sequence[DietaryRestriction],
+        requested: List[DietaryRestrictionCreate]
+    ) -> Tuple[List[int], List[dict]]:
+        """Ids of restriction rows to delete and rows to insert to turn current into requested"""
+        wanted = {(item.restriction_type, item.severity) for item in requested}
+        kept = set()
+        deletes = []
+        for restriction in current:
+            key = (restriction.restriction_type, restriction.severity)
+            if key in wanted and key not in kept:
+                kept.add(key)
+            else:
+                deletes.append(restriction.id)
+        # Keep the request's order for new rows
+        inserts = []
+        for item in requested:
+            key = (item.restriction_type, item.severity)
+            if key not in kept:
+                kept.add(key)
+                inserts.append({"restriction_type": key[0], "severity": key[1]})
+        return deletes, inserts
+    
     @staticmethod
     def create_or_update_preferences(
         db: Session,
         user_id: int,
         preference_data: PreferenceCreate
-    ) -> UserPreference:
-        """Create or update user preferences"""
-        existing = db.query(UserPreference).filter(
+    ) -> PreferenceSnapshot:
+        """
+        Create or update user preferences.
+        The preference row is locked (SELECT ... FOR UPDATE) and its stored
+        restrictions are diffed inside the transaction, so concurrent updates
+        are applied one after the other. Only changed fields are updated and
+        only added/removed restrictions are written, each in one bulk statement.
+        The cache is invalidated once the write has committed.
+        """
+        requested = preference_data.dietary_restrictions
+        db_preference = db.query(UserPreference).filter(
             UserPreference.user_id == user_id
-        ).first()
+        ).with_for_update().populate_existing().first()
         
-        if existing:
-            # Update existing preferences
-            if preference_data.target_calories is not None:
-                existing.target_calories = preference_data.target_calories
-            if preference_data.target_protein is not None:
-                existing.target_protein = preference_data.target_protein
-            if preference_data.target_carbs is not None:
-                existing.target_carbs = preference_data.target_carbs
-            if preference_data.target_fats is not None:
-                existing.target_fats = preference_data.target_fats
-            if preference_data.preferred_meal_times is not None:
-                existing.preferred_meal_times = preference_data.preferred_meal_times
-            
-            db_preference = existing
-        else:
+        if db_preference is None:
             # Create new preferences
             db_preference = UserPreference(
                 user_id=user_id,
@@ -45,42 +125,71 @@ class PreferenceService:
             )
             db.add(db_preference)
             db.flush()
-        
-        # Handle dietary restrictions
-        if preference_data.dietary_restrictions is not None:
-            # Delete existing restrictions
-            db.query(DietaryRestriction).filter(
-                DietaryRestriction.preference_id == db_preference.id
-            ).delete()
+            preference_id = db_preference.id
+            deletes, inserts = PreferenceService._restriction_diff((), requested or [])
+        else:
+            preference_id = db_preference.id
+            changes = {
+                field: getattr(preference_data, field)
+                for field in PREFERENCE_FIELDS
+                if getattr(preference_data, field) is not None
+                and getattr(preference_data, field) != getattr(db_preference, field)
+            }
+            if requested is not None:
+                # Restriction rows only change under the preference row's lock
+                current = db.query(DietaryRestriction).filter(
+                    DietaryRestriction.preference_id == preference_id
+                ).order_by(DietaryRestriction.id).with_for_update().all()
+                deletes, inserts = PreferenceService._restriction_diff(current, requested)
+            else:
+                deletes, inserts = [], []
+            if not changes and not deletes and not inserts:
+                db.commit()
+                return PreferenceService.get_user_preferences(db, user_id)
             
-            # Add new restrictions
-            for restriction_data in preference_data.dietary_restrictions:
-                restriction = DietaryRestriction(
-                    preference_id=db_preference.id,
-                    **restriction_data.model_dump()
+            if changes:
+                db.execute(
+                    update(UserPreference)
+                    .where(UserPreference.id == preference_id)
+                    .values(**changes)
                 )
-                db.add(restriction)
         
+        if deletes:
+            db.execute(delete(DietaryRestriction).where(DietaryRestriction.id.in_(deletes)))
+        if inserts:
+            db.execute(
+                insert(DietaryRestriction),
+                [{"preference_id": preference_id, **row} for row in inserts]
+            )
         db.commit()
-        db.refresh(db_preference)
-        CacheService.delete(f"preferences:user:{user_id}")
-        return db_preference
+        invalidate(CacheKeys.user_preferences_group(user_id))
+        
+        # Key built after the invalidation: a newer write would orphan this entry
+        cache_key = CacheKeys.user_preferences(user_id)
+        snapshot = PreferenceService.load_snapshot(db, user_id)
+        if snapshot:
+            CacheService.set(cache_key, snapshot, expire=1800)
+        return snapshot
     
     @staticmethod
-    def get_user_preferences(db: Session, user_id: int) -> Optional[UserPreference]:
-        """Get user preferences"""
-        cache_key = f"preferences:user:{user_id}"
-        cached_pref = CacheService.get(cache_key)
-        if cached_pref:
-            return db.query(UserPreference).filter(
-                UserPreference.id == cached_pref["id"]
-            ).first()
-        
-        preference = db.query(UserPreference).filter(
+    def load_snapshot(db: Session, user_id: int) -> Optional[PreferenceSnapshot]:
+        """Load preferences and restrictions in one joined query, bypassing the cache"""
+        preference = db.query(UserPreference).options(
+            joinedload(UserPreference.dietary_restrictions)
+        ).filter(
             UserPreference.user_id == user_id
         ).first()
+        return PreferenceSnapshot.from_model(preference) if preference else None
+    
+    @staticmethod
+    def get_user_preferences(db: Session, user_id: int) -> Optional[PreferenceSnapshot]:
+        """Get user preferences, cached as a full snapshot"""
+        cache_key = CacheKeys.user_preferences(user_id)
+        cached_pref = CacheService.get(cache_key, PreferenceSnapshot)
+        if cached_pref:
+            return cached_pref
         
+        preference = PreferenceService.load_snapshot(db, user_id)
         if preference:
-            CacheService.set(cache_key, {"id": preference.id}, expire=1800)
+            CacheService.set(cache_key, preference, expire=1800)
         return preference
-
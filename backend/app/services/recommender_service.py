@@ -2,23 +2,37 @@
 RAG-based recommender service - follows SOLID principles
 Single Responsibility: Handles AI-powered food recommendations
 """
+import importlib.util
+import threading
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
-try:
-    from langchain.embeddings import OpenAIEmbeddings
-    from langchain.vectorstores import FAISS
-    from langchain.llms import OpenAI
-    from langchain.chains import RetrievalQA
-    from langchain.prompts import PromptTemplate
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
 from app.core.config import settings
 from app.models.food import Food
 from app.models.preference import UserPreference
 from app.services.food_service import FoodService
+from app.services.preference_service import PreferenceService, PreferenceSnapshot
 import json
 
+# langchain/openai pull in hundreds of modules; they are only imported the
+# first time a worker actually needs the LLM, never at application import
+LANGCHAIN_AVAILABLE = importlib.util.find_spec("langchain") is not None
+
+
+def _load_langchain() -> dict:
+    """Import the langchain classes used by the recommender"""
+    from langchain.embeddings import OpenAIEmbeddings
+    from langchain.vectorstores import FAISS
+    from langchain.llms import OpenAI
+    from langchain.chains import RetrievalQA
+    from langchain.prompts import PromptTemplate
+    return {
+        "OpenAIEmbeddings": OpenAIEmbeddings,
+        "FAISS": FAISS,
+        "OpenAI": OpenAI,
+        "RetrievalQA": RetrievalQA,
+        "PromptTemplate": PromptTemplate
+    }
+
 
 class RecommenderService:
     """
@@ -27,23 +41,35 @@ class RecommenderService:
     """
     
     def __init__(self):
-        """Initialize the recommender with OpenAI"""
-        if settings.OPENAI_API_KEY and LANGCHAIN_AVAILABLE:
+        """Create the recommender; the OpenAI clients are built on first use"""
+        self.embeddings = None
+        self.llm = None
+        self.vector_store = None
+        self.qa_chain = None
+        self._langchain: Optional[dict] = None
+        self._ai_loaded = False
+        self._ai_lock = threading.Lock()
+    
+    @property
+    def ai_enabled(self) -> bool:
+        """Whether the LLM path is configured (does not import anything)"""
+        return bool(settings.OPENAI_API_KEY) and LANGCHAIN_AVAILABLE
+    
+    def _ensure_ai(self) -> None:
+        """Import langchain and build the OpenAI clients once per process"""
+        if self._ai_loaded or not self.ai_enabled:
+            return
+        with self._ai_lock:
+            if self._ai_loaded:
+                return
             try:
-                self.embeddings = OpenAIEmbeddings(openai_api_key=settings.OPENAI_API_KEY)
-                self.llm = OpenAI(temperature=0.7, openai_api_key=settings.OPENAI_API_KEY)
-                self.vector_store = None
-                self.qa_chain = None
+                self._langchain = _load_langchain()
+                self.embeddings = self._langchain["OpenAIEmbeddings"](openai_api_key=settings.OPENAI_API_KEY)
+                self.llm = self._langchain["OpenAI"](temperature=0.7, openai_api_key=settings.OPENAI_API_KEY)
             except Exception:
                 self.embeddings = None
                 self.llm = None
-                self.vector_store = None
-                self.qa_chain = None
-        else:
-            self.embeddings = None
-            self.llm = None
-            self.vector_store = None
-            self.qa_chain = None
+            self._ai_loaded = True
     
     def _build_food_knowledge_base(self, db: Session) -> None:
         """Build vector store from food database"""
@@ -67,10 +93,10 @@ class RecommenderService:
             documents.append(doc_text)
         
         if documents:
-            self.vector_store = FAISS.from_texts(documents, self.embeddings)
+            self.vector_store = self._langchain["FAISS"].from_texts(documents, self.embeddings)
             
             # Create QA chain
-            prompt_template = PromptTemplate(
+            prompt_template = self._langchain["PromptTemplate"](
                 input_variables=["context", "question"],
                 template="""
                 You are a nutrition expert. Based on the following food database and user preferences,
@@ -84,7 +110,7 @@ class RecommenderService:
                 """
             )
             
-            self.qa_chain = RetrievalQA.from_chain_type(
+            self.qa_chain = self._langchain["RetrievalQA"].from_chain_type(
                 llm=self.llm,
                 chain_type="stuff",
                 retriever=self.vector_store.as_retriever(search_kwargs={"k": 5}),
@@ -96,11 +122,22 @@ class RecommenderService:
         db: Session,
         user_id: int,
         target_calories: Optional[float] = None,
-        dietary_restrictions: Optional[List[str]] = None
+        dietary_restrictions: Optional[List[str]] = None,
+        preferences: Optional[PreferenceSnapshot] = None
     ) -> List[Dict]:
         """
-        Get personalized food recommendations using RAG
+        Get personalized food recommendations using RAG.
+        Targets and restrictions not given default to the user's preferences,
+        resolved once here (or passed in by the caller) for the whole pipeline.
         """
+        if preferences is None:
+            preferences = PreferenceService.get_user_preferences(db, user_id)
+        if preferences is not None:
+            target_calories = target_calories or preferences.target_calories
+            if dietary_restrictions is None:
+                dietary_restrictions = preferences.restriction_types or None
+        
+        self._ensure_ai()
         if not self.llm or not self.vector_store:
             # Fallback to rule-based recommendations if AI is not available
             return self._get_fallback_recommendations(db, target_calories, dietary_restrictions)
@@ -109,14 +146,10 @@ class RecommenderService:
         if not self.vector_store:
             self._build_food_knowledge_base(db)
         
-        # Get user preferences
-        from app.services.preference_service import PreferenceService
-        preferences = PreferenceService.get_user_preferences(db, user_id)
-        
         # Build query
         query = f"""
         I need food recommendations for a user with:
-        - Target calories: {target_calories or preferences.target_calories if preferences else 'flexible'}
+        - Target calories: {target_calories or 'flexible'}
         - Dietary restrictions: {', '.join(dietary_restrictions) if dietary_restrictions else 'none'}
         
         Suggest 5-7 healthy food options that fit these criteria.
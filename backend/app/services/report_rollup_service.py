@@ -0,0 +1,158 @@
+"""
+Report rollup service - follows SOLID principles
+Single Responsibility: Materializes weekly/monthly report tables in bulk
+"""
+import logging
+import time
+from sqlalchemy import Date, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, datetime, timedelta
+from app.models.meal import Meal, MealFood
+from app.models.food import Food
+from app.models.report import WeeklyReport, MonthlyReport, ReportRollupCheckpoint
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_MODELS = {
+    "weekly": WeeklyReport,
+    "monthly": MonthlyReport
+}
+
+
+class ReportRollupService:
+    """
+    Service for materializing weekly and monthly reports.
+    
+    Each period is rebuilt with one DELETE plus one INSERT ... SELECT that
+    groups the raw meals of every user at once, inside a single
+    transaction. Re-running a period is therefore idempotent, and the
+    checkpoint row lets an interrupted run resume after the last closed
+    period instead of starting over.
+    """
+    
+    @staticmethod
+    def period_start(granularity: str, day: date) -> date:
+        """First day of the period containing day"""
+        if granularity == "weekly":
+            return day - timedelta(days=day.weekday())
+        return day.replace(day=1)
+    
+    @staticmethod
+    def next_period_start(granularity: str, period_start: date) -> date:
+        """First day of the following period"""
+        if granularity == "weekly":
+            return period_start + timedelta(days=7)
+        if period_start.month == 12:
+            return period_start.replace(year=period_start.year + 1, month=1)
+        return period_start.replace(month=period_start.month + 1)
+    
+    @staticmethod
+    def materialize_period(db: Session, granularity: str, period_start: date) -> int:
+        """
+        Rebuild one period for all users. Does not commit, so the caller can
+        make the rewrite and the checkpoint update atomic.
+        Returns the number of rollup rows written.
+        """
+        model = ROLLUP_MODELS[granularity]
+        next_start = ReportRollupService.next_period_start(granularity, period_start)
+        period_end = next_start - timedelta(days=1)
+        
+        grams = MealFood.quantity_g / 100
+        source = (
+            select(
+                Meal.user_id,
+                literal(period_start, Date),
+                literal(period_end, Date),
+                func.count(func.distinct(func.date(Meal.meal_date))),
+                func.count(func.distinct(Meal.id)),
+                func.coalesce(func.sum(grams * Food.calories_per_100g), 0),
+                func.coalesce(func.sum(grams * Food.protein_per_100g), 0),
+                func.coalesce(func.sum(grams * Food.carbs_per_100g), 0),
+                func.coalesce(func.sum(grams * Food.fats_per_100g), 0),
+                func.coalesce(func.sum(grams * func.coalesce(Food.fiber_per_100g, 0)), 0),
+                func.coalesce(func.sum(grams * func.coalesce(Food.sugar_per_100g, 0)), 0),
+                func.coalesce(func.sum(grams * func.coalesce(Food.sodium_per_100g, 0)), 0)
+            )
+            .select_from(Meal)
+            .join(MealFood, MealFood.meal_id == Meal.id)
+            .join(Food, Food.id == MealFood.food_id)
+            .where(
+                Meal.meal_date >= datetime.combine(period_start, datetime.min.time()),
+                Meal.meal_date < datetime.combine(next_start, datetime.min.time())
+            )
+            .group_by(Meal.user_id)
+        )
+        
+        db.execute(delete(model).where(model.period_start == period_start))
+        result = db.execute(
+            insert(model).from_select(
+                [
+                    "user_id", "period_start", "period_end", "days_logged", "meal_count",
+                    "total_calories", "total_protein", "total_carbs", "total_fats",
+                    "total_fiber", "total_sugar", "total_sodium"
+                ],
+                source
+            )
+        )
+        return max(result.rowcount or 0, 0)
+    
+    @staticmethod
+    def run(
+        db: Session,
+        granularity: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        resume: bool = True
+    ) -> dict:
+        """
+        Materialize every period overlapping [start, end].
+        
+        Without an explicit start the run resumes after the checkpoint, or
+        from the first logged meal on a fresh database. end defaults to
+        yesterday. Only closed periods advance the checkpoint, so the
+        current week/month is rebuilt again on the next nightly run.
+        """
+        today = date.today()
+        end = end or today - timedelta(days=1)
+        checkpoint = db.get(ReportRollupCheckpoint, granularity)
+        
+        if start is None:
+            if resume and checkpoint:
+                start = ReportRollupService.next_period_start(granularity, checkpoint.last_period_start)
+            else:
+                earliest = db.execute(select(func.min(Meal.meal_date))).scalar()
+                start = earliest.date() if earliest else None
+        
+        stats = {"granularity": granularity, "periods": 0, "rows": 0, "seconds": 0.0}
+        run_started = time.perf_counter()
+        period = ReportRollupService.period_start(granularity, start) if start else None
+        
+        while period is not None and period <= end:
+            period_started = time.perf_counter()
+            rows = ReportRollupService.materialize_period(db, granularity, period)
+            next_start = ReportRollupService.next_period_start(granularity, period)
+            
+            closed = next_start <= today
+            if closed and (checkpoint is None or period > checkpoint.last_period_start):
+                checkpoint = db.merge(
+                    ReportRollupCheckpoint(granularity=granularity, last_period_start=period)
+                )
+            db.commit()
+            
+            elapsed = time.perf_counter() - period_started
+            stats["periods"] += 1
+            stats["rows"] += rows
+            logger.info(
+                "%s rollup %s: %d rows in %.3fs (%.0f rows/s)",
+                granularity, period.isoformat(), rows, elapsed, rows / elapsed if elapsed else 0.0
+            )
+            period = next_start
+        
+        stats["seconds"] = round(time.perf_counter() - run_started, 3)
+        stats["rows_per_second"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+        logger.info(
+            "%s rollup finished: %d periods, %d rows in %.3fs",
+            granularity, stats["periods"], stats["rows"], stats["seconds"]
+        )
+        return stats
@@ -2,12 +2,20 @@
 Report service - follows SOLID principles
 Single Responsibility: Handles daily report generation
 """
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from app.core.database import read_replica
 from app.models.report import DailyReport
 from app.models.meal import Meal
 from app.services.meal_service import MealService
+from app.services.preference_service import PreferenceService, PreferenceSnapshot
+from app.services.report_rollup_service import ROLLUP_MODELS
 
 
 class ReportService:
@@ -17,34 +25,32 @@ class ReportService:
     def generate_daily_report(
         db: Session,
         user_id: int,
-        report_date: datetime
+        report_date: datetime,
+        preferences: Optional[PreferenceSnapshot] = None
     ) -> DailyReport:
-        """Generate daily nutrition report"""
+        """Generate daily nutrition report; pass preferences if the caller already resolved them"""
         # Get all meals for the day
         start_date = report_date.replace(hour=0, minute=0, second=0)
         end_date = report_date.replace(hour=23, minute=59, second=59)
         
         meals = MealService.get_user_meals(db, user_id, start_date, end_date)
         
-        # Calculate totals
-        total_calories = 0.0
-        total_protein = 0.0
-        total_carbs = 0.0
-        total_fats = 0.0
-        total_fiber = 0.0
-        total_sugar = 0.0
-        total_sodium = 0.0
-        
-        for meal in meals:
-            nutrition = MealService.calculate_meal_nutrition(meal)
-            total_calories += nutrition["total_calories"]
-            total_protein += nutrition["total_protein"]
-            total_carbs += nutrition["total_carbs"]
-            total_fats += nutrition["total_fats"]
+        # Calculate totals for all of the day's meals in one batch
+        nutrition = MealService.calculate_batch_nutrition(
+            db,
+            MealService.fetch_nutrition_rows(db, [meal.id for meal in meals])
+        ).values()
+        total_calories = sum(n["total_calories"] for n in nutrition)
+        total_protein = sum(n["total_protein"] for n in nutrition)
+        total_carbs = sum(n["total_carbs"] for n in nutrition)
+        total_fats = sum(n["total_fats"] for n in nutrition)
+        total_fiber = sum(n["total_fiber"] for n in nutrition)
+        total_sugar = sum(n["total_sugar"] for n in nutrition)
+        total_sodium = sum(n["total_sodium"] for n in nutrition)
         
         # Get user preferences for comparison
-        from app.services.preference_service import PreferenceService
-        preferences = PreferenceService.get_user_preferences(db, user_id)
+        if preferences is None:
+            preferences = PreferenceService.get_user_preferences(db, user_id)
         
         # Generate analysis and recommendations
         analysis = ReportService._generate_analysis(
@@ -65,49 +71,91 @@ class ReportService:
             preferences
         )
         
-        # Create or update report
-        existing_report = db.query(DailyReport).filter(
-            DailyReport.user_id == user_id,
-            DailyReport.report_date >= start_date,
-            DailyReport.report_date <= end_date
-        ).first()
-        
-        if existing_report:
-            existing_report.total_calories = total_calories
-            existing_report.total_protein = total_protein
-            existing_report.total_carbs = total_carbs
-            existing_report.total_fats = total_fats
-            existing_report.analysis = analysis
-            existing_report.recommendations = recommendations
-            existing_report.motivation_message = motivation
-            db.commit()
-            db.refresh(existing_report)
-            return existing_report
-        else:
-            new_report = DailyReport(
-                user_id=user_id,
-                report_date=report_date,
-                total_calories=total_calories,
-                total_protein=total_protein,
-                total_carbs=total_carbs,
-                total_fats=total_fats,
-                total_fiber=total_fiber,
-                total_sugar=total_sugar,
-                total_sodium=total_sodium,
-                analysis=analysis,
-                recommendations=recommendations,
-                motivation_message=motivation
+        return ReportService._upsert_daily_report(db, {
+            "user_id": user_id,
+            "report_date": report_date,
+            "report_day": report_date.date(),
+            "total_calories": total_calories,
+            "total_protein": total_protein,
+            "total_carbs": total_carbs,
+            "total_fats": total_fats,
+            "total_fiber": total_fiber,
+            "total_sugar": total_sugar,
+            "total_sodium": total_sodium,
+            "analysis": analysis,
+            "recommendations": recommendations,
+            "motivation_message": motivation
+        })
+    
+    @staticmethod
+    def _upsert_daily_report(db: Session, values: dict) -> DailyReport:
+        """
+        Insert or overwrite the report for (user_id, report_day) in one statement
+        on MySQL, SQLite and PostgreSQL, or with a row lock elsewhere.
+        
+        Relies on the uq_daily_reports_user_day key, so concurrent generations
+        for the same day converge on a single row instead of racing.
+        """
+        updates = {
+            key: value for key, value in values.items()
+            if key not in ("user_id", "report_day", "report_date")
+        }
+        dialect = db.get_bind().dialect.name
+        
+        if dialect == "mysql":
+            stmt = mysql_insert(DailyReport).values(**values)
+            stmt = stmt.on_duplicate_key_update(**updates, updated_at=func.now())
+        elif dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+            stmt = dialect_insert(DailyReport).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "report_day"],
+                set_={**updates, "updated_at": func.now()}
             )
-            db.add(new_report)
-            db.commit()
-            db.refresh(new_report)
-            return new_report
+        else:
+            return ReportService._lock_and_write_daily_report(db, values, updates)
+        
+        db.execute(stmt)
+        db.commit()
+        return db.query(DailyReport).filter(
+            DailyReport.user_id == values["user_id"],
+            DailyReport.report_day == values["report_day"]
+        ).populate_existing().one()
+    
+    @staticmethod
+    def _lock_and_write_daily_report(db: Session, values: dict, updates: dict) -> DailyReport:
+        """
+        Upsert fallback for dialects without an upsert statement: lock the row
+        with SELECT ... FOR UPDATE and update it, or insert it. A concurrent
+        insert of the same day fails the unique key, so retry once as an update.
+        """
+        for attempt in range(2):
+            report = db.query(DailyReport).filter(
+                DailyReport.user_id == values["user_id"],
+                DailyReport.report_day == values["report_day"]
+            ).with_for_update().populate_existing().one_or_none()
+            if report is None:
+                report = DailyReport(**values)
+                db.add(report)
+            else:
+                for key, value in updates.items():
+                    setattr(report, key, value)
+                report.updated_at = func.now()
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+                continue
+            db.refresh(report)
+            return report
     
     @staticmethod
     def _generate_analysis(
         total_calories: float,
         total_protein: float,
-        preferences: Optional
+        preferences: Optional[PreferenceSnapshot]
     ) -> str:
         """Generate analysis text"""
         if not preferences:
@@ -140,7 +188,7 @@ class ReportService:
     def _generate_recommendations(
         total_calories: float,
         total_protein: float,
-        preferences: Optional
+        preferences: Optional[PreferenceSnapshot]
     ) -> str:
         """Generate recommendations"""
         recommendations = []
@@ -163,7 +211,7 @@ class ReportService:
     def _generate_motivation_message(
         total_calories: float,
         total_protein: float,
-        preferences: Optional
+        preferences: Optional[PreferenceSnapshot]
     ) -> str:
         """Generate motivation message"""
         messages = [
@@ -196,5 +244,24 @@ class ReportService:
         if end_date:
             query = query.filter(DailyReport.report_date <= end_date)
         
-        return query.order_by(DailyReport.report_date.desc()).all()
-
+        with read_replica(db):
+            return query.order_by(DailyReport.report_date.desc()).all()
+    
+    @staticmethod
+    def get_period_reports(
+        db: Session,
+        user_id: int,
+        granularity: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List:
+        """Get user's materialized weekly or monthly reports within date range"""
+        model = ROLLUP_MODELS[granularity]
+        query = db.query(model).filter(model.user_id == user_id)
+        
+        if start_date:
+            query = query.filter(model.period_end >= start_date)
+        if end_date:
+            query = query.filter(model.period_start <= end_date)
+        
+        return query.order_by(model.period_start.desc()).all()
@@ -8,6 +8,7 @@ from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import get_password_hash, verify_password
 from app.core.redis_client import CacheService
+from app.core.cache_keys import CacheKeys
 
 
 class UserService:
@@ -35,7 +36,7 @@ class UserService:
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> Optional[User]:
         """Get user by email"""
-        cache_key = f"user:email:{email}"
+        cache_key = CacheKeys.user_by_email(email)
         cached_user = CacheService.get(cache_key)
         if cached_user:
             return db.query(User).filter(User.id == cached_user["id"]).first()
@@ -48,7 +49,7 @@ class UserService:
     @staticmethod
     def get_user_by_username(db: Session, username: str) -> Optional[User]:
         """Get user by username"""
-        cache_key = f"user:username:{username}"
+        cache_key = CacheKeys.user_by_username(username)
         cached_user = CacheService.get(cache_key)
         if cached_user:
             return db.query(User).filter(User.id == cached_user["id"]).first()
@@ -61,7 +62,7 @@ class UserService:
     @staticmethod
     def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        cache_key = f"user:id:{user_id}"
+        cache_key = CacheKeys.user_by_id(user_id)
         cached_user = CacheService.get(cache_key)
         if cached_user:
             return db.query(User).filter(User.id == user_id).first()
@@ -0,0 +1,122 @@
+"""
+Benchmark: per-meal Python totals vs the vectorized batch calculator
+
+Sums nutrition for many (meal_id, food_id, quantity_g) rows, as the daily
+report and meal lists do.
+
+- loop:    one Python pass per row against a dict of food densities, as
+           calculate_meal_nutrition does per meal
+- rows:    MealService-style input (a list of row tuples) through
+           CatalogSnapshot.batch_nutrition, including the array conversion
+- arrays:  the same rows already held as NumPy arrays
+- kernel:  meal_totals alone (gather, multiply, np.add.reduceat), without
+           building the per-meal dicts
+
+Foods come from a real catalog snapshot published to a temporary directory.
+
+Usage:
+    cd backend
+    python -m benchmarks.batch_nutrition [--rows 100000] [--foods-per-meal 4]
+"""
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models import Food
+from app.services.food_catalog import NUTRIENT_FIELDS, NUTRITION_FIELDS, FoodCatalog, meal_totals
+
+
+def build_snapshot(directory: str, food_count: int, rng: random.Random):
+    """Publish a catalog of random foods"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        Food(name=f"Food {i}", **{field: round(rng.uniform(0, 100), 2) for field in NUTRIENT_FIELDS})
+        for i in range(food_count)
+    ])
+    db.commit()
+    snapshot = FoodCatalog(directory).publish(db)
+    db.close()
+    return snapshot
+
+
+def build_rows(row_count: int, foods_per_meal: int, food_count: int, rng: random.Random):
+    """(meal_id, food_id, quantity_g) rows grouped by meal"""
+    return [
+        (i // foods_per_meal + 1, rng.randint(1, food_count), round(rng.uniform(30, 400), 2))
+        for i in range(row_count)
+    ]
+
+
+def totals_loop(rows, densities) -> dict:
+    """Per-row Python arithmetic"""
+    totals = {}
+    for meal_id, food_id, quantity in rows:
+        multiplier = quantity / 100.0
+        t = totals.setdefault(meal_id, [0.0] * len(NUTRITION_FIELDS))
+        for i, density in enumerate(densities[food_id]):
+            t[i] += density * multiplier
+    return {meal_id: dict(zip(NUTRITION_FIELDS, (round(v, 2) for v in t))) for meal_id, t in totals.items()}
+
+
+def totals_rows(rows, snapshot) -> dict:
+    """Row tuples converted to arrays, then batched"""
+    meal_ids, food_ids, quantities = (np.asarray(column) for column in zip(*rows))
+    return snapshot.batch_nutrition(meal_ids, food_ids, quantities)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--foods-per-meal", type=int, default=4)
+    parser.add_argument("--foods", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = build_snapshot(directory, args.foods, rng)
+        rows = build_rows(args.rows, args.foods_per_meal, args.foods, rng)
+        densities = {int(food_id): snapshot.nutrients[i].tolist() for i, food_id in enumerate(snapshot.ids)}
+        arrays = [np.asarray(column) for column in zip(*rows)]
+        positions = snapshot.positions(arrays[1])
+        
+        variants = (
+            ("loop", lambda: totals_loop(rows, densities)),
+            ("rows", lambda: totals_rows(rows, snapshot)),
+            ("arrays", lambda: snapshot.batch_nutrition(*arrays)),
+            ("kernel", lambda: meal_totals(arrays[0], positions, arrays[2], snapshot.nutrients))
+        )
+        expected = variants[0][1]()
+        meal_count = len(expected)
+        print(f"{args.rows} rows, {meal_count} meals, best of {args.repeat}")
+        print(f"{'variant':<10}{'total (ms)':>12}{'per meal (us)':>16}")
+        for name, run in variants:
+            result = run()
+            if isinstance(result, tuple):
+                result = {
+                    meal_id: dict(zip(NUTRITION_FIELDS, row))
+                    for meal_id, row in zip(result[0].tolist(), result[1].tolist())
+                }
+            mismatched = sum(
+                1 for meal_id, totals in expected.items()
+                if any(abs(totals[field] - result[meal_id][field]) > 0.011 for field in NUTRITION_FIELDS)
+            )
+            best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+            note = f"  ({mismatched} meals differ)" if mismatched else ""
+            print(f"{name:<10}{best * 1e3:>12.2f}{best * 1e6 / meal_count:>16.2f}{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: bytes and time per cached MealResponse
+
+Encodes a meal (Decimal nutrients and datetimes, as read from the ORM) with
+every cache codec and compression and reports the stored size, the encode
+time, and the time to decode it back into a typed MealResponse. "legacy" is
+the previous json.dumps(default=str) path, which decodes to untyped dicts
+with Decimals as strings.
+
+Usage:
+    cd backend
+    python -m benchmarks.cache_codec [--foods-per-meal 3] [--meals 1] [--number 2000]
+"""
+import argparse
+import json
+import os
+import random
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from typing import List
+from app.core import cache_codec
+from app.schemas.food import MealResponse
+
+
+def build_meals(meal_count: int, foods_per_meal: int) -> List[dict]:
+    """Meals shaped like MealResponse, with the column types the ORM returns"""
+    rng = random.Random(42)
+    
+    def nutrient(low: float, high: float) -> Decimal:
+        return Decimal(f"{rng.uniform(low, high):.2f}")
+    
+    start = datetime(2024, 1, 1, 8, 0)
+    return [
+        {
+            "id": meal_id,
+            "meal_type": "lunch",
+            "meal_date": start + timedelta(hours=6 * meal_id),
+            "notes": "Post-workout",
+            "meal_foods": [
+                {
+                    "id": meal_id * foods_per_meal + i,
+                    "food_id": food_id,
+                    "quantity_g": nutrient(30, 400),
+                    "food": {
+                        "id": food_id,
+                        "name": f"Food {food_id}",
+                        "description": f"Benchmark food {food_id}",
+                        "calories_per_100g": nutrient(20, 600),
+                        "protein_per_100g": nutrient(0, 40),
+                        "carbs_per_100g": nutrient(0, 80),
+                        "fats_per_100g": nutrient(0, 50),
+                        "fiber_per_100g": nutrient(0, 10),
+                        "sugar_per_100g": nutrient(0, 30),
+                        "sodium_per_100g": nutrient(0, 800)
+                    }
+                }
+                for i, food_id in enumerate(rng.sample(range(1, 201), foods_per_meal))
+            ],
+            "total_calories": float(nutrient(100, 1200)),
+            "total_protein": float(nutrient(0, 80)),
+            "total_carbs": float(nutrient(0, 150)),
+            "total_fats": float(nutrient(0, 80))
+        }
+        for meal_id in range(meal_count)
+    ]
+
+
+def time_us(fn, number: int) -> float:
+    """Best-of-5 microseconds per call"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--foods-per-meal", type=int, default=3)
+    parser.add_argument("--meals", type=int, default=1, help="meals per cached value (a meal list page)")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    
+    meals = build_meals(args.meals, args.foods_per_meal)
+    model = List[MealResponse]
+    number = max(1, args.number // args.meals)
+    print(f"{args.meals} meal(s) x {args.foods_per_meal} foods per value, figures per meal")
+    print(f"{'codec':<10}{'compression':<13}{'bytes':>8}{'encode (us)':>13}{'decode (us)':>13}")
+    
+    legacy = json.dumps(meals, default=str)
+    print(
+        f"{'legacy':<10}{'-':<13}{len(legacy.encode()) / args.meals:>8.0f}"
+        f"{time_us(lambda: json.dumps(meals, default=str), number) / args.meals:>13.1f}"
+        f"{time_us(lambda: json.loads(legacy), number) / args.meals:>13.1f}"
+    )
+    for codec in cache_codec.CODECS:
+        if cache_codec.get_codec(codec).name != codec:
+            print(f"{codec:<10}not installed")
+            continue
+        for compression in cache_codec.COMPRESSIONS:
+            data = cache_codec.encode(meals, codec=codec, compression=compression, min_bytes=0)
+            encode_us = time_us(
+                lambda: cache_codec.encode(meals, codec=codec, compression=compression, min_bytes=0),
+                number
+            )
+            decode_us = time_us(lambda: cache_codec.decode(data, model), number)
+            print(
+                f"{codec:<10}{compression:<13}{len(data) / args.meals:>8.0f}"
+                f"{encode_us / args.meals:>13.1f}{decode_us / args.meals:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
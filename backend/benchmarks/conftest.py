@@ -0,0 +1,232 @@
+"""
+pytest-benchmark fixtures for the service hot paths
+
+Runs offline: each dataset size is an in-memory SQLite database with a
+published food catalog snapshot, and Redis is replaced by tests.fakes.FakeRedis.
+
+Median timings are compared with baseline.json relative to test_calibration,
+a fixed workload run in the same session, so the baseline carries across
+machines: each entry is a benchmark's median divided by the calibration
+median. A benchmark whose ratio is more than the threshold (a fraction,
+0.3 = 30%) above its baseline fails the run. Re-record the baseline with
+--save-baseline after an intended change. Runs that skip the calibration
+(e.g. with -k) are not compared. Shared or throttled machines still add
+noise of their own, so gate merges on a dedicated runner.
+
+Usage:
+    cd backend
+    python -m pytest benchmarks
+    python -m pytest benchmarks --save-baseline
+    python -m pytest benchmarks --regression-threshold 0.5
+    python -m pytest benchmarks --benchmark-disable      # run once, as smoke tests
+"""
+import json
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core import redis_client as redis_module
+from app.core.database import Base
+from app.core import cache_keys
+from app.core.redis_client import cache_breaker
+from app.core.security import get_password_hash
+from app.models import User, Food, Meal, MealFood, UserPreference, DietaryRestriction
+from app.models.meal import MealType
+from app.services.food_catalog import food_catalog
+from tests.fakes import FakeRedis
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+CALIBRATION = "test_calibration"
+RESULTS_KEY = pytest.StashKey[Dict[str, float]]()
+
+# users, foods, days of history, meals per day, foods per meal
+SIZES = {
+    "small": (10, 200, 7, 3, 3),
+    "medium": (1000, 2000, 30, 6, 4),
+    "large": (10000, 10000, 90, 12, 6),
+}
+FOOD_NAMES = ["Chicken Breast", "Brown Rice", "Salmon", "Greek Yogurt", "Oatmeal", "Tofu", "Lentils", "Beef Steak", "Eggs", "Broccoli"]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("hot path baseline")
+    group.addoption("--save-baseline", action="store_true", help="Write this run's medians to baseline.json")
+    group.addoption("--regression-threshold", type=float, default=None, help="Allowed slowdown over the baseline median")
+
+
+def pytest_configure(config):
+    config.stash[RESULTS_KEY] = {}
+
+
+@pytest.fixture(autouse=True)
+def record_median(request):
+    """Keep each benchmark's median for the baseline comparison"""
+    yield
+    benchmark = request.node.funcargs.get("benchmark")
+    if benchmark is not None and benchmark.stats is not None:
+        request.config.stash[RESULTS_KEY][request.node.name] = benchmark.stats.stats.median
+
+
+def relative_medians(results: Dict[str, float]) -> Dict[str, float]:
+    """Each benchmark's median divided by the calibration median of the same run"""
+    calibration = results.get(CALIBRATION)
+    if not calibration:
+        return {}
+    return {name: median / calibration for name, median in results.items() if name != CALIBRATION}
+
+
+def compare(config) -> list:
+    """(name, baseline, relative median, slowdown) for every benchmark slower than the threshold allows"""
+    if not BASELINE_FILE.exists():
+        return []
+    baseline = json.loads(BASELINE_FILE.read_text())
+    threshold = config.getoption("--regression-threshold")
+    if threshold is None:
+        threshold = baseline["threshold"]
+    regressions = []
+    for name, relative in sorted(relative_medians(config.stash[RESULTS_KEY]).items()):
+        expected = baseline["relative_medians"].get(name)
+        if expected and relative > expected * (1 + threshold):
+            regressions.append((name, expected, relative, relative / expected))
+    return regressions
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash[RESULTS_KEY]
+    if not results:
+        return
+    if config.getoption("--save-baseline"):
+        relative = relative_medians(results)
+        if not relative:
+            return
+        threshold = json.loads(BASELINE_FILE.read_text())["threshold"] if BASELINE_FILE.exists() else 0.3
+        BASELINE_FILE.write_text(json.dumps(
+            {
+                "threshold": threshold,
+                "calibration": CALIBRATION,
+                "relative_medians": {name: round(value, 6) for name, value in sorted(relative.items())}
+            },
+            indent=2
+        ) + "\n")
+    elif compare(config) and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash[RESULTS_KEY]
+    if not results:
+        return
+    if CALIBRATION not in results:
+        terminalreporter.write_line(f"{CALIBRATION} did not run; medians were not compared with {BASELINE_FILE.name}")
+        return
+    if config.getoption("--save-baseline"):
+        terminalreporter.write_line(f"Saved {len(results) - 1} relative medians to {BASELINE_FILE}")
+        return
+    regressions = compare(config)
+    if regressions:
+        terminalreporter.section("benchmark regressions", red=True)
+        for name, expected, relative, slowdown in regressions:
+            terminalreporter.write_line(
+                f"{name}: {relative:.4f}x calibration vs baseline {expected:.4f}x ({slowdown:.2f}x slower)"
+            )
+
+
+@pytest.fixture(scope="session")
+def fake_redis():
+    """Redis replaced with an in-memory fake for the whole run"""
+    fake = FakeRedis()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(redis_module, "redis_client", fake)
+        cache_breaker.reset()
+        cache_keys.forget_generations()
+        yield fake
+
+
+@pytest.fixture
+def cold_cache(fake_redis):
+    """Callable that empties the cache, for benchmarks of the miss path"""
+    def flush() -> None:
+        fake_redis.flushall()
+        fake_redis.calls.clear()
+        cache_keys.forget_generations()
+    
+    flush()
+    return flush
+
+
+def seed(db, users: int, foods: int, days: int, meals_per_day: int, foods_per_meal: int) -> User:
+    """Foods, users and one user's meal history; returns that user"""
+    rng = random.Random(42)
+    db.add_all([
+        Food(
+            name=f"{FOOD_NAMES[i % len(FOOD_NAMES)]} {i}",
+            calories_per_100g=round(rng.uniform(20, 600), 1),
+            protein_per_100g=round(rng.uniform(0, 35), 1),
+            carbs_per_100g=round(rng.uniform(0, 80), 1),
+            fats_per_100g=round(rng.uniform(0, 50), 1),
+            fiber_per_100g=round(rng.uniform(0, 10), 1),
+            sugar_per_100g=round(rng.uniform(0, 20), 1),
+            sodium_per_100g=round(rng.uniform(0, 500), 1)
+        )
+        for i in range(foods)
+    ])
+    password_hash = get_password_hash("benchmark")
+    db.add_all([
+        User(email=f"user{i}@example.com", username=f"user{i}", hashed_password=password_hash, full_name=f"User {i}")
+        for i in range(users)
+    ])
+    db.flush()
+    user = db.query(User).filter(User.username == "user0").one()
+    preference = UserPreference(user_id=user.id, target_calories=2200.0, target_protein=140.0)
+    preference.dietary_restrictions = [DietaryRestriction(restriction_type="vegetarian")]
+    db.add(preference)
+    
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    meal_types = list(MealType)
+    for day in range(days):
+        for slot in range(meals_per_day):
+            meal = Meal(
+                user_id=user.id,
+                meal_type=meal_types[slot % len(meal_types)],
+                meal_date=today - timedelta(days=day) + timedelta(hours=7 + slot * 14 / meals_per_day)
+            )
+            meal.meal_foods = [
+                MealFood(food_id=rng.randint(1, foods), quantity_g=round(rng.uniform(30, 300), 1))
+                for _ in range(foods_per_meal)
+            ]
+            db.add(meal)
+    db.commit()
+    return user
+
+
+@pytest.fixture(scope="session", params=list(SIZES))
+def dataset(request, fake_redis):
+    """A seeded in-memory database per size, with its food catalog published"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    user = seed(db, *SIZES[request.param])
+    
+    with tempfile.TemporaryDirectory() as directory, pytest.MonkeyPatch.context() as patch:
+        patch.setattr(food_catalog, "directory", Path(directory))
+        patch.setattr(food_catalog, "_snapshot", None)
+        patch.setattr(food_catalog, "_checked_at", float("-inf"))
+        patch.setattr(food_catalog, "_published_at", float("-inf"))
+        patch.setattr(food_catalog, "_verified", False)
+        patch.setattr(food_catalog, "_stale_version", None)
+        patch.setattr(food_catalog, "session_factory", None)
+        food_catalog.publish(db)
+        yield {"size": request.param, "db": db, "user_id": user.id}
+        db.close()
+        engine.dispose()
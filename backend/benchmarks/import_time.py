@@ -0,0 +1,108 @@
+"""
+Benchmark: import cost of the application
+
+Imports a module in a fresh interpreter under `python -X importtime` and
+reports the packages with the largest cumulative import time. With --check
+the run fails if the total exceeds the budget in import_budget.json or a
+module listed there as forbidden (langchain, openai, ...) was imported;
+tests/test_import_budget.py enforces the same budget. The budget is about
+1.5x the time measured on the reference machine recorded next to it;
+re-measure and update both together.
+
+Usage:
+    cd backend
+    python -m benchmarks.import_time [--top 25] [--check]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "import_budget.json"
+
+
+def load_budget() -> dict:
+    """Read the committed import budget"""
+    return json.loads(BUDGET_FILE.read_text())
+
+
+def measure_imports(module: str) -> Dict[str, dict]:
+    """
+    Import module in a fresh interpreter and return
+    {module: {"self_us": int, "cumulative_us": int, "depth": int}}
+    for every module that was imported.
+    """
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "import-time-secret-key")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    modules: Dict[str, dict] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        stripped = name.lstrip()
+        modules[stripped] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(stripped) - 1) // 2
+        }
+    return modules
+
+
+def budget_violations(modules: Dict[str, dict], budget: dict) -> List[str]:
+    """Describe every way the import breaks the budget"""
+    violations = []
+    total_ms = modules[budget["module"]]["cumulative_us"] / 1000
+    if total_ms > budget["max_cumulative_ms"]:
+        violations.append(
+            f"import {budget['module']} took {total_ms:.0f}ms "
+            f"(budget {budget['max_cumulative_ms']}ms)"
+        )
+    for forbidden in budget["forbidden_modules"]:
+        loaded = sorted(m for m in modules if m == forbidden or m.startswith(forbidden + "."))
+        if loaded:
+            violations.append(f"{forbidden} is imported eagerly ({len(loaded)} modules)")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default=None, help="defaults to the module in import_budget.json")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    
+    budget = load_budget()
+    module = args.module or budget["module"]
+    modules = measure_imports(module)
+    
+    # Top-level packages only, so numpy's 100 submodules show up as one row
+    packages = {name: stats for name, stats in modules.items() if "." not in name}
+    total_ms = modules[module]["cumulative_us"] / 1000
+    print(f"import {module}: {total_ms:.0f}ms cumulative, {len(modules)} modules")
+    print(f"{'package':<40}{'cumulative (ms)':>18}{'self (ms)':>12}")
+    ranked = sorted(packages.items(), key=lambda item: item[1]["cumulative_us"], reverse=True)
+    for name, stats in ranked[:args.top]:
+        print(f"{name:<40}{stats['cumulative_us'] / 1000:>18.1f}{stats['self_us'] / 1000:>12.1f}")
+    
+    if args.check:
+        violations = budget_violations(modules, dict(budget, module=module))
+        for violation in violations:
+            print(f"BUDGET EXCEEDED: {violation}")
+        sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Load test: replay realistic user sessions against the API
+
+Each virtual user loops over sessions as one of the users created by
+scripts/generate_load_data.py: log in, then 2-8 actions picked with weights
+that follow what the frontend does:
+
+- dashboard:        today's report, today's meals and the profile
+- log_meal:         search as the user types, then log a meal from the results
+- search:           browse the catalog, then search it
+- recommendations:  personalized recommendations
+- history:          saved, weekly and monthly reports, and goal progress
+
+Actions are separated by think time (exponential with mean --think-time;
+0 runs a closed loop at full speed). Latency is recorded per route, and
+the run reports throughput, errors and p50/p90/p95/p99 latency for each.
+--asgi drives app.main in-process (same DATABASE_URL) instead of a server
+over the network, as a smoke test of the scenarios.
+
+Usage:
+    cd backend
+    python -m benchmarks.load_test --base-url http://localhost:8000 --users 10000 --concurrency 200 --duration 300
+    python -m benchmarks.load_test --asgi --users 100 --concurrency 10 --duration 20 --think-time 0
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+
+import httpx
+import numpy as np
+
+API = "/api/v1"
+# Substrings of the generator's base food names
+SEARCH_TERMS = ["chicken", "rice", "salmon", "yogurt", "oat", "banana", "egg", "tofu", "pasta", "apple", "quinoa", "potato"]
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Stats:
+    """Latencies and failures per route"""
+    
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+    
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+    
+    def summary(self, elapsed: float) -> dict:
+        """Throughput and latency percentiles (ms) per route"""
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            values = np.array(samples) * 1000
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors.get(route, 0),
+                "rps": round(len(samples) / elapsed, 2),
+                **{f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+                "max": round(float(values.max()), 2)
+            }
+        total = sum(route["requests"] for route in routes.values())
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "requests": total,
+            "errors": sum(route["errors"] for route in routes.values()),
+            "rps": round(total / elapsed, 2),
+            "routes": routes
+        }
+
+
+class VirtualUser:
+    """One simulated client, logged in as a generated user"""
+    
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, args, rng: random.Random):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.rng = rng
+        self.headers = {}
+    
+    async def request(self, method: str, route: str, path: str = None, **kwargs):
+        """Send one request and record it under its route; None on a transport error"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, API + (path or route), headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(f"{method} {route}", time.perf_counter() - start, False)
+            return None
+        self.stats.record(f"{method} {route}", time.perf_counter() - start, response.status_code < 400)
+        return response if response.status_code < 400 else None
+    
+    async def think(self) -> None:
+        if self.args.think_time > 0:
+            await asyncio.sleep(self.rng.expovariate(1.0 / self.args.think_time))
+    
+    async def login(self) -> bool:
+        username = f"{self.args.prefix}_{self.rng.randrange(self.args.users)}"
+        self.headers = {}
+        response = await self.request("POST", "/auth/login", json={"username": username, "password": self.args.password})
+        if response is None:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+    
+    async def dashboard(self) -> None:
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        await self.request("GET", "/reports/today")
+        await self.request("GET", "/meals/", params={"start_date": today.isoformat()})
+        await self.request("GET", "/users/me")
+    
+    async def log_meal(self) -> None:
+        term = self.rng.choice(SEARCH_TERMS)
+        results = []
+        for length in range(3, len(term) + 1, 2):
+            response = await self.request("GET", "/foods/search", params={"q": term[:length], "limit": 10})
+            results = response.json() if response is not None else []
+        if not results:
+            return
+        await self.think()
+        foods = self.rng.sample(results, min(len(results), self.rng.randint(1, 4)))
+        await self.request("POST", "/meals/", json={
+            "meal_type": self.rng.choice(MEAL_TYPES),
+            "meal_date": datetime.now().isoformat(),
+            "foods": [{"food_id": food["id"], "quantity_g": round(self.rng.lognormvariate(4.8, 0.5), 1)} for food in foods]
+        })
+    
+    async def search(self) -> None:
+        await self.request("GET", "/foods/", params={"limit": 20})
+        await self.request("GET", "/foods/search", params={"q": self.rng.choice(SEARCH_TERMS), "limit": 10})
+    
+    async def recommendations(self) -> None:
+        await self.request("GET", "/recommender/recommendations")
+    
+    async def history(self) -> None:
+        await self.request("GET", "/reports/")
+        await self.request("GET", "/reports/weekly")
+        await self.request("GET", "/reports/monthly")
+        await self.request("GET", "/goals/progress")
+    
+    async def run(self, deadline: float) -> None:
+        """Sessions until the deadline"""
+        actions = [self.dashboard, self.log_meal, self.search, self.recommendations, self.history]
+        weights = [0.35, 0.25, 0.2, 0.1, 0.1]
+        while time.perf_counter() < deadline:
+            if not await self.login():
+                await self.think()
+                continue
+            for _ in range(self.rng.randint(2, 8)):
+                if time.perf_counter() >= deadline:
+                    return
+                await self.think()
+                await self.rng.choices(actions, weights)[0]()
+
+
+async def run_load(args) -> dict:
+    """Start --concurrency virtual users over --ramp-up seconds and run them for --duration"""
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.asgi:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+    else:
+        app = None
+        transport = None
+        base_url = args.base_url
+    
+    async def start(client: httpx.AsyncClient) -> dict:
+        started = time.perf_counter()
+        deadline = started + args.ramp_up + args.duration
+        
+        async def user(index: int) -> None:
+            await asyncio.sleep(args.ramp_up * index / args.concurrency)
+            await VirtualUser(client, stats, args, random.Random(args.seed + index)).run(deadline)
+        
+        await asyncio.gather(*(user(index) for index in range(args.concurrency)))
+        return stats.summary(time.perf_counter() - started)
+    
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=args.timeout) as client:
+        if app is None:
+            return await start(client)
+        async with app.router.lifespan_context(app):
+            return await start(client)
+
+
+def print_summary(summary: dict) -> None:
+    print(f"{summary['requests']} requests in {summary['elapsed_s']}s: {summary['rps']} req/s, {summary['errors']} errors")
+    header = "".join(f"{'p' + str(p) + ' ms':>10}" for p in PERCENTILES)
+    print(f"{'route':<34}{'requests':>9}{'errors':>8}{'req/s':>9}{header}{'max ms':>10}")
+    for route, row in summary["routes"].items():
+        values = "".join(f"{row[f'p{p}']:>10.1f}" for p in PERCENTILES)
+        print(f"{route:<34}{row['requests']:>9}{row['errors']:>8}{row['rps']:>9.1f}{values}{row['max']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--asgi", action="store_true", help="Run app.main in-process instead of over the network")
+    parser.add_argument("--users", type=int, default=10_000, help="Generated users to log in as (<prefix>_0 ...)")
+    parser.add_argument("--prefix", default="load")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--concurrency", type=int, default=50, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=10.0)
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between actions")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Also write the summary as JSON to this file")
+    args = parser.parse_args()
+    
+    summary = asyncio.run(run_load(args))
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(summary, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
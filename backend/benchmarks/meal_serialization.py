@@ -0,0 +1,174 @@
+"""
+Benchmark: meal response serialization for a user with many meals
+
+Compares the legacy path (ORM lazy loads -> nested dicts -> MealResponse ->
+response_model re-validation -> JSON) with MealSerializer + FastJSONResponse.
+
+Usage:
+    cd backend
+    python -m benchmarks.meal_serialization [--meals 1000] [--foods-per-meal 3]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.core.responses import FastJSONResponse
+from app.models import User, Food, Meal, MealFood
+from app.models.meal import MealType
+from app.schemas.food import MealResponse
+from app.services.meal_serializer import MealSerializer
+
+
+def build_session(meal_count: int, foods_per_meal: int):
+    """Create an in-memory database seeded with one user's meal history"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    
+    rng = random.Random(42)
+    user = User(email="bench@example.com", username="bench", hashed_password="x")
+    db.add(user)
+    foods = [
+        Food(
+            name=f"Food {i}",
+            description=f"Benchmark food {i}",
+            calories_per_100g=rng.uniform(20, 600),
+            protein_per_100g=rng.uniform(0, 40),
+            carbs_per_100g=rng.uniform(0, 80),
+            fats_per_100g=rng.uniform(0, 50),
+            fiber_per_100g=rng.uniform(0, 10),
+            sugar_per_100g=rng.uniform(0, 30),
+            sodium_per_100g=rng.uniform(0, 800)
+        )
+        for i in range(200)
+    ]
+    db.add_all(foods)
+    db.flush()
+    
+    start = datetime(2024, 1, 1)
+    meal_types = list(MealType)
+    for i in range(meal_count):
+        meal = Meal(
+            user_id=user.id,
+            meal_type=meal_types[i % len(meal_types)],
+            meal_date=start + timedelta(hours=6 * i)
+        )
+        db.add(meal)
+        db.flush()
+        for food in rng.sample(foods, foods_per_meal):
+            db.add(MealFood(meal_id=meal.id, food_id=food.id, quantity_g=rng.uniform(30, 400)))
+    db.commit()
+    meal_ids = [m.id for m in db.query(Meal).order_by(Meal.meal_date.desc()).all()]
+    return db, meal_ids
+
+
+def legacy_path(db, meal_ids: List[int]) -> bytes:
+    """Reproduces the pre-serializer endpoint code path"""
+    meals = db.query(Meal).filter(Meal.id.in_(meal_ids)).all()
+    responses = []
+    for meal in meals:
+        totals = {"total_calories": 0.0, "total_protein": 0.0, "total_carbs": 0.0, "total_fats": 0.0}
+        for mf in meal.meal_foods:
+            multiplier = float(mf.quantity_g) / 100.0
+            totals["total_calories"] += float(mf.food.calories_per_100g) * multiplier
+            totals["total_protein"] += float(mf.food.protein_per_100g) * multiplier
+            totals["total_carbs"] += float(mf.food.carbs_per_100g) * multiplier
+            totals["total_fats"] += float(mf.food.fats_per_100g) * multiplier
+        responses.append(MealResponse(
+            id=meal.id,
+            meal_type=meal.meal_type.value,
+            meal_date=meal.meal_date,
+            notes=meal.notes,
+            meal_foods=[
+                {
+                    "id": mf.id,
+                    "food_id": mf.food_id,
+                    "quantity_g": mf.quantity_g,
+                    "food": {
+                        "id": mf.food.id,
+                        "name": mf.food.name,
+                        "description": mf.food.description,
+                        "calories_per_100g": mf.food.calories_per_100g,
+                        "protein_per_100g": mf.food.protein_per_100g,
+                        "carbs_per_100g": mf.food.carbs_per_100g,
+                        "fats_per_100g": mf.food.fats_per_100g,
+                        "fiber_per_100g": mf.food.fiber_per_100g,
+                        "sugar_per_100g": mf.food.sugar_per_100g,
+                        "sodium_per_100g": mf.food.sodium_per_100g
+                    }
+                }
+                for mf in meal.meal_foods
+            ],
+            **{k: round(v, 2) for k, v in totals.items()}
+        ))
+    # FastAPI re-validates the return value against response_model
+    validated = TypeAdapter(List[MealResponse]).validate_python(
+        [r.model_dump() for r in responses]
+    )
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def serializer_path(db, meal_ids: List[int]) -> bytes:
+    """MealSerializer + FastJSONResponse"""
+    return FastJSONResponse(MealSerializer.serialize_meals(db, meal_ids)).body
+
+
+def measure(fn, db, meal_ids, repeat: int):
+    """Return (best seconds, peak bytes, allocated blocks) for fn"""
+    timings = []
+    for _ in range(repeat):
+        db.expunge_all()
+        gc.collect()
+        start = time.perf_counter()
+        fn(db, meal_ids)
+        timings.append(time.perf_counter() - start)
+    
+    db.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn(db, meal_ids)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return min(timings), peak, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meals", type=int, default=1000)
+    parser.add_argument("--foods-per-meal", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    db, meal_ids = build_session(args.meals, args.foods_per_meal)
+    print(f"{args.meals} meals x {args.foods_per_meal} foods, best of {args.repeat}")
+    print(f"{'path':<12}{'time (ms)':>12}{'peak (KiB)':>14}{'live blocks':>14}")
+    for name, fn in (("legacy", legacy_path), ("serializer", serializer_path)):
+        seconds, peak, blocks = measure(fn, db, meal_ids, args.repeat)
+        print(f"{name:<12}{seconds * 1000:>12.1f}{peak / 1024:>14.0f}{blocks:>14}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: per-meal nutrition cost with Decimal vs float nutrient columns
+
+Loads (meal, quantity, nutrient densities) rows for many meals and totals
+them per meal, as calculate_meal_nutrition and the daily report do.
+
+- decimal: columns read as Numeric(10, 2) (the old schema), totals in Decimal
+- mixed:   Numeric columns converted with float() per value, as the code had
+           to do to avoid Decimal/float TypeErrors
+- float:   the current Double columns, native float arithmetic
+
+The Numeric variants reuse the same table and coerce the result type, so
+only the column representation differs between runs.
+
+Usage:
+    cd backend
+    python -m benchmarks.nutrient_math [--meals 5000] [--foods-per-meal 4]
+"""
+import argparse
+import os
+import random
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import Numeric, create_engine, select, type_coerce
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models import Food, Meal, MealFood, User
+from app.models.meal import MealType
+
+NUTRIENTS = ("calories_per_100g", "protein_per_100g", "carbs_per_100g", "fats_per_100g")
+
+
+def build_session(meal_count: int, foods_per_meal: int):
+    """In-memory database with one user's meals"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    rng = random.Random(42)
+    user = User(email="bench@example.com", username="bench", hashed_password="x")
+    foods = [
+        Food(
+            name=f"Food {i}",
+            calories_per_100g=round(rng.uniform(20, 600), 2),
+            protein_per_100g=round(rng.uniform(0, 40), 2),
+            carbs_per_100g=round(rng.uniform(0, 80), 2),
+            fats_per_100g=round(rng.uniform(0, 50), 2)
+        )
+        for i in range(200)
+    ]
+    db.add(user)
+    db.add_all(foods)
+    db.flush()
+    start = datetime(2024, 1, 1)
+    meals = [
+        Meal(user_id=user.id, meal_type=MealType.LUNCH, meal_date=start + timedelta(hours=6 * i))
+        for i in range(meal_count)
+    ]
+    db.add_all(meals)
+    db.flush()
+    db.add_all([
+        MealFood(meal_id=meal.id, food_id=food.id, quantity_g=round(rng.uniform(30, 400), 2))
+        for meal in meals
+        for food in rng.sample(foods, foods_per_meal)
+    ])
+    db.commit()
+    return db
+
+
+def fetch_rows(db, as_numeric: bool):
+    """Rows of (meal_id, quantity_g, *densities), optionally typed as the old Numeric columns"""
+    columns = [MealFood.quantity_g] + [getattr(Food, name) for name in NUTRIENTS]
+    if as_numeric:
+        columns = [type_coerce(column, Numeric(10, 2)) for column in columns]
+    stmt = select(MealFood.meal_id, *columns).join(Food, Food.id == MealFood.food_id)
+    return db.execute(stmt).all()
+
+
+def totals_decimal(rows) -> dict:
+    """Per-meal totals in Decimal"""
+    hundred = Decimal(100)
+    totals = {}
+    for meal_id, quantity, calories, protein, carbs, fats in rows:
+        multiplier = quantity / hundred
+        t = totals.setdefault(meal_id, [Decimal(0)] * 4)
+        t[0] += calories * multiplier
+        t[1] += protein * multiplier
+        t[2] += carbs * multiplier
+        t[3] += fats * multiplier
+    return {meal_id: [round(float(v), 2) for v in t] for meal_id, t in totals.items()}
+
+
+def totals_mixed(rows) -> dict:
+    """Per-meal totals, converting each Decimal to float"""
+    totals = {}
+    for meal_id, quantity, calories, protein, carbs, fats in rows:
+        multiplier = float(quantity) / 100.0
+        t = totals.setdefault(meal_id, [0.0] * 4)
+        t[0] += float(calories) * multiplier
+        t[1] += float(protein) * multiplier
+        t[2] += float(carbs) * multiplier
+        t[3] += float(fats) * multiplier
+    return {meal_id: [round(v, 2) for v in t] for meal_id, t in totals.items()}
+
+
+def totals_float(rows) -> dict:
+    """Per-meal totals on native floats"""
+    totals = {}
+    for meal_id, quantity, calories, protein, carbs, fats in rows:
+        multiplier = quantity / 100.0
+        t = totals.setdefault(meal_id, [0.0] * 4)
+        t[0] += calories * multiplier
+        t[1] += protein * multiplier
+        t[2] += carbs * multiplier
+        t[3] += fats * multiplier
+    return {meal_id: [round(v, 2) for v in t] for meal_id, t in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meals", type=int, default=5000)
+    parser.add_argument("--foods-per-meal", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    db = build_session(args.meals, args.foods_per_meal)
+    print(f"{args.meals} meals x {args.foods_per_meal} foods, best of {args.repeat}, per meal")
+    print(f"{'variant':<10}{'fetch (us)':>12}{'math (us)':>12}{'total (us)':>12}")
+    for name, as_numeric, compute in (
+        ("decimal", True, totals_decimal),
+        ("mixed", True, totals_mixed),
+        ("float", False, totals_float)
+    ):
+        rows = fetch_rows(db, as_numeric)
+        fetch = min(timeit.repeat(lambda: fetch_rows(db, as_numeric), number=1, repeat=args.repeat))
+        math = min(timeit.repeat(lambda: compute(rows), number=1, repeat=args.repeat))
+        per_meal = 1e6 / args.meals
+        print(f"{name:<10}{fetch * per_meal:>12.2f}{math * per_meal:>12.2f}{(fetch + math) * per_meal:>12.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: worker boot time
+
+Starts N worker processes at once, as a process manager does on deploy,
+and times each worker's import of app.main plus its lifespan startup.
+--legacy-create-all adds the Base.metadata.create_all call that used to run
+at import, to compare with the migration-managed schema.
+
+Usage:
+    cd backend
+    python -m benchmarks.startup [--workers 8] [--database-url mysql+pymysql://...]
+    python -m benchmarks.startup --workers 8 --legacy-create-all
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def run_worker(legacy_create_all: bool) -> None:
+    """Boot one worker and print its phase timings as JSON"""
+    import asyncio
+    
+    start = time.perf_counter()
+    from app.main import app
+    from app.core.database import Base, engine
+    from app.core.startup import lifespan
+    imported = time.perf_counter()
+    
+    if legacy_create_all:
+        Base.metadata.create_all(bind=engine)
+    schema = time.perf_counter()
+    
+    async def boot():
+        async with lifespan(app):
+            return time.perf_counter()
+    
+    ready = asyncio.run(boot())
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "schema_ms": (schema - imported) * 1000,
+        "lifespan_ms": (ready - schema) * 1000,
+        "total_ms": (ready - start) * 1000
+    }))
+
+
+def prepare_database(env: dict) -> None:
+    """Bring the benchmark database to the latest migration"""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True
+    )
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--legacy-create-all", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        run_worker(args.legacy_create_all)
+        return
+    
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{Path(tmpdir.name) / 'startup.db'}"
+    env = dict(os.environ, DATABASE_URL=url, DEBUG="False")
+    env.setdefault("SECRET_KEY", "benchmark-secret-key")
+    prepare_database(env)
+    
+    command = [sys.executable, "-m", "benchmarks.startup", "--worker"]
+    if args.legacy_create_all:
+        command.append("--legacy-create-all")
+    
+    started = time.perf_counter()
+    workers = [
+        subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        for _ in range(args.workers)
+    ]
+    results = []
+    for worker in workers:
+        output, _ = worker.communicate()
+        if worker.returncode != 0:
+            sys.exit(f"worker exited with status {worker.returncode}")
+        results.append(json.loads(output.decode().strip().splitlines()[-1]))
+    wall = (time.perf_counter() - started) * 1000
+    tmpdir.cleanup()
+    
+    mode = "create_all at import" if args.legacy_create_all else "migrations"
+    print(f"{args.workers} workers booted concurrently ({mode}), all ready in {wall:.0f}ms")
+    print(f"{'phase':<12}{'median (ms)':>14}{'p95 (ms)':>12}{'max (ms)':>12}")
+    for phase in ("import", "schema", "lifespan", "total"):
+        values = [r[f"{phase}_ms"] for r in results]
+        print(
+            f"{phase:<12}{statistics.median(values):>14.1f}"
+            f"{percentile(values, 0.95):>12.1f}{max(values):>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
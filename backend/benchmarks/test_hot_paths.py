@@ -0,0 +1,125 @@
+"""
+Microbenchmarks for the service hot paths, at each dataset size in conftest.SIZES
+
+"cold" variants empty the cache before every round and measure the miss
+path; "warm" variants measure repeated calls with the cache populated.
+test_calibration is the yardstick the baseline is relative to (see conftest).
+"""
+import asyncio
+import json
+import random
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import selectinload
+from app.api.v1.dependencies import get_current_user
+from app.core.responses import FastJSONResponse
+from app.core.security import create_access_token
+from app.models import Meal, MealFood
+from app.services.food_service import FoodService
+from app.services.meal_serializer import MealSerializer
+from app.services.meal_service import MealService
+from app.services.recommender_service import RecommenderService
+from app.services.report_service import ReportService
+
+COLD_ROUNDS = 100
+
+
+def measure(benchmark, func, cache: str, cold_cache):
+    """Benchmark func on the cache miss path or, warmed once, on the hit path"""
+    if cache == "cold":
+        return benchmark.pedantic(func, setup=cold_cache, rounds=COLD_ROUNDS)
+    func()
+    return benchmark(func)
+
+
+def calibration_workload(connection: sqlite3.Connection, values: list) -> int:
+    """Fixed mix of interpreter, JSON and SQLite work, like the hot paths below"""
+    connection.execute("DELETE FROM samples")
+    connection.executemany("INSERT INTO samples VALUES (?, ?)", enumerate(values))
+    rows = connection.execute("SELECT id % 50, SUM(value) FROM samples GROUP BY 1 ORDER BY 2").fetchall()
+    grouped = {}
+    for key, value in sorted(zip(values, range(len(values)))):
+        grouped.setdefault(value % 50, []).append(round(key, 3))
+    return len(json.dumps([rows, grouped])) + len(rows)
+
+
+def test_calibration(benchmark):
+    """Machine speed yardstick; every baseline median is stored relative to it"""
+    rng = random.Random(42)
+    values = [rng.random() for _ in range(5000)]
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE samples (id INTEGER PRIMARY KEY, value REAL)")
+    try:
+        assert benchmark(calibration_workload, connection, values) > 0
+    finally:
+        connection.close()
+
+
+def test_calculate_meal_nutrition(benchmark, dataset):
+    """Per-meal totals from the catalog snapshot, over a day of meals"""
+    db = dataset["db"]
+    meals = db.query(Meal).options(
+        selectinload(Meal.meal_foods).selectinload(MealFood.food)
+    ).filter(Meal.user_id == dataset["user_id"]).order_by(Meal.meal_date.desc()).limit(12).all()
+    
+    totals = benchmark(lambda: [MealService.calculate_meal_nutrition(meal) for meal in meals])
+    assert len(totals) == len(meals)
+
+
+def test_generate_daily_report(benchmark, dataset, cold_cache):
+    """Today's report: meals, batch nutrition, preferences and the upsert"""
+    db = dataset["db"]
+    report = benchmark.pedantic(
+        ReportService.generate_daily_report,
+        args=(db, dataset["user_id"], datetime.now()),
+        setup=cold_cache,
+        rounds=COLD_ROUNDS
+    )
+    assert report.total_calories > 0
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def test_get_user_meals(benchmark, dataset, cold_cache, cache):
+    """A user's whole meal history"""
+    db = dataset["db"]
+    meals = measure(benchmark, lambda: MealService.get_user_meals(db, dataset["user_id"]), cache, cold_cache)
+    assert meals
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def test_search_foods(benchmark, dataset, cold_cache, cache):
+    """Substring search over the food catalog"""
+    db = dataset["db"]
+    foods = measure(benchmark, lambda: FoodService.search_foods(db, "Chicken", limit=20), cache, cold_cache)
+    assert foods
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def test_get_current_user(benchmark, dataset, cold_cache, cache):
+    """Token decode and user lookup done by every authenticated request"""
+    db = dataset["db"]
+    token = create_access_token({"sub": str(dataset["user_id"])})
+    loop = asyncio.new_event_loop()
+    try:
+        user = measure(benchmark, lambda: loop.run_until_complete(get_current_user(token, db)), cache, cold_cache)
+    finally:
+        loop.close()
+    assert user.id == dataset["user_id"]
+
+
+@pytest.mark.parametrize("restrictions", [None, ["vegetarian", "vegan"]], ids=["unrestricted", "restricted"])
+def test_fallback_recommendations(benchmark, dataset, restrictions):
+    """Rule-based recommendations used when AI is disabled"""
+    recommender = RecommenderService()
+    recommendations = benchmark(recommender._get_fallback_recommendations, dataset["db"], 2000.0, restrictions)
+    assert recommendations
+
+
+def test_meal_response_serialization(benchmark, dataset):
+    """GET /meals/ body: serialized history rendered to JSON bytes"""
+    db = dataset["db"]
+    meal_ids = [meal.id for meal in MealService.get_user_meals(db, dataset["user_id"])]
+    body = benchmark(lambda: FastJSONResponse(MealSerializer.serialize_meals(db, meal_ids)).body)
+    assert body.startswith(b"[")
@@ -126,6 +126,7 @@ CREATE TABLE IF NOT EXISTS daily_reports (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL,
     report_date DATETIME NOT NULL,
+    report_day DATE NOT NULL,
     total_calories DECIMAL(10, 2) NOT NULL,
     total_protein DECIMAL(10, 2) NOT NULL,
     total_carbs DECIMAL(10, 2) NOT NULL,
@@ -137,11 +138,61 @@ CREATE TABLE IF NOT EXISTS daily_reports (
     recommendations TEXT,
     motivation_message TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_user_id (user_id),
+    UNIQUE KEY uq_daily_reports_user_day (user_id, report_day),
     INDEX idx_report_date (report_date)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Weekly reports table (materialized nightly by scripts/materialize_reports.py)
+CREATE TABLE IF NOT EXISTS weekly_reports (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    days_logged INT NOT NULL DEFAULT 0,
+    meal_count INT NOT NULL DEFAULT 0,
+    total_calories DECIMAL(12, 2) NOT NULL,
+    total_protein DECIMAL(12, 2) NOT NULL,
+    total_carbs DECIMAL(12, 2) NOT NULL,
+    total_fats DECIMAL(12, 2) NOT NULL,
+    total_fiber DECIMAL(12, 2) DEFAULT 0.00,
+    total_sugar DECIMAL(12, 2) DEFAULT 0.00,
+    total_sodium DECIMAL(12, 2) DEFAULT 0.00,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE KEY uq_weekly_reports_user_period (user_id, period_start),
+    INDEX idx_period_start (period_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Monthly reports table (materialized nightly by scripts/materialize_reports.py)
+CREATE TABLE IF NOT EXISTS monthly_reports (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    days_logged INT NOT NULL DEFAULT 0,
+    meal_count INT NOT NULL DEFAULT 0,
+    total_calories DECIMAL(12, 2) NOT NULL,
+    total_protein DECIMAL(12, 2) NOT NULL,
+    total_carbs DECIMAL(12, 2) NOT NULL,
+    total_fats DECIMAL(12, 2) NOT NULL,
+    total_fiber DECIMAL(12, 2) DEFAULT 0.00,
+    total_sugar DECIMAL(12, 2) DEFAULT 0.00,
+    total_sodium DECIMAL(12, 2) DEFAULT 0.00,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE KEY uq_monthly_reports_user_period (user_id, period_start),
+    INDEX idx_period_start (period_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Rollup job checkpoints (last closed period materialized per granularity)
+CREATE TABLE IF NOT EXISTS report_rollup_checkpoints (
+    granularity VARCHAR(20) PRIMARY KEY,
+    last_period_start DATE NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Sample data for testing
 INSERT INTO foods (name, description, calories_per_100g, protein_per_100g, carbs_per_100g, fats_per_100g, fiber_per_100g, sugar_per_100g, sodium_per_100g) VALUES
 ('Chicken Breast', 'Lean chicken breast', 165.0, 31.0, 0.0, 3.6, 0.0, 0.0, 74.0),
@@ -0,0 +1,370 @@
+"""
+Bulk-load a synthetic workload for capacity planning and load tests
+
+Generates users, a food catalog and meal history with realistic, heavy-tailed
+distributions:
+- per-user logging activity is log-normal, so a minority of users log most
+  meals (capped at --max-meals-per-day)
+- food popularity is Zipf-like, so a few hundred foods dominate meal_foods
+- meal times cluster around breakfast, lunch and dinner; 1-8 foods a meal
+  with log-normal portion sizes
+- about half the users have preferences (a quarter of those with a dietary
+  restriction) and a third have an active goal
+
+Rows get explicit ids above the current maximum, so meal_foods can reference
+meals without reading them back, and are written in batches of users. On
+MySQL, --load-data streams each batch through LOAD DATA LOCAL INFILE instead
+of INSERTs (the server needs local_infile=ON). Foreign key and unique checks
+are switched off for the loading session on MySQL. On PostgreSQL the id
+sequences are moved past the loaded ids afterwards.
+
+When loading finishes the cached food lists are invalidated and the food
+catalog snapshot is republished, so run the script on an API host (same
+REDIS_URL and FOOD_CATALOG_DIR). If Redis is unreachable it prints a
+warning: flush the cache before load testing.
+
+Every generated user logs in as <prefix>_<n> (n from 0) with --password,
+which is what benchmarks/load_test.py expects. Use a new --prefix to load
+another population into the same database.
+
+Usage:
+    python scripts/generate_load_data.py --users 10000 --foods 5000 --meal-foods 5000000
+    python scripts/generate_load_data.py --users 1000000 --foods 100000 --meal-foods 500000000 --load-data
+"""
+import argparse
+import csv
+import enum
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import create_engine, func, select, text
+from app.core.cache_keys import CacheKeys, invalidate
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.security import get_password_hash
+from app.models import User, Food, Meal, MealFood, UserPreference, DietaryRestriction, Goal
+from app.models.meal import MealType
+from app.models.goal import GoalType
+from app.services.food_catalog import food_catalog
+
+# (name, calories, protein, carbs, fats, fiber, sugar, sodium) per 100 g
+BASE_FOODS = [
+    ("Chicken Breast", 165.0, 31.0, 0.0, 3.6, 0.0, 0.0, 74.0),
+    ("Brown Rice", 111.0, 2.6, 23.0, 0.9, 1.8, 0.4, 5.0),
+    ("Broccoli", 35.0, 2.8, 7.0, 0.4, 2.6, 1.5, 33.0),
+    ("Salmon", 208.0, 20.0, 0.0, 12.0, 0.0, 0.0, 44.0),
+    ("Sweet Potato", 90.0, 2.0, 21.0, 0.2, 3.3, 4.2, 54.0),
+    ("Oatmeal", 68.0, 2.4, 12.0, 1.4, 1.7, 0.5, 49.0),
+    ("Banana", 89.0, 1.1, 23.0, 0.3, 2.6, 12.0, 1.0),
+    ("Greek Yogurt", 59.0, 10.0, 3.6, 0.4, 0.0, 3.2, 36.0),
+    ("Eggs", 155.0, 13.0, 1.1, 11.0, 0.0, 1.1, 124.0),
+    ("Almonds", 579.0, 21.0, 22.0, 50.0, 12.5, 4.4, 1.0),
+    ("Tofu", 76.0, 8.0, 1.9, 4.8, 0.3, 0.6, 7.0),
+    ("Lentils", 116.0, 9.0, 20.0, 0.4, 7.9, 1.8, 2.0),
+    ("Pasta", 131.0, 5.0, 25.0, 1.1, 1.8, 0.6, 6.0),
+    ("Beef Steak", 271.0, 25.0, 0.0, 19.0, 0.0, 0.0, 54.0),
+    ("Apple", 52.0, 0.3, 14.0, 0.2, 2.4, 10.0, 1.0),
+    ("Spinach", 23.0, 2.9, 3.6, 0.4, 2.2, 0.4, 79.0),
+    ("Cheddar Cheese", 403.0, 25.0, 1.3, 33.0, 0.0, 0.5, 621.0),
+    ("Whole Wheat Bread", 247.0, 13.0, 41.0, 3.4, 7.0, 6.0, 450.0),
+    ("Avocado", 160.0, 2.0, 8.5, 14.7, 6.7, 0.7, 7.0),
+    ("Quinoa", 120.0, 4.4, 21.0, 1.9, 2.8, 0.9, 7.0),
+    ("Turkey", 135.0, 30.0, 0.0, 1.0, 0.0, 0.0, 50.0),
+    ("Shrimp", 99.0, 24.0, 0.2, 0.3, 0.0, 0.0, 111.0),
+    ("Potato", 77.0, 2.0, 17.0, 0.1, 2.2, 0.8, 6.0),
+    ("Chickpeas", 164.0, 8.9, 27.0, 2.6, 7.6, 4.8, 7.0),
+]
+PREPARATIONS = ["Grilled", "Baked", "Steamed", "Roasted", "Fresh", "Boiled", "Smoked", "Braised"]
+FOOD_COLUMNS = [
+    "id", "name", "description", "calories_per_100g", "protein_per_100g", "carbs_per_100g",
+    "fats_per_100g", "fiber_per_100g", "sugar_per_100g", "sodium_per_100g"
+]
+
+MEAL_TYPES = [MealType.BREAKFAST, MealType.LUNCH, MealType.DINNER, MealType.SNACK]
+MEAL_TYPE_SHARES = [0.27, 0.30, 0.30, 0.13]
+# Hour of day per meal type: (mean, standard deviation); snacks are uniform over 10-22
+MEAL_HOURS = [(8.0, 1.0), (12.75, 0.8), (19.0, 1.0)]
+FOODS_PER_MEAL = (7, 0.3)  # 1 + Binomial(7, 0.3): 1-8 foods, 3.1 on average
+ZIPF_EXPONENT = 1.07
+
+RESTRICTIONS = ["vegetarian", "vegan", "gluten-free", "dairy-free", "low-sodium"]
+RESTRICTION_SHARES = [0.4, 0.15, 0.2, 0.15, 0.1]
+GOAL_TYPES = [GoalType.WEIGHT_LOSS, GoalType.MAINTENANCE, GoalType.MUSCLE_GAIN, GoalType.WEIGHT_GAIN]
+GOAL_TYPE_SHARES = [0.5, 0.25, 0.15, 0.1]
+
+
+class BulkWriter:
+    """Writes row tuples in batches, with INSERTs or LOAD DATA LOCAL INFILE"""
+    
+    def __init__(self, load_data: bool, chunk_rows: int):
+        self.is_mysql = engine.dialect.name == "mysql"
+        if load_data and not self.is_mysql:
+            raise SystemExit("--load-data needs a MySQL DATABASE_URL")
+        self.load_data = load_data
+        self.chunk_rows = chunk_rows
+        target = create_engine(settings.DATABASE_URL, connect_args={"local_infile": True}) if load_data else engine
+        self.connection = target.connect()
+        if self.is_mysql:
+            self.connection.execute(text("SET foreign_key_checks = 0, unique_checks = 0"))
+        self.counts = {}
+    
+    def next_id(self, model) -> int:
+        """First free id of a table"""
+        return (self.connection.execute(select(func.coalesce(func.max(model.id), 0))).scalar() or 0) + 1
+    
+    def write(self, model, columns, rows) -> None:
+        """Append rows (tuples in column order) to a table"""
+        if not rows:
+            return
+        table = model.__table__
+        if self.load_data:
+            self._load_file(table.name, columns, rows)
+        else:
+            for start in range(0, len(rows), self.chunk_rows):
+                self.connection.execute(
+                    table.insert(),
+                    [dict(zip(columns, row)) for row in rows[start:start + self.chunk_rows]]
+                )
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+    
+    def _load_file(self, table_name: str, columns, rows) -> None:
+        """Stream rows through a temporary tab-separated file"""
+        with tempfile.NamedTemporaryFile("w", suffix=".tsv", newline="", delete=False) as handle:
+            writer = csv.writer(handle, delimiter="\t", lineterminator="\n", quoting=csv.QUOTE_NONE, escapechar="\\")
+            for row in rows:
+                writer.writerow(["\\N" if value is None else value.name if isinstance(value, enum.Enum) else value for value in row])
+        try:
+            self.connection.execute(text(
+                f"LOAD DATA LOCAL INFILE :path INTO TABLE {table_name} "
+                f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                f"({', '.join(columns)})"
+            ), {"path": handle.name})
+        finally:
+            os.unlink(handle.name)
+    
+    def reset_sequences(self, models) -> None:
+        """Move PostgreSQL id sequences past the explicit ids, so later INSERTs do not collide"""
+        if self.connection.dialect.name != "postgresql":
+            return
+        for model in models:
+            table_name = model.__table__.name
+            self.connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table_name}), 0) + 1, false)"
+            ))
+        self.connection.commit()
+    
+    def commit(self) -> None:
+        self.connection.commit()
+    
+    def close(self) -> None:
+        if self.is_mysql:
+            self.connection.execute(text("SET foreign_key_checks = 1, unique_checks = 1"))
+        self.connection.close()
+
+
+def food_rows(first_id: int, count: int, rng: np.random.Generator) -> list:
+    """Variants of the base foods: a preparation, a variant number and +/-15% jitter on every nutrient"""
+    bases = np.array([food[1:] for food in BASE_FOODS])
+    indices = np.arange(count)
+    base_index = indices % len(BASE_FOODS)
+    preparation = (indices // len(BASE_FOODS)) % len(PREPARATIONS)
+    variant = indices // (len(BASE_FOODS) * len(PREPARATIONS))
+    nutrients = np.round(bases[base_index] * rng.lognormal(0.0, 0.15, (count, bases.shape[1])), 1)
+    
+    rows = []
+    for i, values in enumerate(nutrients.tolist()):
+        name = f"{PREPARATIONS[preparation[i]]} {BASE_FOODS[base_index[i]][0]}"
+        if variant[i]:
+            name = f"{name} {variant[i] + 1}"
+        rows.append((first_id + i, name, f"Synthetic {name.lower()}", *values))
+    return rows
+
+
+def popularity(food_ids: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Cumulative Zipf weights over a shuffled ranking of the foods"""
+    weights = 1.0 / np.arange(1, len(food_ids) + 1) ** ZIPF_EXPONENT
+    rng.shuffle(food_ids)
+    return np.cumsum(weights) / weights.sum()
+
+
+def meals_per_user(args, rng: np.random.Generator) -> np.ndarray:
+    """Log-normal activity scaled to the meal_foods target, capped per day"""
+    foods_per_meal = 1 + FOODS_PER_MEAL[0] * FOODS_PER_MEAL[1]
+    total_meals = args.meal_foods / foods_per_meal
+    activity = rng.lognormal(0.0, 1.0, args.users)
+    expected = np.minimum(total_meals * activity / activity.sum(), args.days * args.max_meals_per_day)
+    return rng.poisson(expected)
+
+
+def user_rows(first_id: int, start: int, count: int, prefix: str, password_hash: str, rng: np.random.Generator) -> list:
+    """Users <prefix>_<start>...; body measurements from normal distributions"""
+    ages = rng.integers(18, 76, count).tolist()
+    genders = rng.choice(["male", "female"], count).tolist()
+    heights = np.clip(rng.normal(170, 10, count), 140, 210).astype(int).tolist()
+    weights = np.clip(rng.normal(75, 15, count), 40, 180).astype(int).tolist()
+    return [
+        (
+            first_id + i, f"{prefix}_{start + i}@example.com", f"{prefix}_{start + i}", password_hash,
+            f"Load User {start + i}", ages[i], genders[i], heights[i], weights[i], True
+        )
+        for i in range(count)
+    ]
+
+
+def preference_rows(users: list, first_id: int, first_restriction_id: int, rng: np.random.Generator):
+    """Targets for about half of the users, with a restriction for a quarter of those"""
+    chosen = [user for user in users if rng.random() < 0.5]
+    calories = (np.round(rng.normal(2200, 350, len(chosen)) / 50) * 50).tolist()
+    preferences, restrictions = [], []
+    for i, user in enumerate(chosen):
+        target = max(calories[i], 1200.0)
+        preferences.append((
+            first_id + i, user[0], target,
+            round(target * 0.25 / 4, 1), round(target * 0.45 / 4, 1), round(target * 0.30 / 9, 1)
+        ))
+        if rng.random() < 0.25:
+            restrictions.append((
+                first_restriction_id + len(restrictions), first_id + i,
+                str(rng.choice(RESTRICTIONS, p=RESTRICTION_SHARES)), "moderate"
+            ))
+    return preferences, restrictions
+
+
+def goal_rows(users: list, first_id: int, rng: np.random.Generator) -> list:
+    """An active goal for about a third of the users"""
+    rows = []
+    for user in users:
+        if rng.random() < 1 / 3:
+            goal_type = GOAL_TYPES[rng.choice(len(GOAL_TYPES), p=GOAL_TYPE_SHARES)]
+            change = {GoalType.WEIGHT_LOSS: -6.0, GoalType.WEIGHT_GAIN: 5.0, GoalType.MUSCLE_GAIN: 3.0}.get(goal_type, 0.0)
+            rows.append((first_id + len(rows), user[0], goal_type, user[8] + change, float(user[8]), True))
+    return rows
+
+
+def meal_rows(user_ids: np.ndarray, counts: np.ndarray, first_meal_id: int, first_meal_food_id: int,
+              days: int, food_ids: np.ndarray, cdf: np.ndarray, rng: np.random.Generator):
+    """Meals over the last `days` days and their foods, vectorized over a batch of users"""
+    meal_count = int(counts.sum())
+    owners = np.repeat(user_ids, counts)
+    types = rng.choice(len(MEAL_TYPES), meal_count, p=MEAL_TYPE_SHARES)
+    hours = rng.uniform(10.0, 22.0, meal_count)
+    for type_index, (mean, spread) in enumerate(MEAL_HOURS):
+        mask = types == type_index
+        hours[mask] = rng.normal(mean, spread, int(mask.sum()))
+    hours = np.clip(hours, 0.0, 23.99)
+    today = np.datetime64(datetime.now().date(), "s")
+    offsets = rng.integers(0, days, meal_count) * 86400 + (hours * 3600).astype(np.int64)
+    dates = (today - np.timedelta64(days - 1, "D") + offsets.astype("timedelta64[s]")).tolist()
+    meal_ids = np.arange(first_meal_id, first_meal_id + meal_count)
+    meals = [
+        (meal_id, owner, MEAL_TYPES[meal_type], meal_date)
+        for meal_id, owner, meal_type, meal_date in zip(meal_ids.tolist(), owners.tolist(), types.tolist(), dates)
+    ]
+    
+    foods_per_meal = 1 + rng.binomial(*FOODS_PER_MEAL, meal_count)
+    row_count = int(foods_per_meal.sum())
+    foods = food_ids[np.minimum(np.searchsorted(cdf, rng.random(row_count)), len(food_ids) - 1)]
+    quantities = np.round(np.clip(rng.lognormal(np.log(120.0), 0.5, row_count), 5.0, 800.0), 1)
+    meal_foods = list(zip(
+        range(first_meal_food_id, first_meal_food_id + row_count),
+        np.repeat(meal_ids, foods_per_meal).tolist(),
+        foods.tolist(),
+        quantities.tolist()
+    ))
+    return meals, meal_foods
+
+
+def refresh_caches() -> None:
+    """Invalidate cached food lists and publish the food catalog snapshot with the new foods"""
+    if not invalidate(CacheKeys.foods_group()):
+        print("WARNING: could not invalidate cached food lists; flush the Redis cache before load testing")
+    db = SessionLocal()
+    try:
+        snapshot = food_catalog.publish(db)
+        print(f"food catalog: published {len(snapshot)} foods to {food_catalog.directory}")
+    except OSError as exc:
+        print(f"WARNING: could not publish the food catalog ({exc}); API workers rebuild it in the background")
+    finally:
+        db.close()
+
+
+def main():
+    """Generate and load the workload"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--foods", type=int, default=5_000)
+    parser.add_argument("--meal-foods", type=int, default=1_000_000, help="Approximate meal_foods rows to create")
+    parser.add_argument("--days", type=int, default=90, help="Days of meal history")
+    parser.add_argument("--max-meals-per-day", type=int, default=6)
+    parser.add_argument("--prefix", default="load", help="Username prefix")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--batch-users", type=int, default=1_000, help="Users generated and committed per batch")
+    parser.add_argument("--chunk-rows", type=int, default=10_000, help="Rows per INSERT statement")
+    parser.add_argument("--load-data", action="store_true", help="Use LOAD DATA LOCAL INFILE (MySQL)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    writer = BulkWriter(args.load_data, args.chunk_rows)
+    started = time.perf_counter()
+    try:
+        first_food_id = writer.next_id(Food)
+        foods = food_rows(first_food_id, args.foods, rng)
+        for start in range(0, len(foods), args.chunk_rows):
+            writer.write(Food, FOOD_COLUMNS, foods[start:start + args.chunk_rows])
+        writer.commit()
+        food_ids = np.arange(first_food_id, first_food_id + args.foods)
+        cdf = popularity(food_ids, rng)
+        print(f"foods: {args.foods} in {time.perf_counter() - started:.1f}s")
+        
+        counts = meals_per_user(args, rng)
+        password_hash = get_password_hash(args.password)
+        next_ids = {model: writer.next_id(model) for model in (User, UserPreference, DietaryRestriction, Goal, Meal, MealFood)}
+        for start in range(0, args.users, args.batch_users):
+            count = min(args.batch_users, args.users - start)
+            users = user_rows(next_ids[User], start, count, args.prefix, password_hash, rng)
+            preferences, restrictions = preference_rows(users, next_ids[UserPreference], next_ids[DietaryRestriction], rng)
+            goals = goal_rows(users, next_ids[Goal], rng)
+            meals, meal_foods = meal_rows(
+                np.arange(next_ids[User], next_ids[User] + count), counts[start:start + count],
+                next_ids[Meal], next_ids[MealFood], args.days, food_ids, cdf, rng
+            )
+            
+            writer.write(User, ["id", "email", "username", "hashed_password", "full_name", "age", "gender", "height_cm", "weight_kg", "is_active"], users)
+            writer.write(UserPreference, ["id", "user_id", "target_calories", "target_protein", "target_carbs", "target_fats"], preferences)
+            writer.write(DietaryRestriction, ["id", "preference_id", "restriction_type", "severity"], restrictions)
+            writer.write(Goal, ["id", "user_id", "goal_type", "target_weight_kg", "current_weight_kg", "is_active"], goals)
+            writer.write(Meal, ["id", "user_id", "meal_type", "meal_date"], meals)
+            writer.write(MealFood, ["id", "meal_id", "food_id", "quantity_g"], meal_foods)
+            writer.commit()
+            
+            for model, rows in ((User, users), (UserPreference, preferences), (DietaryRestriction, restrictions),
+                                (Goal, goals), (Meal, meals), (MealFood, meal_foods)):
+                next_ids[model] += len(rows)
+            elapsed = time.perf_counter() - started
+            print(
+                f"users {start + count}/{args.users}: {writer.counts.get('meal_foods', 0)} meal_foods, "
+                f"{elapsed:.1f}s ({sum(writer.counts.values()) / elapsed:,.0f} rows/s)"
+            )
+        writer.reset_sequences([Food, *next_ids])
+    finally:
+        writer.close()
+    
+    print("\nRows written:")
+    for table_name, count in writer.counts.items():
+        print(f"  {table_name:<22}{count:>14,}")
+    print(f"\nLog in as {args.prefix}_0 ... {args.prefix}_{args.users - 1} with password '{args.password}'")
+    refresh_caches()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Nightly batch job: materialize weekly and monthly report tables
+
+Rebuilds each period for all users in one pass (see ReportRollupService).
+Safe to re-run and resumes after the last completed period.
+
+Usage:
+    python scripts/materialize_reports.py
+    python scripts/materialize_reports.py --granularity weekly --since 2024-01-01
+    python scripts/materialize_reports.py --no-resume          # rebuild everything
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import SessionLocal
+from app.services.report_rollup_service import ReportRollupService, ROLLUP_MODELS
+
+
+def main():
+    """Run the rollup job"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--granularity",
+        choices=[*ROLLUP_MODELS, "all"],
+        default="all",
+        help="Which rollup table to materialize"
+    )
+    parser.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Last day to rebuild, default yesterday")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore the checkpoint and start from the first meal")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    granularities = list(ROLLUP_MODELS) if args.granularity == "all" else [args.granularity]
+    
+    db = SessionLocal()
+    try:
+        for granularity in granularities:
+            stats = ReportRollupService.run(
+                db,
+                granularity,
+                start=args.since,
+                end=args.until,
+                resume=not args.no_resume
+            )
+            print(
+                f"{granularity}: {stats['periods']} periods, {stats['rows']} rows "
+                f"in {stats['seconds']}s ({stats['rows_per_second']} rows/s)"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,29 +3,79 @@ Pytest configuration and fixtures
 """
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.core.database import Base, get_db
 from app.models.user import User
-from app.core.security import get_password_hash
+from app.core.security import create_access_token, get_password_hash
+from app.core import redis_client as redis_module
+from app.core import cache_keys
+from app.core.redis_client import cache_breaker
+from app.services.food_catalog import food_catalog
+from tests.fakes import FakeRedis
 
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Test database: in memory, shared by every connection of the engine (cache=shared)
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:nutribite_tests?mode=memory&cache=shared&uri=true"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Let SQLAlchemy emit BEGIN itself; pysqlite's own handling breaks SAVEPOINT"""
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def test_database():
+    """Create the schema once; the open connection keeps the in-memory database alive"""
+    keeper = engine.connect()
+    Base.metadata.create_all(bind=keeper)
+    keeper.commit()
+    yield engine
+    keeper.close()
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def isolated_food_catalog(tmp_path, monkeypatch):
+    """
+    Give each test its own food catalog directory, since food ids are reused
+    between tests. Background rebuilds are off: their sessions could not see
+    the test's uncommitted rows, so tests publish explicitly.
+    """
+    monkeypatch.setattr(food_catalog, "directory", tmp_path / "food-catalog")
+    monkeypatch.setattr(food_catalog, "session_factory", None)
+    monkeypatch.setattr(food_catalog, "_snapshot", None)
+    monkeypatch.setattr(food_catalog, "_checked_at", float("-inf"))
+    monkeypatch.setattr(food_catalog, "_published_at", float("-inf"))
+    monkeypatch.setattr(food_catalog, "_verified", False)
+    monkeypatch.setattr(food_catalog, "_stale_version", None)
+    return food_catalog
 
 
 @pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test"""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+def db_session(test_database):
+    """
+    Session inside a transaction that is rolled back after the test.
+    Commits made by the code under test only release a SAVEPOINT, so every
+    test starts from empty tables without recreating the schema.
+    """
+    connection = test_database.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -43,13 +93,19 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="session")
+def test_password_hash():
+    """bcrypt is deliberately slow, so the test user's password is hashed once per run"""
+    return get_password_hash("testpassword")
+
+
 @pytest.fixture
-def test_user(db_session):
+def test_user(db_session, test_password_hash):
     """Create a test user"""
     user = User(
         email="test@example.com",
         username="testuser",
-        hashed_password=get_password_hash("testpassword"),
+        hashed_password=test_password_hash,
         full_name="Test User"
     )
     db_session.add(user)
@@ -60,11 +116,18 @@ def test_user(db_session):
 
 @pytest.fixture
 def auth_headers(client, test_user):
-    """Get authentication headers"""
-    response = client.post(
-        "/api/v1/auth/login",
-        json={"username": "testuser", "password": "testpassword"}
-    )
-    token = response.json()["access_token"]
+    """Get authentication headers; the token is issued as /auth/login does, without a bcrypt check (see test_auth)"""
+    token = create_access_token(data={"sub": str(test_user.id)})
     return {"Authorization": f"Bearer {token}"}
 
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    """Every test runs against a fresh in-memory Redis, so cache paths are exercised deterministically"""
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_module, "redis_client", fake)
+    cache_breaker.reset()
+    cache_keys.forget_generations()
+    yield fake
+    cache_breaker.reset()
+    cache_keys.forget_generations()
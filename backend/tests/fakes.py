@@ -0,0 +1,152 @@
+"""
+In-memory test doubles for external services
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _to_bytes(value: Any) -> bytes:
+    """Encode a value the way redis-py does before sending it"""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    return str(value).encode()
+
+
+class FakeRedis:
+    """
+    Minimal in-process stand-in for the redis-py client used by CacheService.
+    Values are stored as bytes, as with decode_responses=False, and every
+    command is recorded in `calls` so tests can count round trips.
+    """
+    
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self.calls: List[Tuple[str, tuple]] = []
+    
+    def _record(self, command: str, *args) -> None:
+        with self._lock:
+            self.calls.append((command, args))
+    
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            self._data.pop(key, None)
+            return None
+        return value
+    
+    def _apply(self, command: str, args: tuple) -> Any:
+        """Run a buffered pipeline command without recording it separately"""
+        if command == "setex":
+            key, seconds, value = args
+            self._data[key] = (_to_bytes(value), self._clock() + seconds)
+            return True
+        removed = [key for key in args if self._live(key) is not None]
+        for key in removed:
+            del self._data[key]
+        return len(removed)
+    
+    def commands(self, command: str) -> int:
+        """Number of times a command was issued"""
+        return sum(1 for name, _ in self.calls if name == command)
+    
+    def ping(self) -> bool:
+        self._record("ping")
+        return True
+    
+    def get(self, key: str) -> Optional[bytes]:
+        self._record("get", key)
+        return self._live(key)
+    
+    def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self._record("mget", *keys)
+        return [self._live(key) for key in keys]
+    
+    def set(self, key: str, value: Any, ex: Optional[float] = None, px: Optional[int] = None, nx: bool = False):
+        self._record("set", key)
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+            self._data[key] = (_to_bytes(value), self._clock() + ttl if ttl is not None else None)
+            return True
+    
+    def setex(self, key: str, seconds: int, value: Any) -> bool:
+        self._record("setex", key)
+        with self._lock:
+            self._data[key] = (_to_bytes(value), self._clock() + seconds)
+        return True
+    
+    def delete(self, *keys: str) -> int:
+        self._record("delete", *keys)
+        removed = 0
+        with self._lock:
+            for key in keys:
+                if self._live(key) is not None:
+                    del self._data[key]
+                    removed += 1
+        return removed
+    
+    def exists(self, *keys: str) -> int:
+        self._record("exists", *keys)
+        return sum(1 for key in keys if self._live(key) is not None)
+    
+    def incr(self, key: str) -> int:
+        self._record("incr", key)
+        with self._lock:
+            current = self._live(key)
+            expires_at = self._data[key][1] if current is not None else None
+            value = int(current or 0) + 1
+            self._data[key] = (_to_bytes(value), expires_at)
+            return value
+    
+    def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> int:
+        """Runs RELEASE_LOCK_SCRIPT, the only script CacheService sends: delete the key if it holds the token"""
+        self._record("eval", *keys_and_args)
+        key, token = keys_and_args
+        with self._lock:
+            if self._live(key) != _to_bytes(token):
+                return 0
+            del self._data[key]
+            return 1
+    
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+    
+    def keys(self) -> List[str]:
+        """Live keys (test helper, not the Redis KEYS command)"""
+        return [key for key in list(self._data) if self._live(key) is not None]
+    
+    def flushall(self) -> None:
+        self._data.clear()
+
+
+class FakePipeline:
+    """Buffers commands and runs them as one recorded "pipeline" round trip"""
+    
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._commands: List[Tuple[str, tuple]] = []
+    
+    def __len__(self) -> int:
+        return len(self._commands)
+    
+    def setex(self, key: str, seconds: int, value: Any) -> "FakePipeline":
+        self._commands.append(("setex", (key, seconds, value)))
+        return self
+    
+    def delete(self, *keys: str) -> "FakePipeline":
+        self._commands.append(("delete", keys))
+        return self
+    
+    def execute(self) -> List[Any]:
+        self._redis._record("pipeline", *(name for name, _ in self._commands))
+        with self._redis._lock:
+            return [self._redis._apply(name, args) for name, args in self._commands]
@@ -0,0 +1,110 @@
+"""
+Tests for analytics endpoints
+"""
+import pytest
+from datetime import datetime
+
+
+@pytest.fixture
+def logged_meals(db_session, test_user):
+    """Three days of meals: 2024-03-04 (Mon), 2024-03-05 and 2024-03-11 (next Mon)"""
+    from app.models.food import Food
+    from app.models.meal import Meal, MealFood, MealType
+    
+    food = Food(
+        name="Test Food",
+        calories_per_100g=200.0,
+        protein_per_100g=10.0,
+        carbs_per_100g=20.0,
+        fats_per_100g=5.0,
+        fiber_per_100g=2.0,
+        sugar_per_100g=1.0,
+        sodium_per_100g=50.0
+    )
+    db_session.add(food)
+    db_session.flush()
+    
+    for meal_date, grams in [
+        (datetime(2024, 3, 4, 8, 0), 100.0),
+        (datetime(2024, 3, 4, 19, 0), 200.0),
+        (datetime(2024, 3, 5, 12, 0), 500.0),
+        (datetime(2024, 3, 11, 12, 0), 1000.0),
+    ]:
+        meal = Meal(user_id=test_user.id, meal_type=MealType.LUNCH, meal_date=meal_date)
+        db_session.add(meal)
+        db_session.flush()
+        db_session.add(MealFood(meal_id=meal.id, food_id=food.id, quantity_g=grams))
+    db_session.commit()
+
+
+def test_daily_analytics(client, auth_headers, logged_meals):
+    """Test daily buckets, rolling averages and empty days"""
+    response = client.get(
+        "/api/v1/analytics/nutrition?start_date=2024-03-04&end_date=2024-03-06&window=2",
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["granularity"] == "daily"
+    buckets = data["buckets"]
+    assert [b["period_start"] for b in buckets] == ["2024-03-04", "2024-03-05", "2024-03-06"]
+    assert buckets[0]["meal_count"] == 2
+    assert buckets[0]["totals"]["calories"] == 600.0
+    assert buckets[0]["totals"]["sodium"] == 150.0
+    assert buckets[1]["rolling_average"]["calories"] == 800.0
+    assert buckets[2]["days_logged"] == 0
+    assert buckets[2]["totals"]["calories"] == 0.0
+    assert buckets[2]["rolling_average"]["calories"] == 1000.0
+    assert buckets[0]["adherence"]["calories"] is None
+
+
+def test_weekly_analytics_with_adherence(client, auth_headers, logged_meals):
+    """Test weekly buckets aligned to Mondays and adherence against targets"""
+    client.post("/api/v1/preferences/", json={"target_calories": 1000.0}, headers=auth_headers)
+    response = client.get(
+        "/api/v1/analytics/nutrition?start_date=2024-03-01&end_date=2024-03-12&granularity=weekly",
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["targets"]["calories"] == 1000.0
+    buckets = data["buckets"]
+    assert [(b["period_start"], b["period_end"]) for b in buckets] == [
+        ("2024-03-01", "2024-03-03"),
+        ("2024-03-04", "2024-03-10"),
+        ("2024-03-11", "2024-03-12"),
+    ]
+    assert buckets[1]["days"] == 7
+    assert buckets[1]["days_logged"] == 2
+    assert buckets[1]["daily_average"]["calories"] == 800.0
+    assert buckets[1]["adherence"]["calories"] == 80.0
+    assert buckets[1]["adherence"]["protein"] is None
+    assert buckets[2]["adherence"]["calories"] == 200.0
+
+
+def test_monthly_analytics_full_year(client, auth_headers, logged_meals):
+    """Test a one-year range collapses into monthly buckets"""
+    response = client.get(
+        "/api/v1/analytics/nutrition?start_date=2024-01-01&end_date=2024-12-31&granularity=monthly",
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    buckets = response.json()["buckets"]
+    assert len(buckets) == 12
+    assert buckets[2]["period_start"] == "2024-03-01"
+    assert buckets[2]["totals"]["calories"] == 3600.0
+    assert buckets[2]["meal_count"] == 4
+
+
+def test_analytics_rejects_invalid_range(client, auth_headers):
+    """Test validation of the requested date range"""
+    response = client.get(
+        "/api/v1/analytics/nutrition?start_date=2024-03-10&end_date=2024-03-01",
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+    response = client.get(
+        "/api/v1/analytics/nutrition?start_date=2020-01-01&end_date=2024-01-01",
+        headers=auth_headers
+    )
+    assert response.status_code == 400
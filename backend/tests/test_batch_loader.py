@@ -0,0 +1,90 @@
+"""
+Tests for batched cache access and the request-scoped BatchLoader
+"""
+from sqlalchemy import event
+from app.core.batch_loader import BatchLoader
+from app.core.redis_client import CacheService
+from app.models.food import Food
+from app.services.food_service import FoodService
+
+
+def test_get_many_is_one_mget(fake_redis):
+    """Test get_many reads every key in one round trip, keeping order"""
+    CacheService.set_many({"a": 1, "c": 3, None: 4}, expire=60)
+    assert fake_redis.commands("pipeline") == 1
+    assert fake_redis.commands("setex") == 0
+    
+    fake_redis.calls.clear()
+    assert CacheService.get_many(["a", "b", None, "c"]) == [1, None, None, 3]
+    assert fake_redis.calls == [("mget", ("a", "b", "c"))]
+    
+    assert CacheService.delete_many(["a", "c"]) is True
+    assert fake_redis.calls[-1] == ("delete", ("a", "c"))
+    assert CacheService.get_many(["a", "c"]) == [None, None]
+
+
+def test_deferred_loads_share_one_batch(fake_redis):
+    """Test keys queued during a request are fetched together"""
+    batches = []
+    
+    def batch_fn(keys):
+        batches.append(sorted(keys))
+        return {key: key * 10 for key in keys if key != 3}
+    
+    loader = BatchLoader(batch_fn, cache_key=lambda key: f"n:{key}", expire=60)
+    first, second, missing = loader.load(1), loader.load(2), loader.load(3)
+    loader.load(1)
+    assert batches == []
+    
+    assert first.get() == 10
+    assert (second.get(), missing.get()) == (20, None)
+    assert batches == [[1, 2, 3]]
+    assert fake_redis.commands("mget") == 1
+    assert fake_redis.commands("pipeline") == 1
+    
+    # A new request finds the values in the cache and only loads the rest
+    fresh = BatchLoader(batch_fn, cache_key=lambda key: f"n:{key}", expire=60)
+    assert fresh.load_many([1, 2, 4]) == [10, 20, 40]
+    assert batches[-1] == [4]
+
+
+def test_primed_keys_are_not_fetched():
+    """Test values already in hand skip the batch"""
+    calls = []
+    loader = BatchLoader(lambda keys: calls.append(keys) or {k: k for k in keys})
+    loader.load(1)
+    loader.prime(1, "primed")
+    assert loader.load_many([1, 2]) == ["primed", 2]
+    assert calls == [[2]]
+
+
+def test_foods_by_ids_hit_db_once_then_cache(db_session, fake_redis):
+    """Test resolving a meal's foods costs one query, then none"""
+    foods = [
+        Food(name=f"Food {i}", calories_per_100g=100, protein_per_100g=5, carbs_per_100g=10, fats_per_100g=1)
+        for i in range(5)
+    ]
+    db_session.add_all(foods)
+    db_session.commit()
+    ids = [food.id for food in foods] + [999]
+    
+    statements = []
+    engine = db_session.get_bind()
+    
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resolved = FoodService.get_foods_by_ids(db_session, ids)
+        assert sorted(resolved) == ids[:-1]
+        assert len(statements) == 1
+        
+        statements.clear()
+        fake_redis.calls.clear()
+        resolved = FoodService.get_foods_by_ids(db_session, ids[:-1])
+        assert resolved[ids[0]].name == "Food 0"
+        assert statements == []
+        assert fake_redis.commands("mget") == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
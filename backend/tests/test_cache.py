@@ -0,0 +1,269 @@
+"""
+Tests for the cache key space and read-after-write consistency
+"""
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.core import cache_codec, cache_keys, redis_client as redis_module
+from app.core.cache_keys import KEY_VERSION, CacheKeys, build_key, generation_key, invalidate
+from app.core.config import settings
+from app.core.database import Base
+from app.core.redis_client import CacheService
+from app.models.food import Food
+from app.services.food_service import FoodService
+
+
+def create_food(client, auth_headers, name: str) -> int:
+    """Create a food through the API and return its id"""
+    response = client.post(
+        "/api/v1/foods/",
+        json={
+            "name": name,
+            "calories_per_100g": 100.0,
+            "protein_per_100g": 10.0,
+            "carbs_per_100g": 20.0,
+            "fats_per_100g": 5.0
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def create_meal(client, auth_headers, food_id: int, meal_date: str) -> int:
+    """Log a meal through the API and return its id"""
+    response = client.post(
+        "/api/v1/meals/",
+        json={"meal_type": "lunch", "meal_date": meal_date, "foods": [{"food_id": food_id, "quantity_g": 100.0}]},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_keys_are_namespaced_and_versioned(fake_redis):
+    """Test grouped keys embed the namespace, key version and group generation"""
+    key = CacheKeys.user_meal_list(7, None, None)
+    assert key == f"{settings.CACHE_NAMESPACE}:v{KEY_VERSION}:meals:user:7:g0:list:None:None"
+    assert CacheKeys.user_by_id(7) == f"{settings.CACHE_NAMESPACE}:v{KEY_VERSION}:user:id:7"
+    
+    invalidate(CacheKeys.user_meals_group(7))
+    assert CacheKeys.user_meal_list(7, None, None) == (
+        f"{settings.CACHE_NAMESPACE}:v{KEY_VERSION}:meals:user:7:g1:list:None:None"
+    )
+    # Other users' groups are untouched
+    assert CacheKeys.user_meal_list(8, None, None).endswith(":g0:list:None:None")
+
+
+def test_invalidation_is_a_single_incr(fake_redis):
+    """Test invalidating a group issues one INCR and no SCAN/DEL"""
+    for skip in range(0, 500, 20):
+        fake_redis.setex(CacheKeys.food_list(skip, 20), 60, "[]")
+    fake_redis.calls.clear()
+    
+    invalidate(CacheKeys.foods_group())
+    
+    assert fake_redis.calls == [("incr", (generation_key("foods"),))]
+    assert all(fake_redis.get(CacheKeys.food_list(skip, 20)) is None for skip in range(0, 500, 20))
+
+
+def test_generation_is_read_once_per_ttl(fake_redis, monkeypatch):
+    """Test grouped keys reuse the worker's generation until it expires, then see other workers' invalidations"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_keys, "_clock", lambda: now[0])
+    monkeypatch.setattr(settings, "CACHE_GENERATION_TTL_SECONDS", 1.0)
+    
+    keys = [CacheKeys.food_list(skip, 20) for skip in range(0, 100, 20)]
+    
+    assert [call for call in fake_redis.calls if call[0] == "get"] == [("get", (generation_key("foods"),))]
+    assert all(key.endswith(f":foods:g0:list:{skip}:20") for key, skip in zip(keys, range(0, 100, 20)))
+    
+    fake_redis.incr(generation_key("foods"))  # Another worker invalidates
+    assert CacheKeys.food_list(0, 20) == keys[0]
+    now[0] += 1.0
+    assert CacheKeys.food_list(0, 20).endswith(":foods:g1:list:0:20")
+    
+    invalidate(CacheKeys.foods_group())  # This worker sees its own invalidation at once
+    assert CacheKeys.food_list(0, 20).endswith(":foods:g2:list:0:20")
+
+
+def test_no_key_when_generation_unavailable(fake_redis, monkeypatch):
+    """Test nothing is cached under a guessed generation while Redis is failing"""
+    def down(key):
+        raise ConnectionError("redis is down")
+    
+    monkeypatch.setattr(fake_redis, "get", down)
+    assert build_key(CacheKeys.foods_group(), "list:0:20") is None
+
+
+def test_meal_list_is_fresh_after_create(client, auth_headers, fake_redis):
+    """Test every date-range variant of the meal list sees a new meal"""
+    food_id = create_food(client, auth_headers, "Rice")
+    first = create_meal(client, auth_headers, food_id, "2024-03-01T12:00:00")
+    ranges = [
+        "",
+        "?start_date=2024-03-01T00:00:00",
+        "?start_date=2024-03-01T00:00:00&end_date=2024-03-31T23:59:59"
+    ]
+    for query in ranges:
+        assert [m["id"] for m in client.get(f"/api/v1/meals/{query}", headers=auth_headers).json()] == [first]
+    
+    second = create_meal(client, auth_headers, food_id, "2024-03-02T12:00:00")
+    
+    for query in ranges:
+        ids = [m["id"] for m in client.get(f"/api/v1/meals/{query}", headers=auth_headers).json()]
+        assert ids == [second, first]
+
+
+def test_meal_list_is_served_from_cache(client, auth_headers, fake_redis):
+    """Test repeated reads hit the cache between writes"""
+    food_id = create_food(client, auth_headers, "Beans")
+    create_meal(client, auth_headers, food_id, "2024-03-01T12:00:00")
+    client.get("/api/v1/meals/", headers=auth_headers)
+    stored = fake_redis.commands("setex")
+    
+    client.get("/api/v1/meals/", headers=auth_headers)
+    assert fake_redis.commands("setex") == stored
+    assert any(key.startswith(f"{settings.CACHE_NAMESPACE}:v{KEY_VERSION}:meals:user:") for key in fake_redis.keys())
+
+
+def test_food_list_and_search_are_fresh_after_create(client, auth_headers, fake_redis):
+    """Test paginated lists and searches include a food created after they were cached"""
+    create_food(client, auth_headers, "Green Apple")
+    assert len(client.get("/api/v1/foods/?skip=0&limit=10", headers=auth_headers).json()) == 1
+    assert len(client.get("/api/v1/foods/search?q=Apple", headers=auth_headers).json()) == 1
+    
+    create_food(client, auth_headers, "Red Apple")
+    
+    assert len(client.get("/api/v1/foods/?skip=0&limit=10", headers=auth_headers).json()) == 2
+    names = sorted(f["name"] for f in client.get("/api/v1/foods/search?q=Apple", headers=auth_headers).json())
+    assert names == ["Green Apple", "Red Apple"]
+
+
+def test_preferences_are_fresh_after_update(client, auth_headers, fake_redis):
+    """Test preference reads reflect the latest update"""
+    client.post("/api/v1/preferences/", json={"target_calories": 2000}, headers=auth_headers)
+    assert client.get("/api/v1/preferences/", headers=auth_headers).json()["target_calories"] == 2000
+    
+    client.put("/api/v1/preferences/", json={"target_calories": 1800}, headers=auth_headers)
+    assert client.get("/api/v1/preferences/", headers=auth_headers).json()["target_calories"] == 1800
+
+
+def run_concurrently(count: int, func) -> list:
+    """Start count threads together and collect their results"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    
+    def worker(index):
+        barrier.wait()
+        results[index] = func()
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_misses_share_one_load(fake_redis):
+    """Test single-flight runs the loader once for simultaneous misses"""
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return [1, 2, 3]
+    
+    results = run_concurrently(16, lambda: CacheService.get_or_set("stampede:key", loader, expire=60))
+    assert calls == [1]
+    assert results == [[1, 2, 3]] * 16
+
+
+def test_waits_for_other_worker_holding_lock(fake_redis):
+    """Test a miss while another worker holds the refresh lock waits for its value"""
+    key = "stampede:shared"
+    fake_redis.set(f"{key}:lock", "other-worker", nx=True, px=5000)
+    
+    def other_worker_finishes():
+        time.sleep(0.1)
+        fake_redis.setex(key, 60, cache_codec.encode({"v": "fresh", "d": 0.1, "x": time.time() + 60}))
+    
+    threading.Thread(target=other_worker_finishes).start()
+    value = CacheService.get_or_set(key, lambda: pytest.fail("loader must not run"), expire=60)
+    assert value == "fresh"
+
+
+def test_release_keeps_lock_taken_over_by_another_worker(fake_redis):
+    """Test releasing a lock that timed out leaves the new holder's lock in place"""
+    assert CacheService._acquire_lock("stampede:lock", "ours")
+    fake_redis.delete("stampede:lock")  # our lock expires mid-load
+    fake_redis.set("stampede:lock", "theirs", nx=True, px=5000)
+    
+    CacheService._release_lock("stampede:lock", "ours")
+    assert fake_redis.get("stampede:lock") == b"theirs"
+    CacheService._release_lock("stampede:lock", "theirs")
+    assert fake_redis.get("stampede:lock") is None
+    # Compare and delete are one EVAL each, with no separate GET/DEL
+    assert fake_redis.commands("eval") == 2
+    assert fake_redis.commands("delete") == 1
+
+
+def test_xfetch_refreshes_only_near_expiry(fake_redis, monkeypatch):
+    """Test early refresh probability depends on time left and compute cost"""
+    key = "stampede:xfetch"
+    envelope = {"v": "old", "d": 1.0, "x": time.time() + 0.5}
+    fake_redis.setex(key, 60, cache_codec.encode(envelope))
+    
+    # -log(1 - 0.01) * 1.0s ~ 0.01s of look-ahead: well before expiry, serve cached
+    monkeypatch.setattr(redis_module.random, "random", lambda: 0.01)
+    assert CacheService.get_or_set(key, lambda: "new", expire=60) == "old"
+    
+    # -log(1 - 0.9) * 1.0s ~ 2.3s of look-ahead: past expiry, refresh now
+    monkeypatch.setattr(redis_module.random, "random", lambda: 0.9)
+    assert CacheService.get_or_set(key, lambda: "new", expire=60) == "new"
+    assert cache_codec.decode(fake_redis.get(key))["v"] == "new"
+
+
+def test_ttls_are_jittered():
+    """Test TTLs spread around the requested expiry within CACHE_TTL_JITTER"""
+    ttls = {CacheService.jittered_ttl(1000) for _ in range(200)}
+    spread = settings.CACHE_TTL_JITTER * 1000
+    assert len(ttls) > 1
+    assert all(1000 - spread <= ttl <= 1000 + spread for ttl in ttls)
+
+
+def test_food_list_hits_db_once_per_expiry(tmp_path, fake_redis):
+    """Test concurrent food list requests issue one list query per expiry"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'stampede.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all([
+            Food(name=f"Food {i}", calories_per_100g=100, protein_per_100g=5, carbs_per_100g=10, fats_per_100g=1)
+            for i in range(30)
+        ])
+        db.commit()
+    
+    list_queries = []
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if "FROM foods" in statement and "LIMIT" in statement:
+            list_queries.append(statement)
+    
+    def request():
+        with Session() as db:
+            time.sleep(0.01)
+            return [f.id for f in FoodService.get_all_foods(db, skip=0, limit=20)]
+    
+    for expiry in range(3):
+        list_queries.clear()
+        results = run_concurrently(12, request)
+        assert len(list_queries) == 1
+        assert all(result == list(range(1, 21)) for result in results)
+        fake_redis.flushall()  # every key expires
+    
+    engine.dispose()
@@ -0,0 +1,142 @@
+"""
+Tests for cache value codecs and compression
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+import pytest
+from app.core import cache_codec
+from app.core.redis_client import CacheService
+from app.schemas.food import MealResponse
+
+
+def meal_payload(food_count: int = 3) -> dict:
+    """A cached meal as the services build it: Decimal nutrients, datetime fields"""
+    return {
+        "id": 1,
+        "meal_type": "lunch",
+        "meal_date": datetime(2024, 3, 1, 12, 30),
+        "notes": None,
+        "meal_foods": [
+            {
+                "id": i,
+                "food_id": i,
+                "quantity_g": Decimal("150.00"),
+                "food": {
+                    "id": i,
+                    "name": f"Food {i}",
+                    "description": "Cached food",
+                    "calories_per_100g": Decimal("52.10"),
+                    "protein_per_100g": Decimal("0.30"),
+                    "carbs_per_100g": Decimal("14.00"),
+                    "fats_per_100g": Decimal("0.20"),
+                    "fiber_per_100g": Decimal("2.40"),
+                    "sugar_per_100g": Decimal("10.40"),
+                    "sodium_per_100g": Decimal("1.00")
+                }
+            }
+            for i in range(food_count)
+        ],
+        "total_calories": 234.45,
+        "total_protein": 1.35,
+        "total_carbs": 63.0,
+        "total_fats": 0.9
+    }
+
+
+@pytest.mark.parametrize("codec", ["json", "orjson", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zlib", "lz4"])
+def test_round_trip_is_typed(codec, compression):
+    """Test every codec and compression decodes a meal back to floats and datetimes"""
+    data = cache_codec.encode(meal_payload(20), codec=codec, compression=compression, min_bytes=0)
+    meal = cache_codec.decode(data, MealResponse)
+    assert meal.meal_date == datetime(2024, 3, 1, 12, 30)
+    assert meal.meal_foods[0].food.calories_per_100g == 52.1
+    assert isinstance(meal.meal_foods[0].quantity_g, float)
+    assert meal.model_dump() == MealResponse.model_validate(meal_payload(20)).model_dump()
+
+
+def test_decimals_are_not_strings():
+    """Test Decimal is stored as a number, not its string form"""
+    for codec in ("json", "orjson", "msgpack"):
+        value = cache_codec.decode(cache_codec.encode({"q": Decimal("1.50")}, codec=codec))
+        assert value == {"q": 1.5}
+
+
+def test_msgpack_keeps_datetimes_without_a_model():
+    """Test msgpack restores datetimes without schema help"""
+    data = cache_codec.encode({"at": datetime(2024, 1, 2, 3, 4, 5)}, codec="msgpack")
+    assert cache_codec.decode(data) == {"at": datetime(2024, 1, 2, 3, 4, 5)}
+
+
+def test_compression_applies_above_threshold():
+    """Test small values are stored raw and large ones compressed, per the header"""
+    small = cache_codec.encode([1, 2, 3], codec="msgpack", compression="zlib", min_bytes=1024)
+    assert small[0] >> 4 == cache_codec.COMPRESSION_NONE
+    
+    large_value = [meal_payload(10)] * 10
+    large = cache_codec.encode(large_value, codec="msgpack", compression="zlib", min_bytes=1024)
+    raw = cache_codec.encode(large_value, codec="msgpack", compression="none")
+    assert large[0] >> 4 == cache_codec.COMPRESSION_ZLIB
+    assert len(large) < len(raw) / 3
+    assert cache_codec.decode(large) == cache_codec.decode(raw)
+
+
+def test_reads_entries_from_any_codec():
+    """Test the header, not the current setting, decides how to decode"""
+    data = cache_codec.encode({"a": 1}, codec="orjson", compression="none")
+    assert data[0] & 0x0F == cache_codec.OrjsonCodec.id
+    assert cache_codec.decode(data) == {"a": 1}
+
+
+def test_missing_codec_falls_back_to_json(monkeypatch):
+    """Test an uninstalled codec degrades to json instead of failing"""
+    monkeypatch.setitem(cache_codec._CODEC_AVAILABLE, "msgpack", False)
+    cache_codec.get_codec.cache_clear()
+    try:
+        assert cache_codec.get_codec("msgpack") is cache_codec.JsonCodec
+    finally:
+        cache_codec.get_codec.cache_clear()
+    with pytest.raises(ValueError):
+        cache_codec.get_codec("pickle")
+
+
+def test_cache_service_decodes_into_model(fake_redis):
+    """Test CacheService stores binary values and returns typed models"""
+    CacheService.set("meals", [meal_payload()], expire=60)
+    assert isinstance(fake_redis.get("meals"), bytes)
+    meals = CacheService.get("meals", model=List[MealResponse])
+    assert meals[0].meal_date == datetime(2024, 3, 1, 12, 30)
+    assert meals[0].meal_foods[0].food.protein_per_100g == 0.3
+
+
+@pytest.mark.parametrize("data", [
+    b"\x0f{}",                                    # unknown codec id
+    b"\x01{\"id\": 1",                            # truncated JSON
+    b"\x02\x93\x01",                              # truncated msgpack
+    b"\x11not zlib",                              # corrupt zlib stream
+    b"\x21not lz4",                               # corrupt lz4 block
+    b"\x31{}",                                    # unknown compression id
+    cache_codec.encode([{"id": "not a meal"}]),   # no longer fits the model
+], ids=["codec", "json", "msgpack", "zlib", "lz4", "compression", "model"])
+def test_undecodable_entries_raise_decode_error(data):
+    """Test every way stored bytes can fail to decode surfaces as DecodeError"""
+    with pytest.raises(cache_codec.DecodeError):
+        cache_codec.decode(data, model=List[MealResponse])
+
+
+def test_undecodable_entries_are_misses(fake_redis):
+    """Test CacheService deletes an undecodable entry and reads it as a miss"""
+    corrupt = b"\x11not zlib"
+    for key in ("single", "many", "envelope", "updated"):
+        fake_redis.set(key, corrupt)
+    
+    assert CacheService.get("single") is None
+    assert CacheService.get_many(["many", "absent"]) == [None, None]
+    assert CacheService.get_or_set("envelope", lambda: "reloaded") == "reloaded"
+    assert CacheService.update("updated", lambda value: value) is False
+    
+    assert fake_redis.get("single") is None
+    assert fake_redis.get("many") is None
+    assert fake_redis.get("updated") is None
+    assert CacheService.get_or_set("envelope", lambda: "reloaded again") == "reloaded"
@@ -0,0 +1,120 @@
+"""
+Tests for engine pool configuration and read replica routing
+"""
+import itertools
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import sessionmaker
+from app.core import database
+from app.core.database import Base, RoutingSession, build_engine, read_replica
+from app.core.metrics import db_pool_checkout_timeouts_total, instrument_engine, registry
+from app.models.food import Food
+from app.services.food_service import FoodService
+
+
+def make_food(name: str) -> Food:
+    """Food row with placeholder nutrients"""
+    return Food(name=name, calories_per_100g=100, protein_per_100g=10, carbs_per_100g=10, fats_per_100g=1)
+
+
+@pytest.fixture
+def primary_and_replica(tmp_path, monkeypatch):
+    """Two SQLite files standing in for a primary and its replica"""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "Primary Oats"), (replica, "Replica Oats")):
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            session.add(make_food(name))
+            session.commit()
+    monkeypatch.setattr(database, "_replica_cycle", itertools.cycle([replica]))
+    Session = sessionmaker(class_=RoutingSession, autoflush=False, bind=primary)
+    yield Session
+    primary.dispose()
+    replica.dispose()
+
+
+def test_reads_outside_read_replica_use_primary(primary_and_replica):
+    """Test queries default to the primary"""
+    with primary_and_replica() as db:
+        assert [f.name for f in db.query(Food).all()] == ["Primary Oats"]
+
+
+def test_search_foods_fills_cache_from_primary(primary_and_replica):
+    """Test a cache miss reads the primary, and a hit re-loads the cached ids from the replica"""
+    with primary_and_replica() as db:
+        assert [f.name for f in FoodService.search_foods(db, "Oats")] == ["Primary Oats"]
+    with primary_and_replica() as db:
+        assert [f.name for f in FoodService.search_foods(db, "Oats")] == ["Replica Oats"]
+
+
+def test_cached_ids_missing_on_replica_come_from_primary(primary_and_replica):
+    """Test ids the replica has not replicated yet are re-loaded from the primary"""
+    with primary_and_replica() as db:
+        db.add(make_food("Fresh Oats"))
+        db.commit()
+        assert [f.name for f in FoodService.search_foods(db, "Oats")] == ["Primary Oats", "Fresh Oats"]
+    with primary_and_replica() as db:
+        assert [f.name for f in FoodService.search_foods(db, "Oats")] == ["Replica Oats", "Fresh Oats"]
+
+
+def test_food_existence_check_reads_primary(primary_and_replica):
+    """Test a food only on the primary is found by the check that gates logging a meal"""
+    with primary_and_replica() as db:
+        food = make_food("Fresh Oats")
+        db.add(food)
+        db.commit()
+        food_id = food.id
+    with primary_and_replica() as db:
+        assert set(FoodService.get_foods_by_ids(db, [1, food_id])) == {1, food_id}
+
+
+def test_session_reads_its_own_writes_from_primary(primary_and_replica):
+    """Test a session that has flushed writes keeps reading from the primary"""
+    with primary_and_replica() as db:
+        db.add(make_food("Fresh Oats"))
+        db.flush()
+        with read_replica(db):
+            names = sorted(f.name for f in db.query(Food).all())
+        assert names == ["Fresh Oats", "Primary Oats"]
+        db.commit()
+        with read_replica(db):
+            assert [f.name for f in db.query(Food).all()] == ["Replica Oats"]
+
+
+def test_build_engine_applies_pool_settings(tmp_path, monkeypatch):
+    """Test pool sizing and echo come from settings, not DEBUG"""
+    monkeypatch.setattr(database.settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(database.settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(database.settings, "DB_POOL_TIMEOUT", 2.5)
+    monkeypatch.setattr(database.settings, "DEBUG", True)
+    engine = build_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 1
+    assert engine.pool._timeout == 2.5
+    assert engine.echo is False
+    engine.dispose()
+    
+    # In-memory SQLite has no sizeable pool; the options must be skipped
+    build_engine("sqlite://").dispose()
+
+
+def test_pool_metrics_are_labelled_per_pool(tmp_path):
+    """Test checkout waits and timeouts are exported per pool"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'metrics.db'}",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01
+    )
+    instrument_engine(engine, "replica_test")
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+    
+    assert db_pool_checkout_timeouts_total.value(pool="replica_test") == 1
+    output = registry.render()
+    assert 'db_pool_checkout_wait_seconds_count{pool="replica_test"} 2' in output
+    assert 'db_pool_connections{pool="replica_test",state="size"} 1' in output
+    engine.dispose()
@@ -0,0 +1,207 @@
+"""
+Tests for the memory-mapped food catalog snapshot
+"""
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.food import Food
+from app.models.meal import Meal, MealFood, MealType
+from app.services.food_catalog import FoodCatalog
+from app.services.meal_serializer import MealSerializer
+from app.services.meal_service import MealService
+
+
+def add_food(db_session, name: str, calories: float, description=None) -> Food:
+    """Insert a food directly, bypassing FoodService (and the catalog publish)"""
+    food = Food(
+        name=name,
+        description=description,
+        calories_per_100g=calories,
+        protein_per_100g=10.0,
+        carbs_per_100g=20.0,
+        fats_per_100g=5.0,
+        fiber_per_100g=1.5
+    )
+    db_session.add(food)
+    db_session.commit()
+    return food
+
+
+def add_meal(db_session, items) -> Meal:
+    """Insert a meal with (food, grams) items"""
+    meal = Meal(user_id=1, meal_type=MealType.LUNCH, meal_date=datetime(2024, 5, 1, 12))
+    db_session.add(meal)
+    db_session.flush()
+    db_session.add_all([MealFood(meal_id=meal.id, food_id=food.id, quantity_g=grams) for food, grams in items])
+    db_session.commit()
+    return meal
+
+
+def test_snapshot_round_trips_foods(db_session, isolated_food_catalog):
+    """Test published arrays reproduce the food rows"""
+    add_food(db_session, "Crème fraîche", 292.0, description="Cultured cream")
+    add_food(db_session, "Rice", 130.0)
+    snapshot = isolated_food_catalog.publish(db_session)
+    
+    assert len(snapshot) == 2
+    positions = snapshot.positions([2, 1, 99]).tolist()
+    assert positions[2] == -1
+    assert snapshot.food(positions[1]) == {
+        "id": 1,
+        "name": "Crème fraîche",
+        "description": "Cultured cream",
+        "calories_per_100g": 292.0,
+        "protein_per_100g": 10.0,
+        "carbs_per_100g": 20.0,
+        "fats_per_100g": 5.0,
+        "fiber_per_100g": 1.5,
+        "sugar_per_100g": 0.0,
+        "sodium_per_100g": 0.0
+    }
+    assert snapshot.food(positions[0])["description"] is None
+
+
+def test_create_food_hot_swaps_for_every_worker(client, auth_headers, db_session, isolated_food_catalog):
+    """Test a food created in one worker is visible to another sharing the directory"""
+    other_worker = FoodCatalog(str(isolated_food_catalog.directory), check_seconds=3600)
+    client.post(
+        "/api/v1/foods/",
+        json={"name": "Apple", "calories_per_100g": 52, "protein_per_100g": 0.3, "carbs_per_100g": 14, "fats_per_100g": 0.2},
+        headers=auth_headers
+    )
+    # Creating a food does not publish inside the request
+    assert not (isolated_food_catalog.directory / "current").exists()
+    isolated_food_catalog.publish(db_session)
+    first = other_worker.snapshot()
+    assert len(first) == 1
+    
+    response = client.post(
+        "/api/v1/foods/",
+        json={"name": "Pear", "calories_per_100g": 57, "protein_per_100g": 0.4, "carbs_per_100g": 15, "fats_per_100g": 0.1},
+        headers=auth_headers
+    )
+    pear_id = response.json()["id"]
+    # Until the rebuild lands, readers are sent to the foods table
+    assert other_worker.lookup(db_session, [pear_id]) is None
+    isolated_food_catalog.publish(db_session)
+    # Within its check interval the other worker still serves the old version...
+    assert other_worker.snapshot() is first
+    # ...until it is asked for a food that version lacks
+    swapped = other_worker.lookup(db_session, [pear_id])
+    assert swapped.version != first.version
+    assert swapped.food(swapped.positions([pear_id])[0])["name"] == "Pear"
+    # The old mapping stays readable after the swap
+    assert first.food(0)["name"] == "Apple"
+
+
+def test_rebuilds_run_in_the_background_once_per_burst(db_session, isolated_food_catalog):
+    """Test rebuild requests made before the delay elapses share one background publish"""
+    connection = db_session.connection()
+    catalog = FoodCatalog(
+        str(isolated_food_catalog.directory),
+        rebuild_delay=0.05,
+        session_factory=lambda: Session(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    add_food(db_session, "Rice", 130.0)
+    publishes = []
+    publish = catalog.publish
+    catalog.publish = lambda db: publishes.append(publish(db))[-1]
+    
+    for _ in range(3):
+        catalog.request_publish()
+    pending = catalog._pending
+    assert catalog.lookup(db_session, [1]) is None
+    pending.join()
+    assert len(publishes) == 1
+    assert catalog.lookup(db_session, [1]).version == publishes[0].version
+
+
+def test_meal_serialization_skips_foods_table(db_session, isolated_food_catalog):
+    """Test meals are serialized from the snapshot, without reading food rows"""
+    oats, milk = add_food(db_session, "Oats", 389.0), add_food(db_session, "Milk", 42.0)
+    meal = add_meal(db_session, [(oats, 50.0), (milk, 200.0)])
+    expected = MealSerializer.serialize_rows(MealSerializer.fetch_rows(db_session, [meal.id]))[meal.id]
+    isolated_food_catalog.publish(db_session)
+    
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert MealSerializer.serialize_meal(db_session, meal.id) == expected
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert not any("FROM foods" in statement or "JOIN foods" in statement for statement in statements)
+
+
+def test_null_nutrients_stay_null(db_session, isolated_food_catalog):
+    """Test a NULL nutrient is serialized as null, from the foods table and from the snapshot"""
+    food = add_food(db_session, "Broth", 15.0)
+    food.sodium_per_100g = None
+    db_session.commit()
+    meal = add_meal(db_session, [(food, 250.0)])
+    
+    from_table = MealSerializer.serialize_rows(MealSerializer.fetch_rows(db_session, [meal.id]))[meal.id]
+    assert from_table["meal_foods"][0]["food"]["sodium_per_100g"] is None
+    assert from_table["meal_foods"][0]["food"]["fiber_per_100g"] == 1.5
+    isolated_food_catalog.publish(db_session)
+    assert MealSerializer.serialize_meal(db_session, meal.id) == from_table
+
+
+def test_meal_nutrition_from_arrays(db_session, isolated_food_catalog):
+    """Test calculate_meal_nutrition uses the snapshot and matches the ORM totals"""
+    oats, milk = add_food(db_session, "Oats", 389.0), add_food(db_session, "Milk", 42.0)
+    meal = add_meal(db_session, [(oats, 50.0), (milk, 200.0)])
+    from_orm = MealService.calculate_meal_nutrition(meal)
+    
+    snapshot = isolated_food_catalog.publish(db_session)
+    assert snapshot.meal_nutrition([oats.id, milk.id], [50.0, 200.0]) == from_orm
+    assert MealService.calculate_meal_nutrition(meal) == from_orm == {
+        "total_calories": 278.5,
+        "total_protein": 25.0,
+        "total_carbs": 50.0,
+        "total_fats": 12.5
+    }
+
+
+def test_stale_snapshot_is_rebuilt_after_restart(db_session, isolated_food_catalog):
+    """Test a snapshot that no longer matches the foods table is not served, and is replaced in the background"""
+    add_food(db_session, "Rice", 130.0)
+    old = isolated_food_catalog.publish(db_session)
+    add_food(db_session, "Beans", 347.0)  # written without a publish, e.g. by a seed script
+    
+    requests = []
+    restarted = FoodCatalog(str(isolated_food_catalog.directory))
+    restarted.request_publish = lambda: requests.append(True)
+    assert restarted.lookup(db_session, [1]) is None
+    assert requests
+    
+    restarted.publish(db_session)
+    snapshot = restarted.lookup(db_session, [1])
+    assert snapshot.version != old.version
+    assert len(snapshot) == 2
+
+
+def test_meal_nutrition_skips_stale_snapshot(db_session, isolated_food_catalog):
+    """Test calculate_meal_nutrition reads the foods table once the snapshot is found stale"""
+    rice = add_food(db_session, "Rice", 130.0)
+    meal = add_meal(db_session, [(rice, 100.0)])
+    isolated_food_catalog.publish(db_session)
+    rice.calories_per_100g = 140.0
+    add_food(db_session, "Beans", 347.0)  # written without a publish, e.g. by a seed script
+    
+    isolated_food_catalog._verified = False  # as after a restart
+    assert MealService.calculate_meal_nutrition(meal)["total_calories"] == 140.0
+
+
+def test_old_snapshots_are_pruned(db_session, isolated_food_catalog):
+    """Test publishing keeps only the most recent snapshot directories"""
+    add_food(db_session, "Rice", 130.0)
+    for _ in range(5):
+        latest = isolated_food_catalog.publish(db_session)
+    versions = sorted(p.name for p in isolated_food_catalog.directory.iterdir() if p.is_dir())
+    assert len(versions) == 3
+    assert versions[-1] == latest.version
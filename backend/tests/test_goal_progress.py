@@ -0,0 +1,136 @@
+"""
+Tests for weigh-ins and goal progress
+"""
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+from app.core.cache_keys import CacheKeys
+from app.core.redis_client import CacheService
+from app.services.goal_progress_service import GoalProgressService
+
+
+def create_goal(client, auth_headers, target: float = 75.0, current: float = 80.0) -> dict:
+    """Create a weight loss goal through the API"""
+    response = client.post(
+        "/api/v1/goals/",
+        json={"goal_type": "weight_loss", "target_weight_kg": target, "current_weight_kg": current},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def log_weight(client, auth_headers, weight_kg: float, logged_at: datetime) -> dict:
+    """Log a weigh-in through the API"""
+    response = client.post(
+        "/api/v1/goals/weights",
+        json={"weight_kg": weight_kg, "logged_at": logged_at.isoformat()},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def log_meal(client, auth_headers, food_id: int, grams: float, meal_date: datetime) -> None:
+    """Log a one-food meal through the API"""
+    response = client.post(
+        "/api/v1/meals/",
+        json={"meal_type": "lunch", "meal_date": meal_date.isoformat(), "foods": [{"food_id": food_id, "quantity_g": grams}]},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+
+
+def create_food(client, auth_headers) -> int:
+    """A food with 100 kcal per 100 g"""
+    response = client.post(
+        "/api/v1/foods/",
+        json={"name": "Porridge", "calories_per_100g": 100.0, "protein_per_100g": 4.0, "carbs_per_100g": 15.0, "fats_per_100g": 2.0},
+        headers=auth_headers
+    )
+    return response.json()["id"]
+
+
+def test_newest_weigh_in_becomes_current_weight(client, auth_headers):
+    """Test the active goal's current weight follows the latest weigh-in only"""
+    create_goal(client, auth_headers)
+    now = datetime.now()
+    log_weight(client, auth_headers, 79.0, now - timedelta(days=1))
+    log_weight(client, auth_headers, 81.0, now - timedelta(days=3))  # back-filled, older
+    
+    goal = client.get("/api/v1/goals/active", headers=auth_headers).json()
+    assert goal["current_weight_kg"] == 79.0
+    logs = client.get("/api/v1/goals/weights", headers=auth_headers).json()
+    assert [log["weight_kg"] for log in logs] == [79.0, 81.0]
+    
+    response = client.post("/api/v1/goals/weights", json={"weight_kg": 0}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_progress_trend_balance_and_projection(client, auth_headers):
+    """Test the regression trend, inferred maintenance calories and projected date"""
+    create_goal(client, auth_headers, target=75.0)
+    food_id = create_food(client, auth_headers)
+    now = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+    # Losing 0.1 kg a day on 2000 kcal
+    for days_ago in range(14, 0, -1):
+        log_weight(client, auth_headers, 80.0 - 0.1 * (14 - days_ago), now - timedelta(days=days_ago))
+        log_meal(client, auth_headers, food_id, 2000.0, now - timedelta(days=days_ago))
+    
+    response = client.get("/api/v1/goals/progress", headers=auth_headers)
+    assert response.status_code == 200
+    progress = response.json()
+    assert progress["weigh_in_count"] == 14
+    assert progress["latest_weight_kg"] == 78.7
+    assert progress["weekly_change_kg"] == -0.7
+    assert abs(progress["trend_weight_kg"] - 78.6) < 0.05
+    assert progress["days_with_meals"] == 14
+    assert progress["average_daily_calories"] == 2000.0
+    assert progress["daily_calorie_balance"] == -770.0
+    assert progress["estimated_maintenance_calories"] == 2770.0
+    assert abs(progress["remaining_kg"] + 3.6) < 0.05
+    projected = date.fromisoformat(progress["projected_date"])
+    assert abs((projected - date.today()).days - 36) <= 1
+
+
+def test_progress_without_a_trend(client, auth_headers):
+    """Test a single weigh-in gives no slope and no projection"""
+    create_goal(client, auth_headers)
+    log_weight(client, auth_headers, 80.0, datetime.now())
+    
+    progress = client.get("/api/v1/goals/progress", headers=auth_headers).json()
+    assert progress["trend_weight_kg"] == 80.0
+    assert progress["weekly_change_kg"] is None
+    assert progress["daily_calorie_balance"] is None
+    assert progress["remaining_kg"] == -5.0
+    assert progress["projected_date"] is None
+
+
+def test_window_is_patched_instead_of_rebuilt(client, auth_headers, db_session, test_user, fake_redis):
+    """Test new weigh-ins and meals update the cached window without re-reading history"""
+    create_goal(client, auth_headers)
+    food_id = create_food(client, auth_headers)
+    now = datetime.now().replace(hour=12)
+    log_weight(client, auth_headers, 80.0, now - timedelta(days=7))
+    first = client.get("/api/v1/goals/progress", headers=auth_headers).json()
+    assert first["weigh_in_count"] == 1
+    
+    log_weight(client, auth_headers, 79.0, now - timedelta(hours=1))
+    log_meal(client, auth_headers, food_id, 1500.0, now - timedelta(hours=2))
+    window = CacheService.get(CacheKeys.user_progress(test_user.id))
+    assert len(window["weights"]) == 2
+    assert list(window["meals"].values()) == [[now.toordinal(), 1500.0]]
+    
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        progress = GoalProgressService.get_progress(db_session, test_user.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert progress["weigh_in_count"] == 2
+    assert progress["average_daily_calories"] == 1500.0
+    assert not any("FROM weight_logs" in statement or "FROM meals" in statement for statement in statements)
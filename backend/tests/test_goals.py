@@ -3,6 +3,8 @@ Tests for goal endpoints
 """
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.services.goal_service import GoalService
 
 
 def test_create_goal(client, auth_headers):
@@ -43,7 +45,7 @@ def test_get_active_goal(client, auth_headers, db_session):
     # Create an active goal
     goal = Goal(
         user_id=user.id,
-        goal_type=GoalType.weight_loss,
+        goal_type=GoalType.WEIGHT_LOSS,
         target_weight_kg=70.0,
         current_weight_kg=80.0,
         target_date=datetime.now() + timedelta(days=30),
@@ -65,3 +67,45 @@ def test_get_active_goal_not_found(client, auth_headers):
     response = client.get("/api/v1/goals/active", headers=auth_headers)
     assert response.status_code == 404
 
+
+def test_new_goal_replaces_active_goal(client, auth_headers):
+    """Test creating a goal deactivates the previous one"""
+    first = client.post(
+        "/api/v1/goals/",
+        json={"goal_type": "weight_loss", "target_weight_kg": 70.0},
+        headers=auth_headers
+    ).json()
+    second = client.post("/api/v1/goals/", json={"goal_type": "maintenance"}, headers=auth_headers).json()
+    
+    goals = client.get("/api/v1/goals/", headers=auth_headers).json()
+    assert [(goal["id"], goal["is_active"]) for goal in goals] == [(second["id"], True), (first["id"], False)]
+    assert client.get("/api/v1/goals/active", headers=auth_headers).json()["id"] == second["id"]
+
+
+def test_active_goal_is_cached_until_it_changes(client, auth_headers, db_session, test_user, fake_redis):
+    """Test the active-goal lookup is served from cache and invalidated by goal changes"""
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert GoalService.get_active_goal(db_session, test_user.id) is None
+        assert GoalService.get_active_goal(db_session, test_user.id) is None
+        goal_id = client.post(
+            "/api/v1/goals/",
+            json={"goal_type": "weight_loss", "target_weight_kg": 70.0},
+            headers=auth_headers
+        ).json()["id"]
+        statements.clear()
+        assert GoalService.get_active_goal(db_session, test_user.id).id == goal_id
+        assert GoalService.get_active_goal(db_session, test_user.id).target_weight_kg == 70.0
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert sum("FROM goals" in statement for statement in statements) == 1
+    
+    # A weigh-in updates the goal's current weight, so the cached copy is dropped
+    client.post("/api/v1/goals/weights", json={"weight_kg": 78.5}, headers=auth_headers)
+    assert client.get("/api/v1/goals/active", headers=auth_headers).json()["current_weight_kg"] == 78.5
@@ -0,0 +1,187 @@
+"""
+Tests for health probes and the Redis circuit breaker
+"""
+import asyncio
+import threading
+import time
+import pytest
+from app.core import redis_client as redis_module
+from app.core.health import HealthChecker, health_checker
+from app.core.redis_client import CircuitBreaker, CacheService, cache_breaker
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class DownRedis:
+    """Redis stand-in whose every command fails, counting the attempts"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get(self, key):
+        self.calls += 1
+        raise ConnectionError("redis is down")
+    
+    def ping(self):
+        self.calls += 1
+        raise ConnectionError("redis is down")
+
+
+@pytest.fixture(autouse=True)
+def reset_health_state():
+    """The breaker and probe cache are process-wide"""
+    cache_breaker.reset()
+    health_checker.invalidate()
+    yield
+    cache_breaker.reset()
+    health_checker.invalidate()
+
+
+def test_breaker_opens_after_threshold_and_recovers():
+    """Test breaker opens after consecutive failures and closes after a good trial"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_seconds=10, clock=clock)
+    
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial call at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_breaker_failed_trial_reopens():
+    """Test a failed half-open trial starts a new cool-down"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=5, clock=clock)
+    breaker.record_failure()
+    
+    clock.now = 5
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now = 9
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.allow()
+
+
+def test_cache_short_circuits_when_redis_is_down(monkeypatch):
+    """Test CacheService stops calling Redis once the breaker opens"""
+    down = DownRedis()
+    monkeypatch.setattr(redis_module, "redis_client", down)
+    
+    for _ in range(cache_breaker.failure_threshold + 10):
+        assert CacheService.get("some-key") is None
+    
+    assert down.calls == cache_breaker.failure_threshold
+    assert cache_breaker.state == "open"
+
+
+def test_health_checker_caches_results():
+    """Test probe results are reused within the TTL"""
+    clock = FakeClock()
+    calls = []
+    checker = HealthChecker(
+        probes={"database": lambda: calls.append("db")},
+        timeout_seconds=1,
+        ttl_seconds=5,
+        clock=clock
+    )
+    
+    first = asyncio.run(checker.check())
+    asyncio.run(checker.check())
+    assert first["database"]["status"] == "up"
+    assert len(calls) == 1
+    
+    clock.now = 5
+    asyncio.run(checker.check())
+    assert len(calls) == 2
+
+
+def test_health_checker_times_out_slow_probe():
+    """Test a hanging probe is reported down after the timeout"""
+    checker = HealthChecker(
+        probes={"redis": lambda: time.sleep(0.5)},
+        timeout_seconds=0.05,
+        ttl_seconds=0
+    )
+    result = asyncio.run(checker.check())
+    assert result["redis"]["status"] == "down"
+    assert "timed out" in result["redis"]["error"]
+
+
+def test_health_checker_does_not_stack_hung_probes():
+    """Test checks while a probe is hung wait on it instead of starting more threads"""
+    release = threading.Event()
+    calls = []
+    
+    def hung_probe():
+        calls.append(1)
+        release.wait(5)
+    
+    checker = HealthChecker(probes={"database": hung_probe}, timeout_seconds=0.05, ttl_seconds=0)
+    for _ in range(3):
+        assert asyncio.run(checker.check())["database"]["status"] == "down"
+    assert len(calls) == 1
+    
+    release.set()
+    checker._in_flight["database"].result(timeout=5)
+    # Once it has finished, every check probes afresh again
+    assert asyncio.run(checker.check())["database"]["status"] == "up"
+    assert asyncio.run(checker.check())["database"]["status"] == "up"
+    assert len(calls) == 3
+
+
+def test_liveness(client):
+    """Test liveness does not depend on the database or Redis"""
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readiness_degraded_without_redis(client, monkeypatch):
+    """Test readiness stays 200 but reports degraded when only Redis is down"""
+    monkeypatch.setattr(health_checker, "probes", {
+        "database": lambda: None,
+        "redis": DownRedis().ping
+    })
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "degraded"
+    assert data["checks"]["database"]["status"] == "up"
+    assert data["checks"]["redis"]["status"] == "down"
+    assert data["checks"]["redis"]["circuit_breaker"] == "closed"
+    assert "latency_ms" in data["checks"]["database"]
+
+
+def test_readiness_unavailable_without_database(client, monkeypatch):
+    """Test readiness returns 503 when the database probe fails"""
+    def broken():
+        raise RuntimeError("database is down")
+    
+    monkeypatch.setattr(health_checker, "probes", {
+        "database": broken,
+        "redis": lambda: None
+    })
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
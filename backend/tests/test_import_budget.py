@@ -0,0 +1,22 @@
+"""
+Tests for the application import-time budget
+"""
+from benchmarks.import_time import budget_violations, load_budget, measure_imports
+
+
+def test_app_import_within_budget():
+    """Test importing app.main stays within the committed import budget"""
+    budget = load_budget()
+    modules = measure_imports(budget["module"])
+    assert budget_violations(modules, budget) == []
+
+
+def test_recommender_is_created_lazily():
+    """Test importing the recommender endpoints does not build the service"""
+    from app.api.v1.endpoints import recommender
+    
+    recommender.get_recommender_service.cache_clear()
+    assert recommender.get_recommender_service.cache_info().currsize == 0
+    service = recommender.get_recommender_service()
+    assert service is recommender.get_recommender_service()
+    assert service.llm is None
@@ -49,3 +49,226 @@ def test_get_meals(client, auth_headers):
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
+
+
+def test_meal_list_is_one_flat_query(client, auth_headers, db_session, fake_redis, isolated_food_catalog):
+    """Test the meal list is filtered by user and date range in a single query, newest first"""
+    from sqlalchemy import event
+    
+    food_id = client.post(
+        "/api/v1/foods/",
+        json={"name": "Rice", "calories_per_100g": 130.0, "protein_per_100g": 2.7, "carbs_per_100g": 28.0, "fats_per_100g": 0.3},
+        headers=auth_headers
+    ).json()["id"]
+    meal_ids = [
+        client.post(
+            "/api/v1/meals/",
+            json={"meal_type": "lunch", "meal_date": f"2024-03-0{day}T12:00:00", "foods": [{"food_id": food_id, "quantity_g": 100.0}]},
+            headers=auth_headers
+        ).json()["id"]
+        for day in (1, 2, 3)
+    ]
+    isolated_food_catalog.publish(db_session)  # as the background rebuild would
+    fake_redis.flushall()
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(
+            "/api/v1/meals/?start_date=2024-03-02T00:00:00&end_date=2024-03-31T00:00:00",
+            headers=auth_headers
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert [meal["id"] for meal in response.json()] == [meal_ids[2], meal_ids[1]]
+    meal_queries = [statement for statement in statements if "FROM meals" in statement]
+    assert len(meal_queries) == 1
+    assert "meals.user_id" in meal_queries[0]
+
+
+def test_get_meal_matches_create_response(client, auth_headers):
+    """Test list and detail endpoints serialize meals like create does"""
+    food_response = client.post(
+        "/api/v1/foods/",
+        json={
+            "name": "Oats",
+            "calories_per_100g": 389.0,
+            "protein_per_100g": 16.9,
+            "carbs_per_100g": 66.3,
+            "fats_per_100g": 6.9
+        },
+        headers=auth_headers
+    )
+    food_id = food_response.json()["id"]
+    created = client.post(
+        "/api/v1/meals/",
+        json={
+            "meal_type": "breakfast",
+            "meal_date": "2024-01-15T08:30:00",
+            "foods": [{"food_id": food_id, "quantity_g": 50.0}]
+        },
+        headers=auth_headers
+    ).json()
+    assert created["total_calories"] == 194.5
+    assert created["meal_foods"][0]["food"]["name"] == "Oats"
+    
+    detail = client.get(f"/api/v1/meals/{created['id']}", headers=auth_headers)
+    assert detail.status_code == 200
+    assert detail.json() == created
+    
+    meals = client.get("/api/v1/meals/", headers=auth_headers).json()
+    assert [m["id"] for m in meals] == [created["id"]]
+    assert meals[0] == created
+
+
+def test_get_meal_not_found(client, auth_headers):
+    """Test getting a meal that does not exist"""
+    response = client.get("/api/v1/meals/999", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def _create_meal_history(client, auth_headers, meal_count):
+    """Create a food and meal_count meals eating 150g of it"""
+    food_id = client.post(
+        "/api/v1/foods/",
+        json={
+            "name": "Rice, cooked",
+            "calories_per_100g": 130.0,
+            "protein_per_100g": 2.7,
+            "carbs_per_100g": 28.0,
+            "fats_per_100g": 0.3
+        },
+        headers=auth_headers
+    ).json()["id"]
+    for day in range(meal_count):
+        client.post(
+            "/api/v1/meals/",
+            json={
+                "meal_type": "lunch",
+                "meal_date": f"2024-02-{day + 1:02d}T12:00:00",
+                "foods": [{"food_id": food_id, "quantity_g": 150.0}]
+            },
+            headers=auth_headers
+        )
+
+
+def test_export_meals_csv(client, auth_headers):
+    """Test streaming meal history as CSV"""
+    _create_meal_history(client, auth_headers, 3)
+    response = client.get("/api/v1/meals/export?format=csv&chunk_size=100", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0].startswith("meal_id,meal_type,meal_date")
+    assert len(lines) == 4
+    assert '"Rice, cooked"' in lines[1]
+    assert ",195.0," in lines[1]
+
+
+def test_export_meals_ndjson(client, auth_headers):
+    """Test streaming meal history as NDJSON with a date filter"""
+    import json
+    _create_meal_history(client, auth_headers, 3)
+    response = client.get(
+        "/api/v1/meals/export?format=ndjson&start_date=2024-02-02T00:00:00",
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["meal_date"][:10] for r in records] == ["2024-02-02", "2024-02-03"]
+    assert records[0]["food_name"] == "Rice, cooked"
+    assert records[0]["calories"] == 195.0
+
+
+def test_export_meals_arrow(client, auth_headers):
+    """Test streaming meal history as an Arrow IPC stream"""
+    pa = pytest.importorskip("pyarrow")
+    _create_meal_history(client, auth_headers, 2)
+    response = client.get("/api/v1/meals/export?format=arrow", headers=auth_headers)
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 2
+    assert table.column("quantity_g").to_pylist() == [150.0, 150.0]
+
+
+def test_export_meals_rejects_unknown_format(client, auth_headers):
+    """Test exporting with an unsupported format"""
+    response = client.get("/api/v1/meals/export?format=xml", headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_create_meal_with_unknown_food(client, auth_headers):
+    """Test a meal referencing a food that does not exist is rejected"""
+    response = client.post(
+        "/api/v1/meals/",
+        json={
+            "meal_type": "lunch",
+            "meal_date": datetime.now().isoformat(),
+            "foods": [{"food_id": 424242, "quantity_g": 100.0}]
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert "424242" in response.json()["detail"]
+
+
+def test_nutrients_are_native_floats(db_session):
+    """Test nutrient columns load as float, so meal math never mixes in Decimal"""
+    from app.models.food import Food
+    from app.models.meal import Meal, MealFood, MealType
+    from app.services.meal_service import MealService
+    
+    food = Food(name="Oats", calories_per_100g=389.0, protein_per_100g=16.9, carbs_per_100g=66.3, fats_per_100g=6.9)
+    meal = Meal(user_id=1, meal_type=MealType.BREAKFAST, meal_date=datetime(2024, 1, 1, 8))
+    db_session.add_all([food, meal])
+    db_session.flush()
+    db_session.add(MealFood(meal_id=meal.id, food_id=food.id, quantity_g=50.0))
+    db_session.commit()
+    db_session.expire_all()
+    
+    meal = db_session.get(Meal, meal.id)
+    assert type(meal.meal_foods[0].quantity_g) is float
+    assert type(meal.meal_foods[0].food.calories_per_100g) is float
+    assert MealService.calculate_meal_nutrition(meal) == {
+        "total_calories": 194.5,
+        "total_protein": 8.45,
+        "total_carbs": 33.15,
+        "total_fats": 3.45
+    }
+
+
+@pytest.mark.parametrize("use_catalog", [True, False])
+def test_batch_nutrition_matches_per_meal(db_session, monkeypatch, use_catalog):
+    """Test batch totals match calculate_meal_nutrition and include fiber, sugar and sodium"""
+    from app.models.food import Food
+    from app.models.meal import Meal, MealFood, MealType
+    from app.services.food_catalog import food_catalog
+    from app.services.meal_service import MealService
+    
+    if not use_catalog:
+        monkeypatch.setattr(food_catalog, "lookup", lambda db, food_ids: None)
+    oats = Food(name="Oats", calories_per_100g=389.0, protein_per_100g=16.9, carbs_per_100g=66.3, fats_per_100g=6.9, fiber_per_100g=10.6)
+    milk = Food(name="Milk", calories_per_100g=42.0, protein_per_100g=3.4, carbs_per_100g=5.0, fats_per_100g=1.0, sugar_per_100g=5.0, sodium_per_100g=44.0)
+    meals = [Meal(user_id=1, meal_type=MealType.BREAKFAST, meal_date=datetime(2024, 1, day, 8)) for day in (1, 2, 3)]
+    db_session.add_all([oats, milk, *meals])
+    db_session.flush()
+    db_session.add_all([
+        MealFood(meal_id=meals[1].id, food_id=milk.id, quantity_g=250.0),
+        MealFood(meal_id=meals[0].id, food_id=oats.id, quantity_g=50.0),
+        MealFood(meal_id=meals[0].id, food_id=milk.id, quantity_g=200.0)
+    ])
+    db_session.commit()
+    
+    rows = MealService.fetch_nutrition_rows(db_session, [meal.id for meal in meals])
+    totals = MealService.calculate_batch_nutrition(db_session, reversed(rows))
+    assert set(totals) == {meals[0].id, meals[1].id}
+    for meal in meals[:2]:
+        nutrition = MealService.calculate_meal_nutrition(meal)
+        assert {field: totals[meal.id][field] for field in nutrition} == nutrition
+    assert totals[meals[0].id]["total_fiber"] == 5.3
+    assert totals[meals[0].id]["total_sugar"] == 10.0
+    assert totals[meals[1].id]["total_sodium"] == 110.0
@@ -0,0 +1,57 @@
+"""
+Tests for the metrics subsystem and /metrics endpoint
+"""
+import threading
+from app.core.metrics import Counter, MetricsRegistry
+
+
+def test_counter_sums_thread_shards():
+    """Test counters aggregate increments made from many threads"""
+    counter = Counter("test_events_total", "Test events", ("kind",))
+    
+    def work():
+        for _ in range(1000):
+            counter.inc(kind="a")
+    
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(5, kind="b")
+    
+    assert counter.value(kind="a") == 8000
+    assert counter.value(kind="b") == 5
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histogram text exposition"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(2.0, route="/a")
+    
+    text = registry.render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{route="/a"} 3' in text
+
+
+def test_metrics_endpoint(client, auth_headers):
+    """Test requests are recorded per route template"""
+    client.get("/api/v1/meals/999", headers=auth_headers)
+    client.get("/api/v1/users/me", headers=auth_headers)
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/meals/{meal_id}",status="404"}'
+        in text
+    )
+    assert 'http_request_db_queries_count{method="GET",route="/api/v1/users/me"}' in text
+    assert "cache_operations_total" in text
@@ -46,3 +46,173 @@ def test_get_preferences(client, auth_headers):
     data = response.json()
     assert data["target_calories"] == 2000.0
 
+
+
+def test_preference_snapshot_is_one_query_then_cached(client, auth_headers, db_session, test_user, fake_redis):
+    """Test preferences load with their restrictions in one query and are then served from cache"""
+    import dataclasses
+    from sqlalchemy import event
+    from app.services.preference_service import PreferenceService
+    
+    client.post(
+        "/api/v1/preferences/",
+        json={
+            "target_calories": 1800.0,
+            "dietary_restrictions": [
+                {"restriction_type": "vegetarian", "severity": "strict"},
+                {"restriction_type": "gluten-free"}
+            ]
+        },
+        headers=auth_headers
+    )
+    
+    user_id = test_user.id
+    fake_redis.flushall()  # saving primes the cache; start cold
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        loaded = PreferenceService.get_user_preferences(db_session, user_id)
+        assert len(statements) == 1
+        cached = PreferenceService.get_user_preferences(db_session, user_id)
+        assert len(statements) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    assert cached == loaded
+    assert cached.target_calories == 1800.0
+    assert cached.restriction_types == ["vegetarian", "gluten-free"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cached.target_calories = 2500.0
+
+
+def test_stored_restrictions_apply_to_recommendations(client, auth_headers, db_session):
+    """Test recommendations default to the user's saved dietary restrictions"""
+    from app.models.food import Food
+    
+    db_session.add_all([
+        Food(name="Chicken Breast", calories_per_100g=165.0, protein_per_100g=31.0, carbs_per_100g=0.0, fats_per_100g=3.6),
+        Food(name="Tofu", calories_per_100g=144.0, protein_per_100g=17.0, carbs_per_100g=3.0, fats_per_100g=9.0)
+    ])
+    db_session.commit()
+    client.post(
+        "/api/v1/preferences/",
+        json={"dietary_restrictions": [{"restriction_type": "vegetarian"}]},
+        headers=auth_headers
+    )
+    
+    response = client.get("/api/v1/recommender/recommendations", headers=auth_headers)
+    assert [food["name"] for food in response.json()["recommendations"]] == ["Tofu"]
+
+
+def test_unchanged_preferences_skip_the_write(client, auth_headers, db_session, fake_redis):
+    """Test a no-op update only reads the locked rows and writes nothing"""
+    from sqlalchemy import event
+    
+    payload = {"target_calories": 2000.0, "dietary_restrictions": [{"restriction_type": "vegan"}]}
+    created = client.post("/api/v1/preferences/", json=payload, headers=auth_headers).json()
+    
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().split()[0].upper())
+    
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.put("/api/v1/preferences/", json=payload, headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json() == created
+    assert not {"INSERT", "UPDATE", "DELETE"} & set(statements)
+
+
+def test_restrictions_are_diffed(client, auth_headers, db_session, fake_redis):
+    """Test only added and removed restrictions are written, each in one statement"""
+    from sqlalchemy import event
+    
+    before = client.post(
+        "/api/v1/preferences/",
+        json={"dietary_restrictions": [{"restriction_type": "vegetarian"}, {"restriction_type": "gluten-free"}]},
+        headers=auth_headers
+    ).json()
+    
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().split()[0].upper())
+    
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        after = client.put(
+            "/api/v1/preferences/",
+            json={"dietary_restrictions": [
+                {"restriction_type": "gluten-free"},
+                {"restriction_type": "vegan", "severity": "strict"},
+                {"restriction_type": "nut-free"}
+            ]},
+            headers=auth_headers
+        ).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    assert statements.count("DELETE") == 1
+    assert statements.count("INSERT") == 1
+    assert "UPDATE" not in statements
+    kept = {r["restriction_type"]: r["id"] for r in before["dietary_restrictions"]}["gluten-free"]
+    assert [(r["restriction_type"], r["severity"]) for r in after["dietary_restrictions"]] == [
+        ("gluten-free", "moderate"), ("vegan", "strict"), ("nut-free", "moderate")
+    ]
+    assert after["dietary_restrictions"][0]["id"] == kept
+
+
+def test_restrictions_are_diffed_against_stored_rows(client, auth_headers, db_session, test_user, fake_redis):
+    """Test the diff reads the restriction rows in the transaction, not the cached snapshot"""
+    from app.models.preference import DietaryRestriction, UserPreference
+    
+    client.post(
+        "/api/v1/preferences/",
+        json={"dietary_restrictions": [{"restriction_type": "vegetarian"}]},
+        headers=auth_headers
+    )
+    # Another writer adds a restriction without touching the cached snapshot
+    preference = db_session.query(UserPreference).filter(UserPreference.user_id == test_user.id).one()
+    db_session.add(DietaryRestriction(preference_id=preference.id, restriction_type="vegan"))
+    db_session.commit()
+    
+    after = client.put(
+        "/api/v1/preferences/",
+        json={"dietary_restrictions": [{"restriction_type": "vegetarian"}]},
+        headers=auth_headers
+    ).json()
+    assert [r["restriction_type"] for r in after["dietary_restrictions"]] == ["vegetarian"]
+    assert db_session.query(DietaryRestriction).filter(DietaryRestriction.preference_id == preference.id).count() == 1
+
+
+def test_duplicate_restrictions_are_merged(client, auth_headers):
+    """Test a payload repeating a (restriction_type, severity) pair stores it once"""
+    created = client.post(
+        "/api/v1/preferences/",
+        json={"dietary_restrictions": [
+            {"restriction_type": "vegan"},
+            {"restriction_type": "nut-free"},
+            {"restriction_type": "vegan", "severity": "moderate"}
+        ]},
+        headers=auth_headers
+    )
+    assert created.status_code == 201
+    assert [r["restriction_type"] for r in created.json()["dietary_restrictions"]] == ["vegan", "nut-free"]
+    
+    updated = client.put(
+        "/api/v1/preferences/",
+        json={"dietary_restrictions": [{"restriction_type": "nut-free"}, {"restriction_type": "nut-free"}]},
+        headers=auth_headers
+    )
+    assert updated.status_code == 200
+    assert [r["restriction_type"] for r in updated.json()["dietary_restrictions"]] == ["nut-free"]
@@ -0,0 +1,61 @@
+"""
+Tests for the per-request query profiler
+"""
+import logging
+import pytest
+from app.core.config import settings
+from app.core.profiling import RequestProfile, fingerprint, normalize_statement
+
+
+def test_normalize_statement_strips_literals():
+    """Test statements differing only in literals share a fingerprint"""
+    first = "SELECT * FROM meals WHERE user_id = 1 AND notes = 'it''s' AND id IN (?, ?, ?)"
+    second = "SELECT *\n  FROM meals WHERE user_id = 42 AND notes = 'x' AND id IN (?)"
+    assert normalize_statement(first) == "SELECT * FROM meals WHERE user_id = ? AND notes = ? AND id IN (...)"
+    assert fingerprint(first) == fingerprint(second)
+    assert fingerprint(first) != fingerprint("SELECT * FROM foods WHERE id = 1")
+
+
+def test_request_profile_keeps_slowest_statements():
+    """Test the profile keeps the N slowest statements, slowest first"""
+    profile = RequestProfile("/x", top_n=2)
+    for elapsed, statement in [(0.001, "A"), (0.005, "B"), (0.002, "C"), (0.004, "D")]:
+        profile.record(statement, elapsed)
+    assert profile.query_count == 4
+    assert profile.sql_seconds == pytest.approx(0.012)
+    assert [s for _, s in profile.slowest()] == ["B", "D"]
+    header = profile.server_timing(0.02)
+    assert header.startswith('app;dur=20.00, db;dur=12.00;desc="4 queries", sql-1;dur=5.00')
+
+
+def test_profile_header_adds_server_timing(client, auth_headers, monkeypatch):
+    """Test opting in with X-Profile returns Server-Timing"""
+    monkeypatch.setattr(settings, "PROFILE_HEADER_ENABLED", True)
+    response = client.get("/api/v1/meals/", headers={**auth_headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert "app;dur=" in timing
+    assert 'desc="' in timing
+    assert "sql-1;dur=" in timing
+    
+    response = client.get("/api/v1/meals/", headers=auth_headers)
+    assert "server-timing" not in response.headers
+
+
+def test_profile_header_ignored_when_disabled(client, auth_headers, monkeypatch):
+    """Test clients cannot enable profiling unless the server allows it"""
+    monkeypatch.setattr(settings, "PROFILE_HEADER_ENABLED", False)
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    response = client.get("/api/v1/meals/", headers={**auth_headers, "X-Profile": "1"})
+    assert "server-timing" not in response.headers
+
+
+def test_slow_query_log(client, auth_headers, monkeypatch, caplog):
+    """Test statements over the threshold are logged with a fingerprint"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        client.get("/api/v1/meals/", headers=auth_headers)
+    records = [r for r in caplog.records if r.name == "app.slow_query"]
+    assert records
+    assert "fingerprint=" in records[0].getMessage()
+    assert "route=/api/v1/meals/" in " ".join(r.getMessage() for r in records)
@@ -111,3 +111,152 @@ def test_get_today_report(client, auth_headers, db_session):
     assert "total_calories" in data
     assert "report_date" in data
 
+
+
+@pytest.fixture
+def second_user_meals(db_session, test_user):
+    """Meals for the test user and another user across two weeks of March 2024"""
+    from app.models.food import Food
+    from app.models.meal import Meal, MealFood, MealType
+    from app.models.user import User
+    
+    other = User(email="other@example.com", username="other", hashed_password="x")
+    food = Food(
+        name="Test Food",
+        calories_per_100g=100.0,
+        protein_per_100g=10.0,
+        carbs_per_100g=20.0,
+        fats_per_100g=5.0
+    )
+    db_session.add_all([other, food])
+    db_session.flush()
+    
+    for user_id, meal_date in [
+        (test_user.id, datetime(2024, 3, 4, 8, 0)),
+        (test_user.id, datetime(2024, 3, 4, 13, 0)),
+        (test_user.id, datetime(2024, 3, 6, 13, 0)),
+        (test_user.id, datetime(2024, 3, 12, 13, 0)),
+        (other.id, datetime(2024, 3, 5, 13, 0)),
+    ]:
+        meal = Meal(user_id=user_id, meal_type=MealType.LUNCH, meal_date=meal_date)
+        db_session.add(meal)
+        db_session.flush()
+        db_session.add(MealFood(meal_id=meal.id, food_id=food.id, quantity_g=200.0))
+    db_session.commit()
+    return other
+
+
+def test_materialize_weekly_reports(client, auth_headers, db_session, second_user_meals):
+    """Test the rollup job writes one row per user per week and is idempotent"""
+    from datetime import date
+    from app.models.report import WeeklyReport, ReportRollupCheckpoint
+    from app.services.report_rollup_service import ReportRollupService
+    
+    stats = ReportRollupService.run(db_session, "weekly", end=date(2024, 3, 17))
+    assert stats["periods"] == 2
+    assert stats["rows"] == 3
+    assert db_session.get(ReportRollupCheckpoint, "weekly").last_period_start == date(2024, 3, 11)
+    
+    # Re-running the same range rewrites rather than duplicates
+    ReportRollupService.run(db_session, "weekly", start=date(2024, 3, 4), end=date(2024, 3, 17))
+    assert db_session.query(WeeklyReport).count() == 3
+    
+    # Resuming after the checkpoint has nothing left to do
+    assert ReportRollupService.run(db_session, "weekly", end=date(2024, 3, 17))["periods"] == 0
+    
+    response = client.get("/api/v1/reports/weekly", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["period_start"] for r in data] == ["2024-03-11", "2024-03-04"]
+    assert data[1]["days_logged"] == 2
+    assert data[1]["meal_count"] == 3
+    assert data[1]["total_calories"] == 600.0
+
+
+def test_materialize_monthly_reports(client, auth_headers, db_session, second_user_meals):
+    """Test monthly rollups and date filtering"""
+    from datetime import date
+    from app.services.report_rollup_service import ReportRollupService
+    
+    ReportRollupService.run(db_session, "monthly", start=date(2024, 2, 1), end=date(2024, 3, 31))
+    
+    response = client.get("/api/v1/reports/monthly?start_date=2024-03-01", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["period_start"] == "2024-03-01"
+    assert data[0]["period_end"] == "2024-03-31"
+    assert data[0]["total_protein"] == 80.0
+
+
+@pytest.mark.parametrize("upsert", ["statement", "locked"])
+def test_generate_report_concurrently_creates_one_row(tmp_path, monkeypatch, upsert):
+    """Stress test: parallel generations for the same day upsert a single row, with or without an upsert statement"""
+    import threading
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import Base
+    from app.models.report import DailyReport
+    from app.models.user import User
+    from app.services.report_service import ReportService
+    
+    # Separate file database so each thread gets its own connection
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'reports.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    if upsert == "locked":
+        # Take the fallback used by dialects without INSERT ... ON CONFLICT
+        monkeypatch.setattr(
+            ReportService, "_upsert_daily_report",
+            staticmethod(lambda db, values: ReportService._lock_and_write_daily_report(
+                db, values, {key: value for key, value in values.items() if key not in ("user_id", "report_day", "report_date")}
+            ))
+        )
+    with Session() as db:
+        user = User(email="race@example.com", username="race", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    
+    report_date = datetime(2024, 3, 4, 9, 0)
+    workers = 8
+    barrier = threading.Barrier(workers)
+    errors = []
+    
+    def generate():
+        db = Session()
+        try:
+            barrier.wait()
+            for _ in range(5):
+                ReportService.generate_daily_report(db, user_id, report_date)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            db.close()
+    
+    threads = [threading.Thread(target=generate) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    with Session() as db:
+        assert db.query(DailyReport).filter(DailyReport.user_id == user_id).count() == 1
+    
+    # Regenerating costs one write and one read against daily_reports, plus the row lock without an upsert statement
+    statements = []
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "daily_reports" in statement:
+            statements.append(statement.split()[0].upper())
+    
+    with Session() as db:
+        report = ReportService.generate_daily_report(db, user_id, report_date.replace(hour=18))
+        assert report.report_date == report_date
+    assert statements == (["INSERT", "SELECT"] if upsert == "statement" else ["SELECT", "UPDATE", "SELECT"])
+    engine.dispose()
@@ -0,0 +1,118 @@
+"""
+Tests for schema migrations and the application lifespan
+"""
+from pathlib import Path
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from app.core import startup
+from app.core.database import Base
+from app.main import app
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def alembic_config(url: str) -> Config:
+    """Alembic config pointing at the repo's migrations and the given database"""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_migrations_match_models(tmp_path):
+    """Test upgrade head builds exactly the schema declared by the models"""
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "head")
+    
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    assert diff == []
+    
+    command.downgrade(config, "base")
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
+
+
+def test_report_day_migration_keeps_newest_report_per_day(tmp_path):
+    """Test 0004 backfills report_day and drops superseded reports before adding the key"""
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "0003")
+    
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO users (id, email, username, hashed_password) VALUES (1, 'a@example.com', 'a', 'x')"
+        ))
+        connection.execute(
+            text(
+                "INSERT INTO daily_reports (id, user_id, report_date, created_at, total_calories, total_protein, "
+                "total_carbs, total_fats) VALUES (:id, 1, :report_date, :created_at, :calories, 0, 0, 0)"
+            ),
+            [
+                {"id": 1, "report_date": "2026-10-01 08:00:00", "created_at": "2026-10-01 20:00:00", "calories": 100},
+                {"id": 2, "report_date": "2026-10-01 18:00:00", "created_at": "2026-10-01 21:00:00", "calories": 200},
+                {"id": 3, "report_date": "2026-10-01 12:00:00", "created_at": "2026-10-01 21:00:00", "calories": 300},
+                {"id": 4, "report_date": "2026-10-02 09:00:00", "created_at": "2026-10-02 20:00:00", "calories": 400},
+            ]
+        )
+    command.upgrade(config, "0004")
+    
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT id, report_day, total_calories FROM daily_reports ORDER BY id"
+        )).all()
+    engine.dispose()
+    assert rows == [(3, "2026-10-01", 300), (4, "2026-10-02", 400)]
+
+
+def test_startup_survives_unreachable_dependencies(monkeypatch):
+    """Test a failed warm-up is logged and the app still starts"""
+    def unreachable(*args):
+        raise ConnectionError("connection refused")
+    
+    monkeypatch.setattr(startup, "warm_database_pool", unreachable)
+    monkeypatch.setattr(startup, "warm_cache", unreachable)
+    with TestClient(app) as test_client:
+        response = test_client.get("/health/live")
+    assert response.status_code == 200
+
+
+def test_startup_warms_pool(monkeypatch):
+    """Test the lifespan opens the configured number of connections"""
+    warmed = []
+    monkeypatch.setattr(startup, "warm_database_pool", warmed.append)
+    monkeypatch.setattr(startup, "warm_cache", lambda: None)
+    with TestClient(app):
+        pass
+    assert warmed == [startup.settings.STARTUP_WARM_CONNECTIONS]
+
+
+def test_startup_warms_and_disposes_replica_pools(monkeypatch):
+    """Test every replica pool is warmed with the primary and disposed on shutdown"""
+    class Replica:
+        def __init__(self, name):
+            self.name = name
+            self.disposed = False
+        
+        def dispose(self):
+            self.disposed = True
+    
+    replicas = [Replica("replica_0"), Replica("replica_1")]
+    warmed = []
+    monkeypatch.setattr(startup, "replica_engines", replicas)
+    monkeypatch.setattr(
+        startup, "warm_database_pool",
+        lambda connections, bind=None: warmed.append(bind.name if bind else "primary")
+    )
+    monkeypatch.setattr(startup, "warm_cache", lambda: None)
+    with TestClient(app):
+        assert not any(replica.disposed for replica in replicas)
+    assert sorted(warmed) == ["primary", "replica_0", "replica_1"]
+    assert all(replica.disposed for replica in replicas)